@@ -0,0 +1,224 @@
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tracemalloc
+from datetime import datetime
+from time import perf_counter
+
+import cv2
+import numpy as np
+
+from OfflineProcessor import iter_frames, create_offline_controller
+
+# 프레임 파이프라인 단계 (표시 순서)
+STAGES = ['decode', 'flip', 'bgr2rgb', 'mediapipe', 'findhand', 'landmarks', 'gestures', 'overlay', 'qt_convert', 'end_to_end']
+
+# 미리보기 변환 크기 (GUI의 video_label 기본 크기)
+PREVIEW_SIZE = (1280, 960)
+
+
+class StageRecorder:
+    """단계별 소요 시간과 할당량 기록"""
+
+    def __init__(self, track_allocations=False):
+        self.track_allocations = track_allocations
+        self.times = {}
+        self.allocations = {}
+
+    def measure(self, stage, func, *args):
+        """func를 실행하며 소요 시간(초)과 할당된 메모리(바이트)를 기록하고 결과 반환"""
+        if self.track_allocations:
+            tracemalloc.reset_peak()
+            before = tracemalloc.get_traced_memory()[0]
+            result = func(*args)
+            self.allocations.setdefault(stage, []).append(tracemalloc.get_traced_memory()[1] - before)
+            return result
+
+        start = perf_counter()
+        result = func(*args)
+        self.times.setdefault(stage, []).append(perf_counter() - start)
+        return result
+
+
+def load_qt_converter():
+    """
+    GUI의 미리보기 변환 함수 로드 (Qt 전용 모듈만 불러오므로 pynput 없는 환경에서도 동작)
+    (변환 함수, 건너뛴 이유) 반환 (PyQt5가 없으면 변환 함수는 None)
+    """
+    try:
+        if sys.platform.startswith('linux') and not os.environ.get('DISPLAY'):
+            os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        from PyQt5.QtWidgets import QApplication
+        from QtPreview import PreviewConverter
+    except ImportError as e:
+        return None, f"ImportError: {e}"
+    # QImage 그리기에는 QApplication이 필요
+    load_qt_converter.app = QApplication.instance() or QApplication(sys.argv[:1])
+    return PreviewConverter().convert, None
+
+
+def load_clip(source, max_frames=None):
+    """클립을 메모리에 읽어들이며 디코딩 시간 측정"""
+    frames, decode_times = [], []
+    start = perf_counter()
+    for index, timestamp, frame in iter_frames(source, stop=max_frames):
+        decode_times.append(perf_counter() - start)
+        frames.append(frame)
+        start = perf_counter()
+    return frames, decode_times
+
+
+def run_stages(frames, recorder, qt_convert=None):
+    """각 단계를 개별적으로 실행하며 측정"""
+    controller = create_offline_controller()
+    detector = controller.hand_detector
+
+    # 단계별 측정: MediaPipe 단독 (전체 프레임)
+    for frame in frames:
+        flipped = recorder.measure('flip', cv2.flip, frame, 1)
+        rgb = recorder.measure('bgr2rgb', cv2.cvtColor, flipped, cv2.COLOR_BGR2RGB)
+        recorder.measure('mediapipe', detector.hands.process, rgb)
+
+    # 단계별 측정: findhand(ROI 포함) 이후 단계
+    controller.reset_state()
+    for frame in frames:
+        img = cv2.flip(frame, 1)
+        recorder.measure('findhand', detector.findhand, img, True)
+
+        def landmarks_stage():
+            landmarks = detector.findLandmarks()
+            detector.fingersUp()
+            detector.findPosition()
+            return landmarks
+
+        landmarks = recorder.measure('landmarks', landmarks_stage)
+        if landmarks is not None:
+            recorder.measure('gestures', controller.process_hand_gestures, landmarks, img)
+        recorder.measure('overlay', controller.update_display, img, landmarks is not None, "")
+        if qt_convert is not None:
+            recorder.measure('qt_convert', qt_convert, img, *PREVIEW_SIZE)
+
+    # 전체 파이프라인
+    controller.reset_state()
+
+    def end_to_end(frame):
+        img, _ = controller.process_image(frame, active=False, render=True)
+        if qt_convert is not None:
+            qt_convert(img, *PREVIEW_SIZE)
+
+    for frame in frames:
+        recorder.measure('end_to_end', end_to_end, frame)
+
+
+def summarize(times, allocations, skipped=None):
+    """단계별 mean/p50/p99 지연(ms)과 평균 할당량(KB) 계산 (skipped: 측정하지 못한 단계 -> 이유)"""
+    skipped = skipped or {}
+    summary = {}
+    for stage in STAGES:
+        if stage in skipped:
+            summary[stage] = {'skipped': skipped[stage]}
+            continue
+        if stage not in times:
+            continue
+        values = np.array(times[stage]) * 1000
+        summary[stage] = {
+            'count': len(values),
+            'mean_ms': round(float(values.mean()), 3),
+            'p50_ms': round(float(np.percentile(values, 50)), 3),
+            'p99_ms': round(float(np.percentile(values, 99)), 3),
+        }
+        if stage in allocations:
+            summary[stage]['alloc_kb'] = round(float(np.mean(allocations[stage])) / 1024, 1)
+    return summary
+
+
+def git_revision():
+    """현재 커밋 해시 (git이 없으면 None)"""
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'],
+                                       cwd=os.path.dirname(os.path.abspath(__file__)),
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(source, max_frames=None, track_allocations=True):
+    """클립으로 단계별/전체 벤치마크를 실행하고 결과 딕셔너리 반환"""
+    frames, decode_times = load_clip(source, max_frames)
+    if not frames:
+        raise IOError(f"프레임을 읽을 수 없습니다: {source}")
+    qt_convert, qt_skipped = load_qt_converter()
+    skipped = {'qt_convert': qt_skipped} if qt_skipped else {}
+
+    timing = StageRecorder()
+    timing.times['decode'] = decode_times
+    run_stages(frames, timing, qt_convert)
+
+    allocations = {}
+    if track_allocations:
+        tracemalloc.start()
+        try:
+            alloc = StageRecorder(track_allocations=True)
+            run_stages(frames, alloc, qt_convert)
+            allocations = alloc.allocations
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'meta': {
+            'source': source,
+            'frames': len(frames),
+            'resolution': [frames[0].shape[1], frames[0].shape[0]],
+            'revision': git_revision(),
+            'date': datetime.now().isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'opencv': cv2.__version__,
+        },
+        'stages': summarize(timing.times, allocations, skipped),
+    }
+
+
+def print_report(result, baseline=None):
+    """결과 표 출력 (baseline이 있으면 mean 변화율도 표시)"""
+    print(f"{'stage':<12}{'mean':>10}{'p50':>10}{'p99':>10}{'alloc KB':>10}" + (f"{'vs base':>10}" if baseline else ''))
+    for stage, stats in result['stages'].items():
+        if 'skipped' in stats:
+            print(f"{stage:<12}{'skipped':>10}  ({stats['skipped']})")
+            continue
+        alloc = f"{stats['alloc_kb']:.1f}" if 'alloc_kb' in stats else '-'
+        line = f"{stage:<12}{stats['mean_ms']:>10.2f}{stats['p50_ms']:>10.2f}{stats['p99_ms']:>10.2f}{alloc:>10}"
+        if baseline:
+            base = baseline['stages'].get(stage)
+            if base and base.get('mean_ms', 0) > 0:
+                line += f"{(stats['mean_ms'] / base['mean_ms'] - 1) * 100:>+9.1f}%"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='프레임 파이프라인 단계별 벤치마크')
+    parser.add_argument('source', help='녹화된 영상 파일 또는 이미지 디렉터리')
+    parser.add_argument('-o', '--output', help='결과 JSON 저장 경로')
+    parser.add_argument('-n', '--max-frames', type=int, help='사용할 최대 프레임 수')
+    parser.add_argument('--compare', help='비교할 이전 결과 JSON')
+    parser.add_argument('--no-alloc', action='store_true', help='할당량 측정 생략')
+    args = parser.parse_args()
+
+    result = run_benchmark(args.source, args.max_frames, not args.no_alloc)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(result, baseline)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f, indent=2, ensure_ascii=False)
+
+
+if __name__ == "__main__":
+    main()
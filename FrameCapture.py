@@ -0,0 +1,131 @@
+import threading
+from collections import namedtuple
+from time import sleep, time
+
+# 캡처된 프레임 한 장 (이미지, 캡처 시각, 순번)
+FramePacket = namedtuple('FramePacket', ['frame', 'timestamp', 'seq'])
+
+
+class ThreadedCapture:
+    """
+    백그라운드 스레드에서 카메라를 읽고 최신 프레임 한 장만 보관하는 캡처
+    cap: FrameSource 또는 cv2.VideoCapture (드라이버 버퍼 크기 등 캡처 설정은 소스에서 함)
+    """
+
+    def __init__(self, cap, max_failed_reads=100, retry_delay=0.01):
+        """
+        max_failed_reads: 연속으로 이만큼 읽기에 실패하면 캡처 중단
+        retry_delay: 읽기 실패 후 다시 시도하기 전 대기 시간(초, 연속 실패마다 늘어나며 최대 0.2초)
+        """
+        self.cap = cap
+        self.max_failed_reads = max_failed_reads
+        self.retry_delay = retry_delay
+
+        # 단일 슬롯 버퍼
+        self._lock = threading.Lock()
+        self._new_frame = threading.Condition(self._lock)
+        self._latest = None
+        self._consumed_seq = -1
+
+        # 통계
+        self.captured_count = 0
+        self.dropped_count = 0
+        self.failed_reads = 0
+
+        self._running = False
+        self._thread = None
+
+    def start(self):
+        """캡처 스레드 시작"""
+        if self._running:
+            return self
+        self._running = True
+        self._thread = threading.Thread(target=self._capture_loop, name='ThreadedCapture', daemon=True)
+        self._thread.start()
+        return self
+
+    def _capture_loop(self):
+        """카메라에서 계속 프레임을 읽어 슬롯을 갱신"""
+        seq = 0
+        consecutive_failures = 0
+        while self._running:
+            ret, frame = self.cap.read()
+            if not ret:
+                self.failed_reads += 1
+                consecutive_failures += 1
+                if not self.cap.isOpened():
+                    break
+                if consecutive_failures >= self.max_failed_reads:
+                    print(f"프레임을 {consecutive_failures}번 연속으로 읽지 못해 캡처를 중단합니다")
+                    break
+                # 코어를 점유하지 않도록 잠시 쉬었다가 다시 시도
+                sleep(min(self.retry_delay * consecutive_failures, 0.2))
+                continue
+            consecutive_failures = 0
+
+            packet = FramePacket(frame, time(), seq)
+            with self._lock:
+                # 이전 프레임이 소비되기 전에 덮어쓰면 버린 프레임으로 집계
+                if self._latest is not None and self._latest.seq > self._consumed_seq:
+                    self.dropped_count += 1
+                self._latest = packet
+                self.captured_count += 1
+                self._new_frame.notify_all()
+            seq += 1
+
+        self._running = False
+        with self._lock:
+            self._new_frame.notify_all()
+
+    def isOpened(self):
+        """카메라가 열려 있고 캡처 중인지 확인"""
+        return self._running and self.cap.isOpened()
+
+    def read(self):
+        """아직 소비하지 않은 가장 최신 프레임을 기다리지 않고 반환 (새 프레임이 없으면 None)"""
+        with self._lock:
+            packet = self._latest
+            # 이미 넘겨준 프레임은 다시 넘기지 않음 (같은 프레임을 두 번 처리하지 않도록)
+            if packet is None or packet.seq <= self._consumed_seq:
+                return None
+            self._consumed_seq = packet.seq
+            return packet
+
+    def wait_ready(self, timeout=None):
+        """첫 프레임이 들어올 때까지 대기"""
+        with self._lock:
+            return self._new_frame.wait_for(lambda: not self._running or self._latest is not None, timeout) \
+                and self._latest is not None
+
+    def wait_for_frame(self, timeout=None):
+        """아직 소비하지 않은 새 프레임이 올 때까지 대기 후 반환"""
+        with self._lock:
+            self._new_frame.wait_for(
+                lambda: not self._running or (self._latest is not None and self._latest.seq > self._consumed_seq),
+                timeout)
+            packet = self._latest
+            if packet is not None and packet.seq > self._consumed_seq:
+                self._consumed_seq = packet.seq
+                return packet
+            return None
+
+    def get_stats(self):
+        """캡처 통계 반환 (FrameSource면 협상된 캡처 모드와 획득/디코딩 시간 포함)"""
+        with self._lock:
+            stats = {
+                'captured': self.captured_count,
+                'dropped': self.dropped_count,
+                'failed_reads': self.failed_reads,
+                'latest_seq': self._latest.seq if self._latest is not None else -1,
+            }
+        if hasattr(self.cap, 'get_stats'):
+            stats.update(self.cap.get_stats())
+        return stats
+
+    def release(self):
+        """캡처 스레드 정지 및 카메라 해제"""
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self.cap.release()
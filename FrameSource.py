@@ -0,0 +1,438 @@
+import os
+from collections import deque, namedtuple
+from time import perf_counter, sleep
+
+import cv2
+import numpy as np
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+# OpenCV 캡처 백엔드 이름 (카메라 소스의 backend 인자)
+CAPTURE_BACKENDS = {
+    'auto': cv2.CAP_ANY,
+    'dshow': cv2.CAP_DSHOW,
+    'msmf': cv2.CAP_MSMF,
+    'v4l2': cv2.CAP_V4L2,
+    'gstreamer': cv2.CAP_GSTREAMER,
+    'ffmpeg': cv2.CAP_FFMPEG,
+    'avfoundation': cv2.CAP_AVFOUNDATION,
+}
+
+# 소스가 실제로 사용하는 캡처 모드 (요청한 값이 아니라 드라이버와 협상된 값)
+CaptureMode = namedtuple('CaptureMode', ['width', 'height', 'fps', 'fourcc', 'backend', 'buffer_size'])
+
+
+def list_images(directory):
+    """디렉터리 안의 이미지 파일 경로를 이름순으로 반환"""
+    names = sorted(name for name in os.listdir(directory) if name.lower().endswith(IMAGE_EXTENSIONS))
+    return [os.path.join(directory, name) for name in names]
+
+
+def decode_fourcc(value):
+    """CAP_PROP_FOURCC 값을 'MJPG' 같은 문자열로 변환 (알 수 없으면 빈 문자열)"""
+    value = int(value)
+    if value <= 0:
+        return ''
+    return ''.join(chr((value >> (8 * i)) & 0xFF) for i in range(4)).strip('\x00 ')
+
+
+class FrameSource:
+    """
+    프레임 소스 공통 인터페이스 (cv2.VideoCapture처럼 read()가 (성공 여부, 이미지) 반환)
+    소스마다 협상된 캡처 모드(mode)와 프레임 획득/디코딩 시간을 보고
+    """
+    name = 'source'
+    live = False  # True면 실시간 소스 (ThreadedCapture로 최신 프레임만 사용)
+
+    def __init__(self, window=120):
+        self.mode = None
+        self.index = -1        # 마지막으로 읽은 프레임 번호
+        self.timestamp = 0.0   # 마지막으로 읽은 프레임의 소스 기준 시각(초)
+        self.ended = False     # 파일/합성 소스의 프레임이 끝났는지 여부 (끝나면 isOpened()가 False)
+        self._next_time = None
+        self.grab_times = deque(maxlen=window)     # 프레임이 준비될 때까지 기다린 시간(초)
+        self.decode_times = deque(maxlen=window)   # 디코딩/변환 시간(초)
+
+    def open(self):
+        """소스 열기 (성공하면 True)"""
+        raise NotImplementedError
+
+    def grab(self):
+        """다음 프레임 획득 (성공하면 True)"""
+        raise NotImplementedError
+
+    def retrieve(self):
+        """획득한 프레임을 이미지로 변환 (실패하면 None)"""
+        raise NotImplementedError
+
+    def isOpened(self):
+        raise NotImplementedError
+
+    def release(self):
+        pass
+
+    def read(self):
+        """다음 프레임을 읽어 (성공 여부, 이미지) 반환하고 획득/디코딩 시간 기록"""
+        start = perf_counter()
+        if not self.grab():
+            return False, None
+        grabbed = perf_counter()
+        frame = self.retrieve()
+        self.grab_times.append(grabbed - start)
+        self.decode_times.append(perf_counter() - grabbed)
+        if frame is None:
+            return False, None
+        return True, frame
+
+    def wait_realtime(self):
+        """실시간으로 재생하는 파일/합성 소스가 fps에 맞춰 다음 프레임을 내도록 대기"""
+        now = perf_counter()
+        if self._next_time is None or self._next_time < now - 1.0:
+            self._next_time = now
+        elif self._next_time > now:
+            sleep(self._next_time - now)
+        self._next_time += 1.0 / self.fps
+
+    def frames(self, start=0, stop=None):
+        """(프레임 번호, 시각(초), 이미지)를 차례로 반환 (start, stop: 처리할 프레임 범위 [start, stop))"""
+        if start:
+            self.seek(start)
+        while stop is None or self.index + 1 < stop:
+            ret, frame = self.read()
+            if not ret:
+                break
+            yield self.index, self.timestamp, frame
+
+    def seek(self, index):
+        """index번 프레임부터 읽도록 이동 (지원하지 않는 소스는 앞 프레임을 읽어 버림)"""
+        while self.index + 1 < index and self.grab():
+            pass
+
+    def get_stats(self):
+        """협상된 캡처 모드와 최근 구간의 획득/디코딩 시간 반환"""
+        stats = {'source': self.name, 'mode': self.mode._asdict() if self.mode is not None else None}
+        for name, times in (('grab', self.grab_times), ('decode', self.decode_times)):
+            values = np.array(times) * 1000 if times else np.zeros(1)
+            stats[f'{name}_mean_ms'] = round(float(values.mean()), 3)
+            stats[f'{name}_p95_ms'] = round(float(np.percentile(values, 95)), 3)
+        return stats
+
+    def mode_text(self):
+        """캡처 모드 한 줄 요약"""
+        mode = self.mode
+        if mode is None:
+            return f"{self.name}: 열리지 않음"
+        return (f"{self.name}: {mode.width}x{mode.height} @ {mode.fps:.1f}fps {mode.fourcc or '-'} "
+                f"({mode.backend}, 버퍼 {mode.buffer_size if mode.buffer_size is not None else '-'})")
+
+    def summary_text(self):
+        """캡처 모드와 획득/디코딩 시간 한 줄 요약"""
+        stats = self.get_stats()
+        return (f"{self.mode_text()} | grab {stats['grab_mean_ms']:.1f}/{stats['grab_p95_ms']:.1f} ms "
+                f"decode {stats['decode_mean_ms']:.1f}/{stats['decode_p95_ms']:.1f} ms")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+class CameraSource(FrameSource):
+    """
+    카메라 (번호 또는 장치 경로/스트림 주소)
+    backend: CAPTURE_BACKENDS의 이름, fourcc: 'MJPG', 'YUYV' 등 (None이면 드라이버 기본값)
+    buffer_size: 드라이버 버퍼 프레임 수 (1이면 오래된 프레임이 쌓이지 않음), fps: 요청 프레임률 (None이면 기본값)
+    요청한 값은 드라이버가 바꿀 수 있으므로 연 뒤에 실제 값을 다시 읽어 mode에 기록
+    """
+    name = 'camera'
+    live = True
+
+    def __init__(self, device=0, width=960, height=720, fps=None, fourcc=None, backend='auto', buffer_size=1):
+        super().__init__()
+        if backend not in CAPTURE_BACKENDS:
+            raise ValueError(f"알 수 없는 캡처 백엔드: {backend} ({', '.join(CAPTURE_BACKENDS)})")
+        if fourcc is not None and len(fourcc) != 4:
+            raise ValueError(f"FOURCC는 네 글자여야 합니다: {fourcc}")
+        self.device = device
+        self.width, self.height, self.fps = width, height, fps
+        self.fourcc = fourcc
+        self.backend = backend
+        self.buffer_size = buffer_size
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.device, CAPTURE_BACKENDS[self.backend])
+        if not self.cap.isOpened():
+            return False
+        # FOURCC는 해상도보다 먼저 설정해야 적용되는 드라이버가 있음
+        if self.fourcc:
+            self.cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter_fourcc(*self.fourcc))
+        if self.width and self.height:
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.width)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.height)
+        if self.fps:
+            self.cap.set(cv2.CAP_PROP_FPS, self.fps)
+        # 지원하지 않는 백엔드는 무시
+        if self.buffer_size is not None:
+            self.cap.set(cv2.CAP_PROP_BUFFERSIZE, self.buffer_size)
+        self.mode = self.negotiated_mode()
+        return True
+
+    def negotiated_mode(self):
+        """드라이버가 실제로 적용한 캡처 모드"""
+        cap = self.cap
+        try:
+            backend = cap.getBackendName()
+        except cv2.error:
+            backend = self.backend
+        buffer_size = cap.get(cv2.CAP_PROP_BUFFERSIZE)
+        return CaptureMode(
+            width=int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(cap.get(cv2.CAP_PROP_FPS)),
+            fourcc=decode_fourcc(cap.get(cv2.CAP_PROP_FOURCC)),
+            backend=backend,
+            buffer_size=int(buffer_size) if buffer_size > 0 else None,
+        )
+
+    def grab(self):
+        if self.cap is None or not self.cap.grab():
+            return False
+        self.index += 1
+        return True
+
+    def retrieve(self):
+        ret, frame = self.cap.retrieve()
+        if not ret:
+            return None
+        # 드라이버가 주는 프레임 시각 (지원하지 않는 백엔드는 0)
+        self.timestamp = self.cap.get(cv2.CAP_PROP_POS_MSEC) / 1000
+        return frame
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened()
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class VideoFileSource(FrameSource):
+    """
+    영상 파일
+    realtime: True면 영상 프레임률에 맞춰 읽음 (카메라처럼 실시간 소스로 사용), loop: True면 끝에서 처음으로 돌아감
+    """
+    name = 'video'
+
+    def __init__(self, path, realtime=False, loop=False, fps=30.0):
+        super().__init__()
+        self.path = path
+        self.live = realtime
+        self.loop = loop
+        self.default_fps = fps or 30.0
+        self.cap = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(self.path)
+        if not self.cap.isOpened():
+            return False
+        self.fps = self.cap.get(cv2.CAP_PROP_FPS) or self.default_fps
+        self.mode = CaptureMode(
+            width=int(self.cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            height=int(self.cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            fps=float(self.fps),
+            fourcc=decode_fourcc(self.cap.get(cv2.CAP_PROP_FOURCC)),
+            backend=self.cap.getBackendName(),
+            buffer_size=None,
+        )
+        return True
+
+    def seek(self, index):
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, index)
+        self.index = index - 1
+
+    def grab(self):
+        if self.cap is None:
+            return False
+        if self.live:
+            self.wait_realtime()
+        if not self.cap.grab():
+            if not self.loop or self.index < 0 or not self.rewind():
+                self.ended = True
+                return False
+        self.index += 1
+        self.timestamp = self.index / self.fps
+        return True
+
+    def rewind(self):
+        """처음 프레임으로 돌아가 다시 획득 (반복 재생)"""
+        self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+        return self.cap.grab()
+
+    def retrieve(self):
+        ret, frame = self.cap.retrieve()
+        return frame if ret else None
+
+    def isOpened(self):
+        return self.cap is not None and self.cap.isOpened() and not self.ended
+
+    def release(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class ImageDirectorySource(FrameSource):
+    """이미지 디렉터리 (파일 이름순, fps: 프레임 간격 계산용)"""
+    name = 'images'
+
+    def __init__(self, directory, fps=30.0, realtime=False, loop=False):
+        super().__init__()
+        self.directory = directory
+        self.fps = fps or 30.0
+        self.live = realtime
+        self.loop = loop
+        self.paths = None
+
+    def open(self):
+        if not os.path.isdir(self.directory):
+            return False
+        self.paths = list_images(self.directory)
+        first = cv2.imread(self.paths[0]) if self.paths else None
+        height, width = first.shape[:2] if first is not None else (0, 0)
+        self.mode = CaptureMode(width, height, float(self.fps), '', 'imread', None)
+        return True
+
+    def seek(self, index):
+        self.index = index - 1
+
+    def grab(self):
+        # 빈 디렉터리이거나 모두 읽었으면 끝 (isOpened()가 False가 되어 캡처 스레드도 종료)
+        if self.paths is None:
+            return False
+        if not self.paths or (self.index + 1 >= len(self.paths) and not self.loop):
+            self.ended = True
+            return False
+        if self.live:
+            self.wait_realtime()
+        self.index += 1
+        self.timestamp = self.index / self.fps
+        return True
+
+    def retrieve(self):
+        return cv2.imread(self.paths[self.index % len(self.paths)])
+
+    def frames(self, start=0, stop=None):
+        # 읽지 못한 이미지는 건너뜀 (프레임 번호는 파일 순서 그대로)
+        if start:
+            self.seek(start)
+        while stop is None or self.index + 1 < stop:
+            start_time = perf_counter()
+            if not self.grab():
+                break
+            grabbed = perf_counter()
+            frame = self.retrieve()
+            self.grab_times.append(grabbed - start_time)
+            self.decode_times.append(perf_counter() - grabbed)
+            if frame is not None:
+                yield self.index, self.timestamp, frame
+
+    def isOpened(self):
+        return self.paths is not None and not self.ended
+
+
+class SyntheticSource(FrameSource):
+    """
+    합성 프레임 생성기 (카메라 없이 같은 파이프라인을 시험할 때 사용)
+    generator: generator(프레임 번호, 이미지 버퍼)로 버퍼에 그리는 함수 (None이면 움직이는 사각형과 프레임 번호)
+    frames: 생성할 프레임 수 (None이면 계속), realtime: True면 fps에 맞춰 생성
+    """
+    name = 'synthetic'
+
+    def __init__(self, width=960, height=720, fps=30.0, frames=None, generator=None, realtime=True):
+        super().__init__()
+        self.width, self.height, self.fps = width, height, fps or 30.0
+        self.frame_limit = frames
+        self.generator = generator or draw_test_pattern
+        self.live = realtime
+        self._buffer = None
+
+    def open(self):
+        self._buffer = np.zeros((self.height, self.width, 3), dtype=np.uint8)
+        self.mode = CaptureMode(self.width, self.height, float(self.fps), 'BGR3', 'synthetic', None)
+        return True
+
+    def seek(self, index):
+        self.index = index - 1
+
+    def grab(self):
+        if self._buffer is None:
+            return False
+        if self.frame_limit is not None and self.index + 1 >= self.frame_limit:
+            self.ended = True
+            return False
+        if self.live:
+            self.wait_realtime()
+        self.index += 1
+        self.timestamp = self.index / self.fps
+        return True
+
+    def retrieve(self):
+        # 실시간 소스는 ThreadedCapture가 이전 프레임을 들고 있을 수 있으므로 매번 새 배열
+        frame = self._buffer.copy() if self.live else self._buffer
+        self.generator(self.index, frame)
+        return frame
+
+    def isOpened(self):
+        return self._buffer is not None and not self.ended
+
+    def release(self):
+        self._buffer = None
+
+
+def draw_test_pattern(index, frame):
+    """기본 합성 프레임: 회색 배경에 좌우로 움직이는 사각형과 프레임 번호"""
+    h, w = frame.shape[:2]
+    frame[:] = 64
+    size = h // 6
+    x = int((w - size) * (0.5 + 0.5 * np.sin(index / 30.0)))
+    cv2.rectangle(frame, (x, h // 2 - size // 2), (x + size, h // 2 + size // 2), (200, 200, 200), cv2.FILLED)
+    cv2.putText(frame, str(index), (20, h - 20), cv2.FONT_HERSHEY_PLAIN, 2, (255, 255, 255), 2)
+
+
+def parse_synthetic(spec):
+    """'synthetic' 또는 'synthetic:960x720@30' 형식을 (너비, 높이, fps)로 변환"""
+    _, _, options = spec.partition(':')
+    width, height, fps = 960, 720, 30.0
+    if options:
+        size, _, rate = options.partition('@')
+        try:
+            if size:
+                width, height = (int(v) for v in size.lower().split('x'))
+            if rate:
+                fps = float(rate)
+        except ValueError:
+            raise ValueError(f"합성 소스 형식이 잘못되었습니다 (synthetic:WxH@FPS): {spec}")
+    return width, height, fps
+
+
+def create_frame_source(source, fps=30.0, realtime=False, capture_fps=None, **camera_options):
+    """
+    소스 지정으로 프레임 소스 생성 (열지는 않음)
+    카메라 번호(0 또는 '0'), 이미지 디렉터리, 영상 파일, 'synthetic[:WxH@FPS]', 그 외 문자열은 카메라 장치 경로/스트림 주소
+    fps: 이미지 디렉터리/프레임률을 모르는 영상의 재생 프레임률, capture_fps: 카메라 요청 프레임률 (None이면 기본값)
+    camera_options: 그 밖의 CameraSource 인자 (width, height, fourcc, backend, buffer_size)
+    """
+    if isinstance(source, FrameSource):
+        return source
+    fps = fps or 30.0
+    if isinstance(source, int) or source.isdigit():
+        return CameraSource(int(source), fps=capture_fps, **camera_options)
+    if source == 'synthetic' or source.startswith('synthetic:'):
+        width, height, synthetic_fps = parse_synthetic(source)
+        return SyntheticSource(width, height, synthetic_fps, realtime=realtime)
+    if os.path.isdir(source):
+        return ImageDirectorySource(source, fps, realtime=realtime)
+    if os.path.isfile(source):
+        return VideoFileSource(source, realtime=realtime, fps=fps)
+    return CameraSource(source, fps=capture_fps, **camera_options)
@@ -0,0 +1,211 @@
+from collections import namedtuple
+
+import numpy as np
+
+# 손가락 순서 (fingersUp 결과와 같은 순서)
+FINGERS = ['thumb', 'index', 'middle', 'ring', 'pinky']
+FINGER_NAMES = {'thumb': '엄지', 'index': '검지', 'middle': '중지', 'ring': '약지', 'pinky': '소지'}
+FINGER_TIPS = {'thumb': 4, 'index': 8, 'middle': 12, 'ring': 16, 'pinky': 20}
+
+REGION_NAMES = {'gesture': '제스처 영역', 'quit': '종료 버튼', 'side': '그 손 쪽 화면 절반'}
+MODES = {'mouse': 0, 'keyboard': 1}
+MODE_NAMES = {'mouse': '마우스 모드', 'keyboard': '키보드 모드'}
+MOUSE_ACTION_NAMES = {
+    'pointer': '포인터 이동',
+    'click': '엄지와 검지 끝을 모으면 클릭',
+    'quit': '엄지와 검지 끝을 모으면 종료',
+}
+
+# 제스처 규칙
+# fingers: 엄지~소지 순서의 상태 문자열 ('1': 폄, '0': 접음, '-': 상관없음)
+# regions: 영역 안에 있어야 하는 (손가락, 영역) 목록
+# mode: 규칙이 적용되는 컨트롤러 모드 (None이면 모든 모드)
+# key: True면 키 매핑 대상 제스처 (인식 결과와 이벤트 스트림에 포함)
+# exclusive: True면 일치할 때 다른 키 제스처를 무시
+# max_raised: 검지~소지 중 펴도 되는 최대 개수 (None이면 제한 없음)
+# effect: 일치할 때 컨트롤러에 설정할 (속성, 값)
+# mouse_action: 마우스 모드에서의 동작 ('pointer', 'click', 'quit')
+GestureRule = namedtuple('GestureRule', ['name', 'title', 'label', 'fingers', 'regions', 'mode', 'key', 'exclusive',
+                                         'max_raised', 'effect', 'mouse_action'],
+                         defaults=(None, True, False, None, None, None))
+
+GESTURE_RULES = [
+    GestureRule('jump', '점프', 'Jump', '00000', [('thumb', 'gesture')], exclusive=True, effect=('jump', 1)),
+    GestureRule('up', '위로', 'Up', '-10--', [('index', 'gesture')], effect=('v_dir', 1), mouse_action='pointer'),
+    GestureRule('down', '아래로', 'Down', '-110-', [('index', 'gesture'), ('middle', 'gesture')],
+                effect=('v_dir', -1), mouse_action='click'),
+    GestureRule('left', '왼쪽', 'Left', '1---0', [('thumb', 'gesture')], effect=('h_dir', -1)),
+    GestureRule('right', '오른쪽', 'Right', '0---1', [('pinky', 'gesture')], effect=('h_dir', 1)),
+    GestureRule('quit', '종료', 'Quit', '-----', [('index', 'quit'), ('middle', 'quit')], mode='mouse', key=False,
+                max_raised=3, mouse_action='quit'),
+]
+
+# 두 손 모드 규칙 (손잡이별 제스처 표): 왼손은 방향, 오른손은 동작
+# 키보드 모드로만 동작하며 영역 조건은 제스처 영역 대신 그 손 쪽의 화면 절반 ('side')
+def _on_side(rule):
+    return rule._replace(regions=[(finger, 'side') for finger, _ in rule.regions], mouse_action=None)
+
+
+TWO_HAND_RULES = {
+    'Left': [_on_side(rule) for rule in GESTURE_RULES if rule.name in ('up', 'down', 'left', 'right')],
+    'Right': [_on_side(rule) for rule in GESTURE_RULES if rule.name == 'jump'],
+}
+HAND_NAMES = {'Left': '왼손', 'Right': '오른손'}
+
+# 조회 결과 (state: 화면 표시 문자열, gestures: 키 제스처 이름, effects: (속성, 값) 목록, actions: 마우스 모드 동작 집합)
+GestureMatch = namedtuple('GestureMatch', ['state', 'gestures', 'effects', 'actions'])
+
+
+def rule_matches(rule, fingers, hits, mode):
+    """규칙이 손가락 상태(fingers: 0/1 5개)와 영역 판정(hits: {(손가락, 영역): bool})에 맞는지 확인"""
+    if rule.mode is not None and MODES[rule.mode] != mode:
+        return False
+    if any(want != '-' and int(want) != state for want, state in zip(rule.fingers, fingers)):
+        return False
+    if rule.max_raised is not None and sum(fingers[1:]) > rule.max_raised:
+        return False
+    return all(hits[pair] for pair in rule.regions)
+
+
+class GestureTable:
+    """
+    제스처 규칙을 (손가락 상태 비트 + 영역 판정 비트) 인덱스의 조회 표로 미리 계산
+    프레임마다 비트마스크를 한 번 만들어 표를 한 번 조회하므로 규칙 수와 상관없이 비용이 같음
+    """
+
+    def __init__(self, rules=GESTURE_RULES):
+        self.rules = list(rules)
+        # 규칙에 쓰인 (손가락, 영역) 조합마다 비트 하나
+        self.region_checks = []
+        for rule in self.rules:
+            for pair in rule.regions:
+                if pair not in self.region_checks:
+                    self.region_checks.append(pair)
+        self.tips = np.array([FINGER_TIPS[finger] for finger, _ in self.region_checks], dtype=np.intp)
+        self.finger_bits = [1 << i for i in range(len(FINGERS))]
+        self.region_bits = [1 << (len(FINGERS) + i) for i in range(len(self.region_checks))]
+        self._boxes = None
+        self._bounds = []
+        self._label_names = None
+        self._label_checks = []
+        self.table = [self.compile(mode) for mode in sorted(MODES.values())]
+
+    def compile(self, mode):
+        """모든 비트 조합에 대한 결과 목록 생성"""
+        size = 1 << (len(FINGERS) + len(self.region_checks))
+        entries = []
+        for index in range(size):
+            fingers = [(index >> i) & 1 for i in range(len(FINGERS))]
+            hits = {pair: bool((index >> (len(FINGERS) + i)) & 1) for i, pair in enumerate(self.region_checks)}
+            matched = [rule for rule in self.rules if rule_matches(rule, fingers, hits, mode)]
+            if any(rule.exclusive for rule in matched if rule.key):
+                matched = [rule for rule in matched if rule.exclusive or not rule.key]
+            keyed = [rule for rule in matched if rule.key]
+            entries.append(GestureMatch(
+                state=''.join(f"{rule.label} " for rule in keyed),
+                gestures=tuple(rule.name for rule in keyed),
+                effects=tuple(rule.effect for rule in matched if rule.effect is not None),
+                actions=frozenset(rule.mouse_action for rule in matched
+                                  if rule.mouse_action is not None and mode == MODES['mouse']),
+            ))
+        return entries
+
+    def region_bounds(self, boxes):
+        """영역 사각형 사전({영역: (x1, y1, x2, y2)})을 조합별 (x1, y1, x2, y2, 비트) 목록으로 변환 (바뀔 때만 다시 계산)"""
+        if boxes != self._boxes:
+            self._bounds = [tuple(float(v) for v in boxes[region]) + (bit,)
+                            for (_, region), bit in zip(self.region_checks, self.region_bits)]
+            self._boxes = dict(boxes)
+        return self._bounds
+
+    def index(self, fingers, landmarks, boxes):
+        """손가락 상태(0/1 5개)와 랜드마크 (21, 3) 배열로 표 인덱스 계산"""
+        index = sum(bit for bit, state in zip(self.finger_bits, fingers.tolist()) if state)
+        # 작은 배열은 numpy 연산보다 파이썬 비교가 빠름
+        for (x, y), (x1, y1, x2, y2, bit) in zip(landmarks[self.tips, :2].tolist(), self.region_bounds(boxes)):
+            if x1 < x < x2 and y1 < y < y2:
+                index |= bit
+        return index
+
+    def lookup(self, mode, fingers, landmarks, boxes):
+        """현재 모드의 조회 결과 반환 (boxes: 영역 사각형 사전)"""
+        return self.table[mode][self.index(fingers, landmarks, boxes)]
+    
+    def label_checks(self, region_map):
+        """영역 판정 비트별 (손가락 끝 번호, 영역 라벨 비트, 표 인덱스 비트) 목록 (라벨 지도의 영역 구성이 바뀔 때만 다시 계산)"""
+        if region_map.names != self._label_names:
+            self._label_checks = [(FINGER_TIPS[finger], region_map.flags[region], bit)
+                                  for (finger, region), bit in zip(self.region_checks, self.region_bits)]
+            self._label_names = region_map.names
+        return self._label_checks
+    
+    def lookup_labels(self, mode, fingers, labels, region_map):
+        """
+        랜드마크별 영역 라벨(RegionMap.lookup 결과)로 현재 모드의 조회 결과 반환
+        영역 판정을 라벨 지도에서 이미 끝냈으므로 비트만 모음
+        """
+        index = sum(bit for bit, state in zip(self.finger_bits, fingers.tolist()) if state)
+        labels = labels.tolist()
+        for tip, flag, bit in self.label_checks(region_map):
+            if labels[tip] & flag:
+                index |= bit
+        return self.table[mode][index]
+
+
+def describe(rule):
+    """규칙에서 손동작 설명 문장 생성 (설정 창과 README에서 사용)"""
+    raised = [FINGER_NAMES[f] for f, want in zip(FINGERS, rule.fingers) if want == '1']
+    folded = [FINGER_NAMES[f] for f, want in zip(FINGERS, rule.fingers) if want == '0']
+    parts = []
+    if raised:
+        parts.append(f"{'·'.join(raised)}를 펴고")
+    if len(folded) == len(FINGERS):
+        parts.append("주먹을 쥔 채")
+    elif folded:
+        parts.append(f"{'·'.join(folded)}를 접은 채")
+    if rule.max_raised is not None:
+        parts.append(f"검지~소지 중 {rule.max_raised}개 이하만 편 채")
+    regions = {}
+    for finger, region in rule.regions:
+        regions.setdefault(region, []).append(FINGER_NAMES[finger])
+    for region, fingers in regions.items():
+        parts.append(f"{'·'.join(fingers)} 끝을 {REGION_NAMES[region]}에 두면")
+    text = f"{' '.join(parts)} {rule.title}"
+    if rule.mode is not None:
+        text = f"({MODE_NAMES[rule.mode]}) {text}"
+    if rule.mouse_action is not None and rule.mode is None:
+        text += f" (마우스 모드: {MOUSE_ACTION_NAMES[rule.mouse_action]})"
+    elif rule.mouse_action is not None:
+        text += f" ({MOUSE_ACTION_NAMES[rule.mouse_action]})"
+    return text
+
+
+def describe_gesture(name, rules=GESTURE_RULES):
+    """제스처 이름으로 설명 문장 반환"""
+    for rule in rules:
+        if rule.name == name:
+            return describe(rule)
+    return ""
+
+
+def markdown_list(rules=GESTURE_RULES):
+    """README용 제스처 목록 (마크다운)"""
+    return '\n'.join(f"- {rule.title}: {describe(rule)}" for rule in rules)
+
+
+def two_hand_markdown_list(hand_rules=TWO_HAND_RULES):
+    """README용 두 손 모드 제스처 목록 (마크다운)"""
+    return '\n'.join(f"- {HAND_NAMES[hand]} {rule.title}: {describe(rule)}"
+                     for hand, rules in hand_rules.items() for rule in rules)
+
+
+def two_hand_summary(hand_rules=TWO_HAND_RULES):
+    """두 손 모드 손별 제스처 요약 (예: 왼손 위로/아래로, 오른손 점프) - 메뉴와 상태 표시줄에서 사용"""
+    return ', '.join(f"{HAND_NAMES[hand]} {'/'.join(rule.title for rule in rules)}"
+                     for hand, rules in hand_rules.items() if rules)
+
+
+if __name__ == "__main__":
+    print(markdown_list())
+    print()
+    print(two_hand_markdown_list())
@@ -0,0 +1,191 @@
+import argparse
+import socket
+import threading
+from collections import namedtuple
+from time import time
+
+import numpy as np
+
+from LandmarkRecorder import HAND_NONE, HAND_UNKNOWN, HANDEDNESS_CODES, HANDEDNESS_NAMES
+
+DEFAULT_PORT = 9760
+
+# 순번이 이만큼 이상 줄어들면 송신 측이 다시 시작된 것으로 간주
+RESTART_GAP = 1000
+
+# 패킷 구조: 32바이트 헤더 뒤에 (FLAG_LANDMARKS가 있으면) 21x3 float32 랜드마크가 이어짐
+MAGIC = b'VGE1'
+FLAG_LANDMARKS = 0x01
+
+# 제스처 비트 순서 (gestures 필드의 비트 i가 GESTURES[i])
+GESTURES = ['up', 'down', 'left', 'right', 'jump']
+GESTURE_BITS = {name: 1 << i for i, name in enumerate(GESTURES)}
+
+HEADER_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('seq', '<i4'),          # 캡처 프레임 순번
+    ('timestamp', '<f8'),    # 캡처 시각 (time.time() 기준 초)
+    ('sent', '<f8'),         # 전송 시각
+    ('gestures', '<u2'),     # 인식된 제스처 비트마스크
+    ('mode', 'u1'),          # 컨트롤러 모드 (0: 마우스, 1: 키보드)
+    ('flags', 'u1'),
+    ('hand', 'i1'),          # 손잡이 코드 (-1: 손 없음)
+    ('reserved', 'u1', (3,)),
+])
+LANDMARKS_SIZE = 21 * 3 * 4
+
+GestureEvent = namedtuple('GestureEvent', ['seq', 'timestamp', 'sent', 'received', 'gestures', 'mode', 'hand', 'landmarks'])
+
+
+def encode_event(seq, timestamp, gestures, mode, hand=None, landmarks=None):
+    """이벤트 한 개를 패킷 바이트로 변환 (hand: 'Left'/'Right'/None, landmarks: (21, 3) 배열 또는 None)"""
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header['magic'] = MAGIC
+    header['seq'] = seq
+    header['timestamp'] = timestamp
+    header['gestures'] = sum(GESTURE_BITS.get(name, 0) for name in gestures)
+    header['mode'] = mode
+    if landmarks is None:
+        header['hand'] = HAND_NONE
+    else:
+        header['hand'] = HANDEDNESS_CODES.get(hand, HAND_UNKNOWN)
+        header['flags'] = FLAG_LANDMARKS
+    # 전송 시각은 가능한 한 늦게 기록
+    header['sent'] = time()
+    if landmarks is None:
+        return header.tobytes()
+    return header.tobytes() + np.ascontiguousarray(landmarks, dtype='<f4').tobytes()
+
+
+def decode_event(data, received=None):
+    """패킷 바이트를 GestureEvent로 변환 (형식이 맞지 않으면 ValueError)"""
+    if len(data) < HEADER_DTYPE.itemsize or data[:4] != MAGIC:
+        raise ValueError("제스처 이벤트 패킷이 아닙니다")
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1)[0]
+    landmarks = None
+    if header['flags'] & FLAG_LANDMARKS:
+        if len(data) < HEADER_DTYPE.itemsize + LANDMARKS_SIZE:
+            raise ValueError("랜드마크 데이터가 잘렸습니다")
+        landmarks = np.frombuffer(data, dtype='<f4', count=63, offset=HEADER_DTYPE.itemsize).reshape(21, 3)
+    mask = int(header['gestures'])
+    hand = int(header['hand'])
+    return GestureEvent(
+        seq=int(header['seq']),
+        timestamp=float(header['timestamp']),
+        sent=float(header['sent']),
+        received=time() if received is None else received,
+        gestures=tuple(name for name in GESTURES if mask & GESTURE_BITS[name]),
+        mode=int(header['mode']),
+        hand=HANDEDNESS_NAMES.get(hand, 'Unknown') if hand != HAND_NONE else None,
+        landmarks=landmarks,
+    )
+
+
+class GestureStreamPublisher:
+    """프레임마다 제스처/랜드마크 이벤트를 UDP로 전송 (받는 쪽이 없어도 처리 루프를 막지 않음)"""
+
+    def __init__(self, targets=None, include_landmarks=True):
+        self.targets = list(targets) if targets else [('127.0.0.1', DEFAULT_PORT)]
+        self.include_landmarks = include_landmarks
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.setblocking(False)
+        self._lock = threading.Lock()
+        self.sent_count = 0
+        self.error_count = 0
+
+    def publish(self, seq, timestamp, gestures, mode, detector=None):
+        """현재 프레임 결과 전송 (detector: 손이 인식된 Hand_Controller, 없으면 None)"""
+        if detector is not None and self.include_landmarks:
+            data = encode_event(seq, timestamp, gestures, mode, detector.handedness, detector.landmarks)
+        else:
+            data = encode_event(seq, timestamp, gestures, mode)
+        with self._lock:
+            if self._sock is None:
+                return
+            for target in self.targets:
+                try:
+                    self._sock.sendto(data, target)
+                    self.sent_count += 1
+                except OSError:
+                    # 송신 버퍼가 가득 찼거나 받는 쪽이 없음 (이번 이벤트는 버림)
+                    self.error_count += 1
+
+    def close(self):
+        with self._lock:
+            if self._sock is not None:
+                self._sock.close()
+                self._sock = None
+
+
+class GestureStreamSubscriber:
+    """GestureStreamPublisher가 보내는 이벤트를 받는 클라이언트"""
+
+    def __init__(self, port=DEFAULT_PORT, host='127.0.0.1'):
+        self._sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        self._sock.bind((host, port))
+        self.last_seq = None
+        self.lost_count = 0
+
+    def receive(self, timeout=None):
+        """이벤트 한 개를 기다려 반환 (timeout 초 안에 없으면 None)"""
+        self._sock.settimeout(timeout)
+        while True:
+            try:
+                data = self._sock.recv(HEADER_DTYPE.itemsize + LANDMARKS_SIZE)
+            except socket.timeout:
+                return None
+            except ConnectionResetError:
+                continue  # 윈도우에서 이전 송신 실패가 수신 오류로 보고되는 경우
+            try:
+                event = decode_event(data)
+            except ValueError:
+                continue
+            # 순번으로 유실 프레임 집계 (순서가 뒤바뀐 이벤트는 버리고, 크게 줄어들면 재시작으로 간주)
+            if self.last_seq is not None and event.seq >= 0:
+                if self.last_seq - RESTART_GAP < event.seq <= self.last_seq:
+                    continue
+                if event.seq > self.last_seq + 1:
+                    self.lost_count += event.seq - self.last_seq - 1
+            self.last_seq = event.seq
+            return event
+
+    def __iter__(self):
+        while True:
+            yield self.receive()
+
+    def close(self):
+        self._sock.close()
+
+
+def parse_target(text):
+    """'host:port' 또는 'port' 문자열을 (host, port)로 변환"""
+    host, sep, port = text.rpartition(':')
+    return (host if sep else '127.0.0.1', int(port))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='제스처 이벤트 스트림 수신 및 출력')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help='수신 포트')
+    parser.add_argument('--host', default='127.0.0.1', help='수신 주소 (다른 장비에서 받을 때는 0.0.0.0)')
+    parser.add_argument('-a', '--all', action='store_true', help='제스처가 바뀌지 않은 이벤트도 출력')
+    args = parser.parse_args()
+
+    subscriber = GestureStreamSubscriber(args.port, args.host)
+    previous = None
+    try:
+        for event in subscriber:
+            if not args.all and event.gestures == previous:
+                continue
+            previous = event.gestures
+            transport_ms = (event.received - event.sent) * 1000
+            age_ms = (event.received - event.timestamp) * 1000
+            print(f"{event.seq:>7} {'|'.join(event.gestures) or '-':<16} hand={event.hand or '-':<6} "
+                  f"transport {transport_ms:.3f} ms, capture age {age_ms:.1f} ms, lost {subscriber.lost_count}")
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+
+if __name__ == "__main__":
+    main()
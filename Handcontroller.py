@@ -1,20 +1,110 @@
 import cv2
-import mediapipe as mp
 import numpy as np
 
 class Hand_Controller:
-    def __init__(self):
+    def __init__(self, roi_mode=False, roi_margin=0.3, roi_size=256, idle_size=320, keyframe_interval=1, max_hands=1):
+        # mediapipe는 불러오는 데 오래 걸리므로 모델을 만들 때 불러옴
+        import mediapipe as mp
         self.mpHands = mp.solutions.hands
-        self.hands = self.mpHands.Hands(static_image_mode=False, max_num_hands=1, min_detection_confidence=0.5, min_tracking_confidence=0.5)
+        self.max_hands = max_hands
+        self.hands = self.mpHands.Hands(static_image_mode=False, max_num_hands=max_hands, min_detection_confidence=0.5, min_tracking_confidence=0.5)
         self.mpDraw = mp.solutions.drawing_utils
         self.fingertips = [4, 8, 12, 16, 20]
         self.lmlist = []
         self.fingers_up_status = np.array([])
+        
+        # 랜드마크 배열 (21, 3): 실제 프레임 기준 픽셀 좌표 x, y 와 z
+        self.landmarks = np.zeros((21, 3), dtype=np.float32)
+        self.hand_found = False
+        self.handedness = None        # 'Left' / 'Right'
+        self.hand_score = 0.0
+        self.frame_size = (960, 720)  # (너비, 높이), findhand 호출 시 갱신
+        self._tips = np.array(self.fingertips[1:])
+        self._fingers_buf = np.zeros(5, dtype=bool)
+        
+        # ROI 모드: 이전 프레임의 손 영역만 잘라서 인식
+        self.roi_mode = roi_mode
+        self.roi_margin = roi_margin  # 손 영역 주변 여백 비율
+        self.roi_size = roi_size      # 잘라낸 영역의 최대 변 길이 (축소 기준)
+        self.roi = None               # (x0, y0, x1, y1) 픽셀 좌표
+        
+        # 대기 모드: 손이 없을 때 축소한 프레임으로만 인식
+        self.idle_size = idle_size    # 대기 모드 인식 이미지의 최대 변 길이
+        
+        # 키프레임 모드: keyframe_interval 프레임마다 MediaPipe로 인식하고 그 사이는 광학 흐름으로 랜드마크 추적
+        self.keyframe_interval = keyframe_interval  # 1이면 매 프레임 MediaPipe 사용
+        self.flow_confidence = 0.8    # 추적 성공한 랜드마크 비율이 이보다 낮으면 다시 인식
+        self.flow_fb_threshold = 0.03 # 정방향/역방향 추적 오차 허용치 (손 크기 대비 비율)
+        self.flow_params = dict(winSize=(21, 21), maxLevel=3,
+                                criteria=(cv2.TERM_CRITERIA_EPS | cv2.TERM_CRITERIA_COUNT, 20, 0.03))
+        self.flow_tracked = False     # 현재 랜드마크가 광학 흐름 추적 결과인지 여부
+        self.keyframe_count = 0
+        self.flow_count = 0
+        self._flow_prev = None        # 이전 프레임의 손 주변 흑백 이미지
+        self._flow_region = None      # _flow_prev를 잘라낸 영역 (x0, y0, x1, y1)
+        self._frames_since_keyframe = 0
+        
+        # 두 손 모드 (max_hands > 1): 손잡이('Left'/'Right')별 랜드마크와 ROI
+        self.hand_landmarks = {}      # 손잡이 -> (21, 3) 픽셀 좌표 배열 (이번 프레임에 보인 손만)
+        self.hand_rois = {}           # 손잡이 -> (x0, y0, x1, y1)
+        self._hand_buffers = {label: np.zeros((21, 3), dtype=np.float32) for label in ('Left', 'Right')}
+        self.search_interval = 10     # 손이 모자랄 때 전체 프레임에서 나머지 손을 찾는 간격 (프레임)
+        self._frames_since_search = 0
 
-    def findhand(self, frame, draw=True):
-        """손을 감지하고 필요한 경우 손의 랜드마크를 그림"""
-        imgRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        self.results = self.hands.process(imgRGB)
+    def findhand(self, frame, draw=True, idle=False):
+        """
+        손을 감지하고 필요한 경우 손의 랜드마크를 그림
+        idle: True면 축소한 프레임으로 인식하고, 손이 보이면 같은 프레임을 손 영역만 다시 인식
+        """
+        h, w = frame.shape[:2]
+        self.frame_size = (w, h)
+        self.results = None
+        self.flow_tracked = False
+        
+        # 두 손 모드는 손별 ROI로 추적 (광학 흐름 키프레임은 한 손 모드에서만 사용)
+        if self.max_hands > 1:
+            self.results = self.detect_hands(frame, idle)
+            self.update_hands(w, h)
+            if draw and self.results.multi_hand_landmarks:
+                for handLms in self.results.multi_hand_landmarks:
+                    self.mpDraw.draw_landmarks(frame, handLms, self.mpHands.HAND_CONNECTIONS)
+            return frame
+        
+        # 키프레임 사이에는 이전 랜드마크를 광학 흐름으로 옮김 (흐름이 어긋나면 바로 다시 인식)
+        if self.keyframe_interval > 1:
+            if (not idle and self._flow_prev is not None
+                    and self._frames_since_keyframe < self.keyframe_interval - 1 and self.track_flow(frame)):
+                self._frames_since_keyframe += 1
+                self.flow_count += 1
+                self.update_flow_state(frame)
+                if draw:
+                    self.draw_landmarks(frame)
+                return frame
+            self._frames_since_keyframe = 0
+            self.keyframe_count += 1
+        
+        # 이전 프레임에서 손을 찾았다면 그 주변만 인식
+        if self.roi_mode and self.roi is not None:
+            self.results = self.process_roi(frame, self.roi)
+            if not self.results.multi_hand_landmarks:
+                self.results = None  # 손을 놓치면 전체 프레임으로 다시 인식
+        
+        if self.results is None and idle:
+            self.results = self.process_idle(frame)
+        
+        if self.results is None:
+            imgRGB = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+            self.results = self.hands.process(imgRGB)
+        
+        if self.roi_mode:
+            self.roi = self.hand_roi(w, h) if self.results.multi_hand_landmarks else None
+        
+        # 다음 프레임 광학 흐름 추적 준비
+        if self.keyframe_interval > 1:
+            if self.findLandmarks() is not None:
+                self.update_flow_state(frame)
+            else:
+                self._flow_prev = self._flow_region = None
         
         if self.results.multi_hand_landmarks:
             for handLms in self.results.multi_hand_landmarks:
@@ -22,45 +112,301 @@ class Hand_Controller:
                     self.mpDraw.draw_landmarks(frame, handLms, self.mpHands.HAND_CONNECTIONS)
         return frame
 
+    def reset_tracking(self):
+        """프레임 간 추적 상태(ROI, 광학 흐름) 초기화"""
+        self.roi = None
+        self.hand_rois = {}
+        self.hand_landmarks = {}
+        self._frames_since_search = 0
+        self.flow_tracked = False
+        self._flow_prev = self._flow_region = None
+        self._frames_since_keyframe = 0
+
+    def process_roi(self, frame, roi):
+        """ROI 영역만 잘라 축소 후 인식하고 랜드마크를 전체 프레임 좌표로 변환"""
+        h, w = frame.shape[:2]
+        x0, y0, x1, y1 = roi
+        crop = frame[y0:y1, x0:x1]
+        cw, ch = x1 - x0, y1 - y0
+        
+        # 색 변환 전에 축소하여 변환/추론 비용 절감
+        scale = self.roi_size / max(cw, ch)
+        if scale < 1:
+            crop = cv2.resize(crop, (max(1, int(cw * scale)), max(1, int(ch * scale))), interpolation=cv2.INTER_AREA)
+        
+        results = self.hands.process(cv2.cvtColor(crop, cv2.COLOR_BGR2RGB))
+        
+        # 잘라낸 영역 기준 정규화 좌표 -> 전체 프레임 기준 정규화 좌표
+        if results.multi_hand_landmarks:
+            for handLms in results.multi_hand_landmarks:
+                for lm in handLms.landmark:
+                    lm.x = (x0 + lm.x * cw) / w
+                    lm.y = (y0 + lm.y * ch) / h
+                    lm.z = lm.z * cw / w
+        return results
+
+    def process_idle(self, frame):
+        """축소한 전체 프레임으로 인식 (손이 보이면 그 영역을 원본 해상도로 다시 인식)"""
+        h, w = frame.shape[:2]
+        scale = self.idle_size / max(w, h)
+        small = cv2.resize(frame, (max(1, int(w * scale)), max(1, int(h * scale))), interpolation=cv2.INTER_AREA) if scale < 1 else frame
+        
+        # 정규화 좌표이므로 축소한 프레임의 결과도 원본 프레임 기준 좌표
+        self.results = self.hands.process(cv2.cvtColor(small, cv2.COLOR_BGR2RGB))
+        if not self.results.multi_hand_landmarks:
+            return self.results
+        
+        rois = [self.hand_roi(w, h, i) for i in range(len(self.results.multi_hand_landmarks))]
+        rois = [roi for roi in rois if roi is not None]
+        if rois:
+            refined = self.process_rois(frame, rois)
+            if refined.multi_hand_landmarks:
+                return refined
+        return self.results
+    
+    def process_rois(self, frame, rois):
+        """
+        여러 손 ROI를 한 번의 추론으로 인식 (손이 늘어도 MediaPipe 호출은 한 번)
+        ROI가 하나거나 서로 겹치면 하나로 합쳐 잘라내고, 떨어져 있으면 roi_size 칸에 나란히 붙인 한 장으로 인식
+        """
+        if len(rois) == 1:
+            return self.process_roi(frame, rois[0])
+        h, w = frame.shape[:2]
+        (ax0, ay0, ax1, ay1), (bx0, by0, bx1, by1) = rois[:2]
+        if ax0 < bx1 and bx0 < ax1 and ay0 < by1 and by0 < ay1:
+            union = self.square_roi(min(ax0, bx0), min(ay0, by0), max(ax1, bx1), max(ay1, by1), w, h, 0.0)
+            return self.process_roi(frame, union)
+        
+        size = self.roi_size
+        mosaic = np.zeros((size, size * 2, 3), dtype=np.uint8)
+        tiles = []
+        for i, (x0, y0, x1, y1) in enumerate(rois[:2]):
+            cw, ch = x1 - x0, y1 - y0
+            scale = min(1.0, size / max(cw, ch))
+            tw, th = max(1, int(cw * scale)), max(1, int(ch * scale))
+            crop = frame[y0:y1, x0:x1]
+            mosaic[:th, i * size:i * size + tw] = crop if scale == 1.0 else cv2.resize(crop, (tw, th), interpolation=cv2.INTER_AREA)
+            tiles.append((x0, y0, cw / tw, ch / th))
+        
+        results = self.hands.process(cv2.cvtColor(mosaic, cv2.COLOR_BGR2RGB))
+        
+        # 붙인 이미지 기준 정규화 좌표 -> 각 손이 속한 칸의 원래 위치 기준 정규화 좌표
+        if results.multi_hand_landmarks:
+            mw = size * 2
+            for handLms in results.multi_hand_landmarks:
+                tile = min(1, int(sum(lm.x for lm in handLms.landmark) / len(handLms.landmark) * 2))
+                x0, y0, sx, sy = tiles[tile]
+                for lm in handLms.landmark:
+                    lm.x = (x0 + (lm.x * mw - tile * size) * sx) / w
+                    lm.y = (y0 + lm.y * size * sy) / h
+                    lm.z = lm.z * mw * sx / w
+        return results
+    
+    def detect_hands(self, frame, idle=False):
+        """
+        두 손 모드 인식: 추적 중인 손들의 ROI를 한 번에 인식하고,
+        손이 max_hands보다 적으면 search_interval 프레임마다 전체 프레임에서 나머지 손을 찾음
+        """
+        self._frames_since_search += 1
+        rois = list(self.hand_rois.values())
+        search = len(rois) < self.max_hands and self._frames_since_search >= self.search_interval
+        if self.roi_mode and rois and not search:
+            results = self.process_rois(frame, rois)
+            if len(results.multi_hand_landmarks or ()) >= len(rois):
+                return results
+            # 추적하던 손을 놓치면 전체 프레임으로 다시 인식
+        self._frames_since_search = 0
+        if idle:
+            return self.process_idle(frame)
+        return self.hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    
+    def update_hands(self, w, h):
+        """
+        인식 결과를 손잡이별 랜드마크/ROI로 정리
+        두 손의 손잡이가 같거나 없으면 화면 위치로 구분 (거울 모드 영상에서 왼쪽에 있는 손이 왼손)
+        """
+        hands = self.results.multi_hand_landmarks or []
+        labels = [c.classification[0].label for c in self.results.multi_handedness] if self.results.multi_handedness else []
+        if len(labels) != len(hands):
+            labels = [None] * len(hands)
+        
+        points = []
+        for hand in hands[:2]:
+            points.append([(lm.x * w, lm.y * h, lm.z * w) for lm in hand.landmark])
+        if len(points) == 2 and (labels[0] == labels[1] or None in labels):
+            order = sorted(range(2), key=lambda i: sum(p[0] for p in points[i]))
+            labels = [None, None]
+            labels[order[0]], labels[order[1]] = 'Left', 'Right'
+        elif len(points) == 1 and labels[0] is None:
+            labels = ['Right']
+        
+        self.hand_landmarks = {}
+        self.hand_rois = {}
+        for label, hand_points in zip(labels, points):
+            landmarks = self._hand_buffers[label]
+            landmarks[:] = hand_points
+            self.hand_landmarks[label] = landmarks
+            if self.roi_mode:
+                (min_x, min_y), (max_x, max_y) = landmarks[:, :2].min(axis=0), landmarks[:, :2].max(axis=0)
+                roi = self.square_roi(min_x, min_y, max_x, max_y, w, h, self.roi_margin)
+                if roi is not None:
+                    self.hand_rois[label] = roi
+
+    def hand_roi(self, w, h, hand_index=0):
+        """인식된 손의 경계 상자에 여백을 더한 정사각형 ROI 계산"""
+        hand = self.results.multi_hand_landmarks[hand_index]
+        xs = [lm.x * w for lm in hand.landmark]
+        ys = [lm.y * h for lm in hand.landmark]
+        return self.square_roi(min(xs), min(ys), max(xs), max(ys), w, h, self.roi_margin)
+
+    def square_roi(self, min_x, min_y, max_x, max_y, w, h, margin):
+        """경계 상자에 여백(margin 비율)을 더한 정사각형 영역을 프레임 안으로 잘라 반환 (너무 작으면 None)"""
+        cx, cy = (min_x + max_x) / 2, (min_y + max_y) / 2
+        size = max(max_x - min_x, max_y - min_y) * (1 + 2 * margin)
+        half = max(size, 64) / 2
+        
+        x0, y0 = max(0, int(cx - half)), max(0, int(cy - half))
+        x1, y1 = min(w, int(cx + half)), min(h, int(cy + half))
+        if x1 - x0 < 16 or y1 - y0 < 16:
+            return None
+        return (x0, y0, x1, y1)
+
+    def track_flow(self, frame):
+        """
+        이전 프레임의 랜드마크를 피라미드 Lucas-Kanade 광학 흐름으로 현재 프레임에 옮김
+        정방향/역방향 추적이 일치하지 않는 점이 많거나 손 크기가 급변하면 False (다시 인식 필요)
+        """
+        x0, y0, x1, y1 = self._flow_region
+        gray = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+        if gray.shape != self._flow_prev.shape:
+            return False
+        
+        prev_pts = (self.landmarks[:, :2] - (x0, y0)).astype(np.float32).reshape(-1, 1, 2)
+        next_pts, status, _ = cv2.calcOpticalFlowPyrLK(self._flow_prev, gray, prev_pts, None, **self.flow_params)
+        back_pts, back_status, _ = cv2.calcOpticalFlowPyrLK(gray, self._flow_prev, next_pts, None, **self.flow_params)
+        
+        prev_xy, next_xy = prev_pts.reshape(-1, 2), next_pts.reshape(-1, 2)
+        hand_size = float(np.ptp(prev_xy, axis=0).max())
+        fb_error = np.linalg.norm(back_pts.reshape(-1, 2) - prev_xy, axis=1)
+        good = (status.ravel() == 1) & (back_status.ravel() == 1) & (fb_error < max(1.0, self.flow_fb_threshold * hand_size))
+        if good.mean() < self.flow_confidence:
+            return False
+        
+        # 추적에 실패한 점은 성공한 점들의 중앙값 이동량만큼 옮김
+        shift = np.median(next_xy[good] - prev_xy[good], axis=0)
+        moved = np.where(good[:, None], next_xy, prev_xy + shift)
+        
+        # 손 크기가 급변하면 흐름이 어긋난 것으로 판단
+        new_size = float(np.ptp(moved, axis=0).max())
+        if hand_size <= 0 or not 0.8 < new_size / hand_size < 1.25:
+            return False
+        
+        self.landmarks[:, :2] = moved + (x0, y0)
+        self.flow_tracked = True
+        self.hand_found = True
+        return True
+
+    def update_flow_state(self, frame):
+        """현재 랜드마크 주변 영역을 흑백으로 저장하여 다음 프레임 추적에 사용 (ROI도 함께 갱신)"""
+        h, w = frame.shape[:2]
+        (min_x, min_y), (max_x, max_y) = self.landmarks[:, :2].min(axis=0), self.landmarks[:, :2].max(axis=0)
+        region = self.square_roi(min_x, min_y, max_x, max_y, w, h, self.roi_margin + 0.2)
+        if region is None:
+            self._flow_prev = self._flow_region = None
+            return
+        if self.flow_tracked and self.roi_mode:
+            self.roi = self.square_roi(min_x, min_y, max_x, max_y, w, h, self.roi_margin)
+        x0, y0, x1, y1 = region
+        self._flow_region = region
+        self._flow_prev = cv2.cvtColor(frame[y0:y1, x0:x1], cv2.COLOR_BGR2GRAY)
+
+    def draw_landmarks(self, frame):
+        """현재 랜드마크 배열을 손 연결선과 함께 그림 (광학 흐름 추적 프레임용)"""
+        points = self.landmarks[:, :2].astype(int).tolist()
+        for start, end in self.mpHands.HAND_CONNECTIONS:
+            cv2.line(frame, tuple(points[start]), tuple(points[end]), (224, 224, 224), 2)
+        for point in points:
+            cv2.circle(frame, tuple(point), 3, (0, 0, 255), cv2.FILLED)
+
+    def findLandmarks(self):
+        """손의 랜드마크를 (21, 3) float32 배열로 반환 (손이 없으면 None)"""
+        if self.flow_tracked:
+            return self.landmarks
+        
+        self.hand_found = bool(self.results is not None and self.results.multi_hand_landmarks)
+        if not self.hand_found:
+            self.handedness = None
+            return None
+        
+        if self.results.multi_handedness:
+            classification = self.results.multi_handedness[0].classification[0]
+            self.handedness, self.hand_score = classification.label, classification.score
+        
+        hand = self.results.multi_hand_landmarks[0]
+        landmarks = self.landmarks
+        for id, lm in enumerate(hand.landmark):
+            landmarks[id, 0] = lm.x
+            landmarks[id, 1] = lm.y
+            landmarks[id, 2] = lm.z
+        
+        # 정규화 좌표 -> 실제 프레임 픽셀 좌표 (z는 너비 기준 스케일)
+        w, h = self.frame_size
+        landmarks *= (w, h, w)
+        return landmarks
+
+    def set_landmarks(self, landmarks, frame_size=None, handedness=None):
+        """외부(기록 재생 등)에서 받은 랜드마크 배열을 현재 손 상태로 설정 (None이면 손 없음)"""
+        if frame_size is not None:
+            self.frame_size = frame_size
+        self.results = None
+        self.flow_tracked = False
+        self.hand_found = landmarks is not None
+        self.handedness = handedness if self.hand_found else None
+        if not self.hand_found:
+            return None
+        self.landmarks[:] = landmarks
+        return self.landmarks
+
     def findPosition(self, draw=False):
-        """손의 랜드마크 위치 찾기"""
+        """손의 랜드마크 위치 찾기 (호환용 [id, cx, cy] 리스트)"""
         self.lmlist = []
-        if self.results.multi_hand_landmarks:
-            hand = self.results.multi_hand_landmarks[0]
-            for id, lm in enumerate(hand.landmark):
-                h, w, c = 720, 960, 3  # 이미지 높이, 너비 기본값
-                cx, cy = int(lm.x * w), int(lm.y * h)
-                self.lmlist.append([id, cx, cy])
+        if self.findLandmarks() is not None:
+            self.lmlist = [[id, cx, cy] for id, (cx, cy) in enumerate(self.landmarks[:, :2].astype(int).tolist())]
         return self.lmlist
 
+    def fingers_up(self, landmarks, handedness='Right'):
+        """
+        주어진 손의 손가락 상태 (엄지~소지 0/1 배열)
+        엄지는 손잡이에 따라 방향이 반대 (거울 모드 영상에서 오른손 엄지는 왼쪽으로, 왼손 엄지는 오른쪽으로 펴짐)
+        """
+        fingers = np.zeros(5, dtype=int)
+        if handedness == 'Left':
+            fingers[0] = landmarks[4, 0] > landmarks[3, 0]
+        else:
+            fingers[0] = landmarks[4, 0] < landmarks[3, 0]
+        fingers[1:] = landmarks[self._tips, 1] < landmarks[self._tips - 2, 1] - 10
+        return fingers
+
     def fingersUp(self):
         """손가락이 펴져 있는지 확인"""
-        fingers = []
-        if len(self.lmlist) != 0:
-            # 엄지
-            if self.lmlist[self.fingertips[0]][1] < self.lmlist[self.fingertips[0]-1][1]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
-
-            # 다른 손가락들 - 임계값 조정으로 더 정확한 감지
-            for id in range(1, 5):
-                # 손가락 끝이 관절보다 더 위에 있으면 펴진 상태(1), 그렇지 않으면 굽힘 상태(0)
-                # 임계값을 약간 조정하여 더 명확하게 구분
-                threshold = 10  # 픽셀 단위 임계값
-                if self.lmlist[self.fingertips[id]][2] < self.lmlist[self.fingertips[id]-2][2] - threshold:
-                    fingers.append(1)
-                else:
-                    fingers.append(0)
-            
-            return np.array(fingers)
-        return np.array([])
+        if not self.hand_found:
+            return np.array([])
+        
+        landmarks = self.landmarks
+        fingers = self._fingers_buf
+        # 엄지: 끝이 바로 아래 관절보다 왼쪽에 있으면 펴진 상태
+        fingers[0] = landmarks[4, 0] < landmarks[3, 0]
+        # 다른 손가락: 끝이 두 마디 아래 관절보다 임계값 이상 위에 있으면 펴진 상태
+        threshold = 10  # 픽셀 단위 임계값
+        np.less(landmarks[self._tips, 1], landmarks[self._tips - 2, 1] - threshold, out=fingers[1:])
+        return fingers.astype(int)
 
     def findDistance(self, img, p1, p2, draw=True):
         """두 손가락 사이의 거리 계산"""
-        if len(self.lmlist) >= max(p1, p2) + 1:
-            x1, y1 = self.lmlist[p1*4][1:] if p1 < 5 else self.lmlist[p1][1:]
-            x2, y2 = self.lmlist[p2*4][1:] if p2 < 5 else self.lmlist[p2][1:]
+        if self.hand_found:
+            points = self.landmarks[[p1*4 if p1 < 5 else p1, p2*4 if p2 < 5 else p2], :2]
+            length = float(np.hypot(*(points[1] - points[0])))
+            (x1, y1), (x2, y2) = points.astype(int).tolist()
             cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
             
             if draw:
@@ -69,6 +415,5 @@ class Hand_Controller:
                 cv2.line(img, (x1, y1), (x2, y2), (255, 0, 255), 3)
                 cv2.circle(img, (cx, cy), 10, (255, 0, 255), cv2.FILLED)
             
-            length = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
             return [length, (cx, cy)]
         return [None, None]
@@ -0,0 +1,170 @@
+import argparse
+import os
+from time import sleep, time
+
+from VirtualGameController import VirtualGameController
+from FrameSource import CAPTURE_BACKENDS, create_frame_source
+from Profiles import ProfileWatcher, load_mappings, load_profile, prepare_profile
+from OfflineProcessor import iter_frames
+from Telemetry import TelemetryHttpServer
+from GestureStream import parse_target
+
+
+def parse_source(source):
+    """카메라 번호('0')는 정수로, 그 외(영상/이미지 디렉터리/합성 소스/스트림 주소)는 문자열 그대로 반환"""
+    return int(source) if source.isdigit() else source
+
+
+def parse_resolution(text):
+    """'960x720' 형식을 (너비, 높이)로 변환"""
+    try:
+        width, height = (int(v) for v in text.lower().split('x'))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"해상도 형식이 잘못되었습니다 (WxH): {text}")
+    return width, height
+
+
+class HeadlessRunner:
+    """미리보기/오버레이 없이 VirtualGameController를 실행하고 주기적으로 지표를 콘솔에 출력"""
+
+    def __init__(self, controller, stats_interval=5.0):
+        self.controller = controller
+        self.stats_interval = stats_interval
+        self._last_stats = time()
+
+    def print_stats(self, force=False):
+        """stats_interval마다 (force면 즉시) 지표 한 줄 출력"""
+        now = time()
+        if not force and now - self._last_stats < self.stats_interval:
+            return
+        self._last_stats = now
+        input_stats = self.controller.get_input_stats()
+        print(f"[{self.controller.telemetry.frame_count:>7}] {self.controller.telemetry.summary_text()} | "
+              f"keys {input_stats['emitted']}/{input_stats['suppressed']} held {','.join(input_stats['held']) or '-'}",
+              flush=True)
+
+    def run_camera(self, active=True):
+        """카메라 프레임을 도착하는 대로 처리 (종료 제스처가 확인되면 반환)"""
+        controller = self.controller
+        cap = controller.cap
+        if cap is None or not cap.isOpened():
+            raise IOError("카메라를 열 수 없습니다")
+        while True:
+            packet = cap.wait_for_frame(timeout=0.5)
+            if packet is None:
+                if not cap.isOpened():
+                    return  # 실시간으로 재생한 파일/합성 소스가 끝남
+                continue  # 새 프레임이 없으면 같은 프레임을 다시 처리하지 않음
+            process_start = time()
+            frame, quit_flag = controller.process_frame(active, render=False, packet=packet)
+            if quit_flag:
+                return
+            self.print_stats()
+            # 대기 모드(손 없음)에서는 처리 빈도를 낮춤
+            delay = controller.idle_delay(time() - process_start)
+            if delay > 0:
+                sleep(delay)
+
+    def run_file(self, source, active=False, flip=True):
+        """영상 파일/이미지 디렉터리/합성 소스를 최대 속도로 처리"""
+        controller = self.controller
+        for index, timestamp, frame in iter_frames(source):
+            controller.frame_seq = index
+            controller.frame_timestamp = timestamp
+            _, quit_flag = controller.process_image(frame, active, render=False, flip=flip)
+            if quit_flag:
+                return
+            self.print_stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='GUI 없이 가상 게임 컨트롤러 실행')
+    parser.add_argument('--source', default='0',
+                        help='카메라 번호, 영상 파일, 이미지 디렉터리, 합성 소스(synthetic[:WxH@FPS]) 또는 스트림 주소')
+    parser.add_argument('--realtime', action='store_true',
+                        help='영상/이미지/합성 소스를 카메라처럼 프레임률에 맞춰 재생 (캡처 스레드와 입력 전송까지 사용)')
+    parser.add_argument('--resolution', type=parse_resolution, default=(960, 720), metavar='WxH', help='카메라 요청 해상도')
+    parser.add_argument('--capture-fps', type=float, help='카메라 요청 프레임률')
+    parser.add_argument('--fourcc', help='카메라 픽셀 형식 (MJPG, YUYV 등)')
+    parser.add_argument('--capture-backend', default='auto', choices=list(CAPTURE_BACKENDS), help='카메라 캡처 백엔드')
+    parser.add_argument('--buffer-size', type=int, default=1, help='카메라 드라이버 버퍼 프레임 수')
+    parser.add_argument('--profile', help='프로필 JSON (mappings, areas, pointer_filter, performance), 실행 중 수정하면 다시 읽음')
+    parser.add_argument('--map', action='append', default=[], metavar='GESTURE=KEY', help='제스처-키 매핑 (여러 번 지정 가능)')
+    parser.add_argument('--dry-run', action='store_true', help='키보드/마우스 입력을 보내지 않음')
+    parser.add_argument('--no-flip', action='store_true', help='영상 파일을 좌우 반전하지 않음')
+    parser.add_argument('--keyframe-interval', type=int,
+                        help='MediaPipe 인식 간격 (프레임, 그 사이는 광학 흐름으로 랜드마크 추적, 프로필 설정보다 우선)')
+    parser.add_argument('--two-hand', action='store_true', help='두 손 모드 (왼손 방향, 오른손 동작, 키보드 모드로만 동작)')
+    parser.add_argument('--input-backend', default='auto', choices=['auto', 'sendinput', 'xtest', 'uinput', 'recording', 'none'],
+                        help='키보드/마우스 입력 백엔드')
+    parser.add_argument('--speech', default='auto', choices=['auto', 'sapi', 'command', 'print', 'none'],
+                        help='음성 안내 백엔드')
+    parser.add_argument('--stats-interval', type=float, default=5.0, help='지표 출력 간격(초)')
+    parser.add_argument('--metrics-port', type=int, help='로컬 HTTP 지표 엔드포인트 포트')
+    parser.add_argument('--stream', action='append', default=[], metavar='[HOST:]PORT',
+                        help='제스처/랜드마크 이벤트를 UDP로 전송할 주소 (여러 번 지정 가능)')
+    parser.add_argument('--stream-no-landmarks', action='store_true', help='이벤트에 랜드마크를 포함하지 않음')
+    args = parser.parse_args()
+
+    width, height = args.resolution
+    source = create_frame_source(parse_source(args.source), realtime=args.realtime, width=width, height=height,
+                                 capture_fps=args.capture_fps, fourcc=args.fourcc, backend=args.capture_backend,
+                                 buffer_size=args.buffer_size)
+    # 실시간 소스(카메라, --realtime)가 아니면 파일처럼 최대 속도로 처리
+    is_file = not source.live
+
+    # 명령줄 인자는 프로필 파일보다 우선 (파일을 다시 읽을 때도 유지)
+    def with_overrides(profile):
+        profile = dict(profile, mappings=load_mappings(profile, args.map))
+        if args.keyframe_interval is not None:
+            profile['performance'] = dict(profile.get('performance', {}), keyframe_interval=args.keyframe_interval)
+        return profile
+    
+    # 프로필은 카메라를 열기 전에 검증
+    profile_name = os.path.splitext(os.path.basename(args.profile))[0] if args.profile else None
+    try:
+        settings = prepare_profile(with_overrides(load_profile(args.profile)), profile_name)
+    except (OSError, ValueError, TypeError) as e:
+        parser.error(f"프로필을 읽지 못했습니다 ({args.profile}): {e}")
+    
+    # 카메라 열기와 모델 로드는 컨트롤러 생성 시 병렬로 수행
+    controller = VirtualGameController(open_camera=not is_file, inject_input=not args.dry_run, camera_source=source,
+                                       speech_backend=args.speech, input_backend=args.input_backend,
+                                       two_hand=args.two_hand)
+    controller.set_profile(settings)
+    
+    watcher = None
+    if args.profile:
+        watcher = ProfileWatcher(args.profile, lambda profile, name: controller.set_profile(
+            with_overrides(profile), name)).start()
+
+    if args.stream:
+        controller.start_event_stream([parse_target(text) for text in args.stream], not args.stream_no_landmarks)
+
+    metrics_server = None
+    if args.metrics_port:
+        metrics_server = TelemetryHttpServer(controller.telemetry, args.metrics_port).start()
+
+    runner = HeadlessRunner(controller, args.stats_interval)
+    try:
+        if is_file:
+            # 파일 입력은 입력 전송 없이 인식 결과만 확인
+            runner.run_file(source, active=False, flip=not args.no_flip)
+        else:
+            runner.run_camera(active=True)
+    except KeyboardInterrupt:
+        pass
+    except IOError as e:
+        print(e)
+    finally:
+        runner.print_stats(force=True)
+        print(source.summary_text())
+        if watcher is not None:
+            watcher.stop()
+        if metrics_server is not None:
+            metrics_server.stop()
+        controller.close()
+
+
+if __name__ == "__main__":
+    main()
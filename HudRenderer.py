@@ -0,0 +1,111 @@
+from collections import OrderedDict
+
+import cv2
+import numpy as np
+
+
+class HudLayer:
+    """
+    미리 렌더링된 그리기 결과 (경계 상자 크기의 이미지 + 마스크)
+    합성 결과 픽셀 = 배경 * scale + base 이므로 안티앨리어싱된 가장자리도 그대로 재현
+    """
+
+    def __init__(self, shape, render_fn):
+        # 검은/흰 배경에 각각 그려 덮는 정도(scale)를 계산
+        black = np.zeros(shape, dtype=np.uint8)
+        white = np.full(shape, 255, dtype=np.uint8)
+        render_fn(black)
+        render_fn(white)
+        scale = (white.astype(np.float32) - black) / 255
+        max_scale = scale.max(axis=-1)
+        covered = max_scale < 1.0
+
+        # 그려진 픽셀의 경계 상자만 보관
+        ys, xs = np.nonzero(covered)
+        if ys.size == 0:
+            self.y0 = self.x0 = 0
+            self.base = np.zeros((0, 0, shape[2]), dtype=np.uint8)
+            self.mask = np.zeros((0, 0), dtype=np.uint8)
+            self.partial_y = self.partial_x = np.zeros(0, dtype=np.intp)
+            return
+        self.y0, self.x0 = int(ys.min()), int(xs.min())
+        y1, x1 = int(ys.max()) + 1, int(xs.max()) + 1
+        self.base = black[self.y0:y1, self.x0:x1].copy()
+
+        # 완전히 덮는 픽셀은 마스크 복사, 부분적으로 덮는 픽셀은 혼합
+        full = max_scale[self.y0:y1, self.x0:x1] == 0.0
+        partial = covered[self.y0:y1, self.x0:x1] & ~full
+        self.mask = full.astype(np.uint8)
+        self.partial_y, self.partial_x = np.nonzero(partial)
+        self.partial_base = self.base[self.partial_y, self.partial_x].astype(np.float32) + 0.5
+        self.partial_scale = scale[self.y0:y1, self.x0:x1][self.partial_y, self.partial_x]
+
+    def composite(self, img, y0, x0):
+        """img의 (y0, x0) 위치에 합성 (화면 밖 부분은 잘라냄)"""
+        ph, pw = self.mask.shape
+        h, w = img.shape[:2]
+        cy0, cx0 = max(0, -y0), max(0, -x0)
+        cy1, cx1 = min(ph, h - y0), min(pw, w - x0)
+        if cy0 >= cy1 or cx0 >= cx1:
+            return
+        clipped = cy0 or cx0 or cy1 < ph or cx1 < pw
+
+        roi = img[y0 + cy0:y0 + cy1, x0 + cx0:x0 + cx1]
+        if clipped:
+            cv2.copyTo(self.base[cy0:cy1, cx0:cx1], self.mask[cy0:cy1, cx0:cx1], roi)
+        else:
+            cv2.copyTo(self.base, self.mask, roi)
+
+        if self.partial_y.size:
+            partial_y, partial_x = self.partial_y, self.partial_x
+            partial_base, partial_scale = self.partial_base, self.partial_scale
+            if clipped:
+                inside = (partial_y >= cy0) & (partial_y < cy1) & (partial_x >= cx0) & (partial_x < cx1)
+                partial_y, partial_x = partial_y[inside], partial_x[inside]
+                partial_base, partial_scale = partial_base[inside], partial_scale[inside]
+            ys, xs = partial_y + y0, partial_x + x0
+            img[ys, xs] = (img[ys, xs] * partial_scale + partial_base).astype(np.uint8)
+
+
+class HudRenderer:
+    """
+    고정 HUD 요소는 한 번만 그려 캐시해 두고 매 프레임 한 번의 마스크 복사로 합성
+    바뀌는 문자열은 문자열별로 렌더링 결과를 캐시하여 재사용
+    """
+
+    def __init__(self, max_cached_texts=256):
+        self._static_key = None
+        self._static = None
+        self._text_cache = OrderedDict()
+        self.max_cached_texts = max_cached_texts
+
+    def draw_static(self, img, layout_key, render_fn):
+        """
+        layout_key가 바뀔 때만 render_fn(overlay)으로 고정 레이어를 다시 그리고 img에 합성
+        layout_key: 레이아웃/해상도/폰트 설정을 담은 튜플
+        """
+        key = (img.shape, layout_key)
+        if key != self._static_key:
+            self._static = HudLayer(img.shape, render_fn)
+            self._static_key = key
+        self._static.composite(img, self._static.y0, self._static.x0)
+
+    def draw_text(self, img, text, org, font, scale, color, thickness):
+        """cv2.putText와 같은 결과를 캐시된 렌더링으로 그림"""
+        key = (text, font, scale, color, thickness)
+        cached = self._text_cache.get(key)
+        if cached is None:
+            # 기준점(왼쪽 아래)을 패치 안쪽 (pad, pad + 글자 높이)에 두고 렌더링
+            (tw, th), baseline = cv2.getTextSize(text, font, scale, thickness)
+            pad = thickness + 2
+            layer = HudLayer((th + baseline + 2 * pad, tw + 2 * pad, 3),
+                             lambda patch: cv2.putText(patch, text, (pad, pad + th), font, scale, color, thickness))
+            cached = (layer, layer.y0 - pad - th, layer.x0 - pad)
+            self._text_cache[key] = cached
+            if len(self._text_cache) > self.max_cached_texts:
+                self._text_cache.popitem(last=False)
+        else:
+            self._text_cache.move_to_end(key)
+
+        layer, off_y, off_x = cached
+        layer.composite(img, org[1] + off_y, org[0] + off_x)
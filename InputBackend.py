@@ -0,0 +1,317 @@
+import ctypes
+import ctypes.util
+import ctypes.wintypes
+import sys
+import threading
+from collections import deque, namedtuple
+from time import perf_counter
+
+import numpy as np
+
+# 입력 이벤트 (kind: 'key_down', 'key_up', 'move', 'click')
+InputEvent = namedtuple('InputEvent', ['kind', 'key', 'x', 'y'])
+
+
+def key_down(key):
+    return InputEvent('key_down', key, 0, 0)
+
+
+def key_up(key):
+    return InputEvent('key_up', key, 0, 0)
+
+
+def mouse_move(x, y):
+    return InputEvent('move', None, int(x), int(y))
+
+
+def mouse_click(x, y):
+    return InputEvent('click', None, int(x), int(y))
+
+
+class InputBackend:
+    """한 프레임의 입력 이벤트를 한 번에 전송하는 백엔드 (하위 클래스는 _send 구현)"""
+    name = 'base'
+
+    def __init__(self, window=240):
+        self.latencies = deque(maxlen=window)  # 최근 배치의 이벤트당 전송 시간(초)
+        self.event_count = 0
+        self.batch_count = 0
+        self._lock = threading.Lock()
+
+    def submit(self, events):
+        """이벤트 목록을 한 번의 호출로 전송하고 이벤트당 전송 시간 기록"""
+        if not events:
+            return
+        with self._lock:
+            start = perf_counter()
+            self._send(events)
+            elapsed = perf_counter() - start
+            self.latencies.append(elapsed / len(events))
+            self.event_count += len(events)
+            self.batch_count += 1
+
+    def _send(self, events):
+        raise NotImplementedError
+
+    def get_stats(self):
+        """이벤트/배치 수와 이벤트당 전송 시간(마이크로초) 반환"""
+        with self._lock:
+            latencies = np.fromiter(self.latencies, dtype=np.float64, count=len(self.latencies)) * 1e6
+            stats = {'backend': self.name, 'events': self.event_count, 'batches': self.batch_count}
+        if latencies.size:
+            stats['event_us_mean'] = round(float(latencies.mean()), 2)
+            stats['event_us_p95'] = round(float(np.percentile(latencies, 95)), 2)
+        return stats
+
+    def close(self):
+        pass
+
+
+class NullBackend(InputBackend):
+    """입력을 보내지 않음 (오프라인 분석용)"""
+    name = 'none'
+
+    def _send(self, events):
+        pass
+
+
+class RecordingBackend(InputBackend):
+    """보낸 이벤트를 메모리에 기록 (테스트/재생 검증용)"""
+    name = 'recording'
+
+    def __init__(self, window=240):
+        super().__init__(window)
+        self.events = []      # (배치 번호, 이벤트)
+        self.pressed = set()  # 현재 눌린 키
+
+    def _send(self, events):
+        for event in events:
+            self.events.append((self.batch_count, event))
+            if event.kind == 'key_down':
+                self.pressed.add(event.key)
+            elif event.kind == 'key_up':
+                self.pressed.discard(event.key)
+
+    def clear(self):
+        self.events = []
+
+
+# ---- 윈도우 SendInput ----
+
+ULONG_PTR = ctypes.c_size_t
+
+
+class KEYBDINPUT(ctypes.Structure):
+    _fields_ = [('wVk', ctypes.wintypes.WORD), ('wScan', ctypes.wintypes.WORD), ('dwFlags', ctypes.wintypes.DWORD),
+                ('time', ctypes.wintypes.DWORD), ('dwExtraInfo', ULONG_PTR)]
+
+
+class MOUSEINPUT(ctypes.Structure):
+    _fields_ = [('dx', ctypes.wintypes.LONG), ('dy', ctypes.wintypes.LONG), ('mouseData', ctypes.wintypes.DWORD),
+                ('dwFlags', ctypes.wintypes.DWORD), ('time', ctypes.wintypes.DWORD), ('dwExtraInfo', ULONG_PTR)]
+
+
+class HARDWAREINPUT(ctypes.Structure):
+    _fields_ = [('uMsg', ctypes.wintypes.DWORD), ('wParamL', ctypes.wintypes.WORD), ('wParamH', ctypes.wintypes.WORD)]
+
+
+class _INPUTUNION(ctypes.Union):
+    _fields_ = [('mi', MOUSEINPUT), ('ki', KEYBDINPUT), ('hi', HARDWAREINPUT)]
+
+
+class INPUT(ctypes.Structure):
+    _fields_ = [('type', ctypes.wintypes.DWORD), ('u', _INPUTUNION)]
+
+
+INPUT_MOUSE, INPUT_KEYBOARD = 0, 1
+KEYEVENTF_EXTENDEDKEY, KEYEVENTF_KEYUP, KEYEVENTF_SCANCODE = 0x0001, 0x0002, 0x0008
+MOUSEEVENTF_MOVE, MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP, MOUSEEVENTF_ABSOLUTE = 0x0001, 0x0002, 0x0004, 0x8000
+
+# 키 이름 -> (스캔 코드, 확장 키 여부) (DirectInput 게임은 가상 키 코드보다 스캔 코드를 인식)
+SCAN_CODES = {
+    'esc': (0x01, False), 'tab': (0x0F, False), 'enter': (0x1C, False), 'space': (0x39, False),
+    'backspace': (0x0E, False), 'ctrl': (0x1D, False), 'shift': (0x2A, False), 'alt': (0x38, False),
+    'up': (0x48, True), 'left': (0x4B, True), 'right': (0x4D, True), 'down': (0x50, True),
+}
+SCAN_CODES.update({str(i % 10): (0x02 + i - 1, False) for i in range(1, 11)})
+SCAN_CODES.update({ch: (code, False) for row, start in (('qwertyuiop', 0x10), ('asdfghjkl', 0x1E), ('zxcvbnm', 0x2C))
+                   for ch, code in zip(row, range(start, start + len(row)))})
+SCAN_CODES.update({f'f{i}': (0x3B + i - 1, False) for i in range(1, 11)})
+
+
+class SendInputBackend(InputBackend):
+    """윈도우 SendInput으로 한 프레임의 이벤트를 한 번의 시스템 호출로 전송"""
+    name = 'sendinput'
+
+    def __init__(self, window=240):
+        super().__init__(window)
+        user32 = ctypes.windll.user32
+        self._send_input = user32.SendInput
+        self._send_input.argtypes = [ctypes.wintypes.UINT, ctypes.POINTER(INPUT), ctypes.c_int]
+        self._send_input.restype = ctypes.wintypes.UINT
+        self.screen_size = (user32.GetSystemMetrics(0), user32.GetSystemMetrics(1))
+
+    def _fill(self, inputs, index, event):
+        """INPUT 구조체 채우기 (클릭은 두 개를 사용하므로 채운 개수 반환)"""
+        if event.kind in ('key_down', 'key_up'):
+            code = SCAN_CODES.get(event.key.lower())
+            if code is None:
+                return 0
+            scan, extended = code
+            flags = KEYEVENTF_SCANCODE | (KEYEVENTF_EXTENDEDKEY if extended else 0)
+            if event.kind == 'key_up':
+                flags |= KEYEVENTF_KEYUP
+            inputs[index].type = INPUT_KEYBOARD
+            inputs[index].u.ki = KEYBDINPUT(0, scan, flags, 0, 0)
+            return 1
+
+        # 절대 좌표는 0~65535로 정규화
+        w, h = self.screen_size
+        dx, dy = event.x * 65535 // max(w - 1, 1), event.y * 65535 // max(h - 1, 1)
+        if event.kind == 'move':
+            inputs[index].type = INPUT_MOUSE
+            inputs[index].u.mi = MOUSEINPUT(dx, dy, 0, MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE, 0, 0)
+            return 1
+        if event.kind == 'click':
+            for offset, flag in enumerate((MOUSEEVENTF_LEFTDOWN, MOUSEEVENTF_LEFTUP)):
+                inputs[index + offset].type = INPUT_MOUSE
+                inputs[index + offset].u.mi = MOUSEINPUT(dx, dy, 0, flag | MOUSEEVENTF_MOVE | MOUSEEVENTF_ABSOLUTE, 0, 0)
+            return 2
+        return 0
+
+    def _send(self, events):
+        inputs = (INPUT * (len(events) * 2))()
+        count = 0
+        for event in events:
+            count += self._fill(inputs, count, event)
+        if count:
+            self._send_input(count, inputs, ctypes.sizeof(INPUT))
+
+
+# ---- 리눅스 XTest ----
+
+# 키 이름 -> X keysym 이름
+X_KEYSYMS = {
+    'up': 'Up', 'down': 'Down', 'left': 'Left', 'right': 'Right', 'space': 'space', 'enter': 'Return',
+    'esc': 'Escape', 'tab': 'Tab', 'backspace': 'BackSpace', 'shift': 'Shift_L', 'ctrl': 'Control_L', 'alt': 'Alt_L',
+}
+
+
+class XTestBackend(InputBackend):
+    """X11 XTest 확장으로 이벤트를 보내고 프레임마다 한 번만 XFlush"""
+    name = 'xtest'
+
+    def __init__(self, window=240):
+        super().__init__(window)
+        x11_path, xtst_path = ctypes.util.find_library('X11'), ctypes.util.find_library('Xtst')
+        if not x11_path or not xtst_path:
+            raise OSError("libX11/libXtst를 찾을 수 없습니다")
+        self.x11 = ctypes.cdll.LoadLibrary(x11_path)
+        self.xtst = ctypes.cdll.LoadLibrary(xtst_path)
+        self.x11.XOpenDisplay.restype = ctypes.c_void_p
+        self.x11.XOpenDisplay.argtypes = [ctypes.c_char_p]
+        self.x11.XStringToKeysym.restype = ctypes.c_ulong
+        self.x11.XStringToKeysym.argtypes = [ctypes.c_char_p]
+        self.x11.XKeysymToKeycode.restype = ctypes.c_ubyte
+        self.x11.XKeysymToKeycode.argtypes = [ctypes.c_void_p, ctypes.c_ulong]
+        self.x11.XFlush.argtypes = [ctypes.c_void_p]
+        self.x11.XCloseDisplay.argtypes = [ctypes.c_void_p]
+        self.xtst.XTestFakeKeyEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self.xtst.XTestFakeMotionEvent.argtypes = [ctypes.c_void_p, ctypes.c_int, ctypes.c_int, ctypes.c_int, ctypes.c_ulong]
+        self.xtst.XTestFakeButtonEvent.argtypes = [ctypes.c_void_p, ctypes.c_uint, ctypes.c_int, ctypes.c_ulong]
+        self.display = self.x11.XOpenDisplay(None)
+        if not self.display:
+            raise OSError("X 디스플레이를 열 수 없습니다")
+        self._keycodes = {}
+
+    def keycode(self, key):
+        """키 이름 -> X 키코드 (처음 한 번만 조회)"""
+        code = self._keycodes.get(key)
+        if code is None:
+            keysym = self.x11.XStringToKeysym(X_KEYSYMS.get(key.lower(), key).encode())
+            code = self._keycodes[key] = self.x11.XKeysymToKeycode(self.display, keysym) if keysym else 0
+        return code
+
+    def _send(self, events):
+        for event in events:
+            if event.kind in ('key_down', 'key_up'):
+                code = self.keycode(event.key)
+                if code:
+                    self.xtst.XTestFakeKeyEvent(self.display, code, event.kind == 'key_down', 0)
+            elif event.kind == 'move':
+                self.xtst.XTestFakeMotionEvent(self.display, -1, event.x, event.y, 0)
+            elif event.kind == 'click':
+                self.xtst.XTestFakeMotionEvent(self.display, -1, event.x, event.y, 0)
+                self.xtst.XTestFakeButtonEvent(self.display, 1, True, 0)
+                self.xtst.XTestFakeButtonEvent(self.display, 1, False, 0)
+        self.x11.XFlush(self.display)
+
+    def close(self):
+        if self.display:
+            self.x11.XCloseDisplay(self.display)
+            self.display = None
+
+
+# ---- 리눅스 uinput (python-evdev) ----
+
+class UinputBackend(InputBackend):
+    """uinput 가상 장치로 이벤트를 쓰고 프레임마다 한 번만 SYN (Wayland/콘솔에서도 동작, /dev/uinput 권한 필요)"""
+    name = 'uinput'
+
+    def __init__(self, window=240, screen_size=(1920, 1080)):
+        super().__init__(window)
+        from evdev import UInput, AbsInfo, ecodes
+        self.ecodes = ecodes
+        keys = [code for name, code in ecodes.ecodes.items() if name.startswith('KEY_') and isinstance(code, int)]
+        capabilities = {
+            ecodes.EV_KEY: sorted(set(keys)) + [ecodes.BTN_LEFT],
+            ecodes.EV_ABS: [(ecodes.ABS_X, AbsInfo(0, 0, screen_size[0] - 1, 0, 0, 0)),
+                            (ecodes.ABS_Y, AbsInfo(0, 0, screen_size[1] - 1, 0, 0, 0))],
+        }
+        self.device = UInput(capabilities, name='vgc-controller')
+
+    def keycode(self, key):
+        name = {'enter': 'ENTER', 'esc': 'ESC', 'ctrl': 'LEFTCTRL', 'shift': 'LEFTSHIFT', 'alt': 'LEFTALT'}.get(key.lower(), key.upper())
+        return self.ecodes.ecodes.get(f'KEY_{name}')
+
+    def _send(self, events):
+        ecodes, device = self.ecodes, self.device
+        for event in events:
+            if event.kind in ('key_down', 'key_up'):
+                code = self.keycode(event.key)
+                if code is not None:
+                    device.write(ecodes.EV_KEY, code, 1 if event.kind == 'key_down' else 0)
+            else:
+                device.write(ecodes.EV_ABS, ecodes.ABS_X, event.x)
+                device.write(ecodes.EV_ABS, ecodes.ABS_Y, event.y)
+                if event.kind == 'click':
+                    device.write(ecodes.EV_KEY, ecodes.BTN_LEFT, 1)
+                    device.syn()
+                    device.write(ecodes.EV_KEY, ecodes.BTN_LEFT, 0)
+        device.syn()
+
+    def close(self):
+        self.device.close()
+
+
+BACKENDS = {
+    'sendinput': SendInputBackend,
+    'xtest': XTestBackend,
+    'uinput': UinputBackend,
+    'recording': RecordingBackend,
+    'none': NullBackend,
+}
+
+
+def create_input_backend(name='auto'):
+    """입력 백엔드 생성 ('auto'면 윈도우는 SendInput, 리눅스는 XTest -> uinput 순서로 시도)"""
+    if name != 'auto':
+        return BACKENDS[name]()
+    candidates = [SendInputBackend] if sys.platform == 'win32' else [XTestBackend, UinputBackend]
+    for backend in candidates:
+        try:
+            return backend()
+        except Exception:
+            continue
+    print("입력 백엔드를 사용할 수 없어 입력을 보내지 않습니다")
+    return NullBackend()
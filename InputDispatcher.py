@@ -0,0 +1,80 @@
+from InputBackend import key_down, key_up
+
+
+class InputDispatcher:
+    """현재 눌린 키 집합을 유지하고 눌림/뗌 변화가 있을 때만 입력 백엔드로 보내는 디스패처"""
+
+    def __init__(self, backend):
+        self.backend = backend
+
+        # 제스처 -> 키 이름 (매핑 설정 시 한 번만 변환)
+        self.key_table = {}
+        self.held_keys = set()
+
+        # 통계
+        self.emitted_count = 0
+        self.suppressed_count = 0
+
+    @staticmethod
+    def resolve_key(key):
+        """pynput Key 또는 문자를 입력 라이브러리용 키 이름으로 변환"""
+        if key is None:
+            return None
+        name = getattr(key, 'name', None)
+        if name:
+            return name
+        return str(key)
+
+    def set_mapping(self, gesture, key):
+        """제스처에 매핑된 키 이름을 미리 변환해 저장"""
+        key_table = dict(self.key_table)
+        key_name = self.resolve_key(key)
+        if key_name is None:
+            key_table.pop(gesture, None)
+        else:
+            key_table[gesture] = key_name
+        # 프레임 처리 중에도 안전하도록 통째로 교체
+        self.key_table = key_table
+
+    def set_key_table(self, key_table):
+        """미리 변환한 제스처 -> 키 이름 표를 통째로 교체 (프로필 전환용)"""
+        self.key_table = dict(key_table)
+
+    def update(self, gestures, batch=None):
+        """
+        이번 프레임에 인식된 제스처로 키 상태를 갱신하고 변화분만 전송
+        batch: 이벤트를 모을 목록 (주어지면 바로 보내지 않고 호출한 쪽이 한 번에 전송)
+        """
+        key_table = self.key_table
+        desired = {key_table[g] for g in gestures if g in key_table}
+
+        pressed = desired - self.held_keys
+        released = self.held_keys - desired
+
+        events = [key_up(key_name) for key_name in released] + [key_down(key_name) for key_name in pressed]
+        if batch is not None:
+            batch.extend(events)
+        else:
+            self.backend.submit(events)
+
+        self.held_keys = desired
+        transitions = len(pressed) + len(released)
+        self.emitted_count += transitions
+        # 매 프레임 모든 키를 다시 보내던 방식 대비 생략된 호출 수
+        self.suppressed_count += max(len(set(key_table.values()) | released) - transitions, 0)
+
+    def release_all(self):
+        """눌린 모든 키 해제"""
+        self.backend.submit([key_up(key_name) for key_name in self.held_keys])
+        self.emitted_count += len(self.held_keys)
+        self.held_keys = set()
+
+    def get_stats(self):
+        """전송/생략된 입력 이벤트 수 반환"""
+        stats = {
+            'emitted': self.emitted_count,
+            'suppressed': self.suppressed_count,
+            'held': sorted(self.held_keys),
+        }
+        stats.update(self.backend.get_stats())
+        return stats
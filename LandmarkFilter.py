@@ -0,0 +1,97 @@
+import math
+
+import numpy as np
+
+# 마우스 포인터 필터 기본 설정 (프로필의 "pointer_filter"로 바꿀 수 있음)
+DEFAULT_POINTER_FILTER = {
+    'enabled': True,
+    'min_cutoff': 1.0,       # 정지 시 차단 주파수(Hz): 낮을수록 떨림이 줄지만 느려짐
+    'beta': 0.007,           # 속도에 따른 차단 주파수 증가량: 클수록 빠른 움직임의 지연이 줄어듦
+    'd_cutoff': 1.0,         # 속도 추정용 차단 주파수(Hz)
+    'predict': True,         # 파이프라인 지연만큼 움직임을 앞당겨 예측
+    'max_prediction': 0.08,  # 최대 예측 시간(초)
+}
+
+
+class OneEuroFilter:
+    """
+    One Euro 필터 (속도에 따라 차단 주파수가 바뀌는 저역 통과 필터)
+    느릴 때는 강하게 걸러 떨림을 줄이고, 빠를 때는 약하게 걸러 지연을 줄임
+    값은 임의 모양의 배열 (좌표 하나 또는 (21, 3) 랜드마크 전체)
+    """
+
+    def __init__(self, min_cutoff=1.0, beta=0.007, d_cutoff=1.0, reset_gap=0.25):
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset_gap = reset_gap  # 이 시간(초) 이상 입력이 없으면 처음부터 다시 시작
+        self.reset()
+
+    def reset(self):
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    @staticmethod
+    def alpha(cutoff, dt):
+        tau = 1.0 / (2 * math.pi * cutoff)
+        return 1.0 / (1.0 + tau / dt)
+
+    def __call__(self, value, timestamp):
+        """timestamp(초) 시각의 값 value를 걸러 반환"""
+        value = np.asarray(value, dtype=np.float64)
+        dt = None if self.timestamp is None else timestamp - self.timestamp
+        if dt is None or dt <= 0 or dt > self.reset_gap or self.value.shape != value.shape:
+            self.value = value.copy()
+            self.velocity = np.zeros_like(value)
+            self.timestamp = timestamp
+            return self.value
+
+        # 속도 추정 (걸러진 미분값)
+        velocity = (value - self.value) / dt
+        self.velocity += self.alpha(self.d_cutoff, dt) * (velocity - self.velocity)
+
+        # 속도가 빠를수록 차단 주파수를 높임
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        tau = 1.0 / (2 * math.pi * cutoff)
+        self.value += (value - self.value) / (1.0 + tau / dt)
+        self.timestamp = timestamp
+        return self.value
+
+
+class PointerFilter:
+    """마우스 포인터 좌표용 One Euro 필터 + 지연 보상 예측기"""
+
+    def __init__(self, **settings):
+        self.settings = dict(DEFAULT_POINTER_FILTER)
+        self.filter = OneEuroFilter()
+        self.configure(**settings)
+
+    def configure(self, **settings):
+        """설정 변경 (알 수 없는 항목은 ValueError)"""
+        unknown = set(settings) - set(DEFAULT_POINTER_FILTER)
+        if unknown:
+            raise ValueError(f"알 수 없는 포인터 필터 설정: {', '.join(sorted(unknown))}")
+        self.settings.update(settings)
+        self.filter.min_cutoff = self.settings['min_cutoff']
+        self.filter.beta = self.settings['beta']
+        self.filter.d_cutoff = self.settings['d_cutoff']
+        self.filter.reset()
+
+    def reset(self):
+        self.filter.reset()
+
+    def update(self, point, timestamp, latency=0.0):
+        """
+        point: 원본 포인터 좌표 (x, y)
+        timestamp: 프레임 캡처 시각(초)
+        latency: 캡처부터 지금까지의 지연(초), 예측 시 이만큼 앞당김
+        """
+        settings = self.settings
+        if not settings['enabled']:
+            return np.asarray(point, dtype=np.float64)
+        filtered = self.filter(point, timestamp)
+        if not settings['predict'] or latency <= 0:
+            return filtered
+        horizon = min(latency, settings['max_prediction'])
+        return filtered + self.filter.velocity * horizon
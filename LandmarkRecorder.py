@@ -0,0 +1,137 @@
+import argparse
+import threading
+from time import perf_counter
+
+import numpy as np
+
+# 파일 구조: 16바이트 헤더(매직 8바이트 + 레코드 크기 uint32 + 예약 uint32) 뒤에 고정 길이 레코드가 이어짐
+MAGIC = b'VGCLMK01'
+HEADER_SIZE = 16
+
+# 손잡이 코드 (-1: 손 없음, 2: 손은 있으나 손잡이 정보 없음)
+HAND_NONE, HAND_LEFT, HAND_RIGHT, HAND_UNKNOWN = -1, 0, 1, 2
+HANDEDNESS_CODES = {'Left': HAND_LEFT, 'Right': HAND_RIGHT}
+HANDEDNESS_NAMES = {HAND_LEFT: 'Left', HAND_RIGHT: 'Right'}
+
+# 프레임 한 장의 기록 (리틀 엔디안 고정 레이아웃)
+RECORD_DTYPE = np.dtype([
+    ('index', '<u4'),               # 기록 순번
+    ('seq', '<i4'),                 # 캡처 프레임 순번 (없으면 -1)
+    ('timestamp', '<f8'),           # 캡처 시각 (초)
+    ('hand', 'i1'),                 # 손잡이 코드 (-1: 손 없음)
+    ('score', '<f4'),               # 손잡이 신뢰도
+    ('frame_size', '<u2', (2,)),    # 프레임 (너비, 높이)
+    ('landmarks', '<f4', (21, 3)),  # 픽셀 좌표 x, y 와 z
+])
+
+
+class LandmarkRecorder:
+    """Hand_Controller의 프레임별 결과(랜드마크, 손잡이, 시각)를 고정 길이 바이너리 파일로 기록"""
+
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'wb')
+        self._file.write(MAGIC + np.array([RECORD_DTYPE.itemsize, 0], dtype='<u4').tobytes())
+        self._record = np.zeros(1, dtype=RECORD_DTYPE)
+        self._lock = threading.Lock()
+        self.count = 0
+
+    def write(self, seq, timestamp, detector):
+        """detector(Hand_Controller)의 현재 상태를 한 레코드로 기록"""
+        record = self._record[0]
+        record['index'] = self.count
+        record['seq'] = seq
+        record['timestamp'] = timestamp
+        record['frame_size'] = detector.frame_size
+        if detector.hand_found:
+            record['hand'] = HANDEDNESS_CODES.get(detector.handedness, HAND_UNKNOWN)
+            record['score'] = detector.hand_score
+            record['landmarks'] = detector.landmarks
+        else:
+            record['hand'] = HAND_NONE
+            record['score'] = 0.0
+            record['landmarks'] = 0.0
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.write(self._record.tobytes())
+            self.count += 1
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+def open_recording(path):
+    """기록 파일을 메모리 매핑된 레코드 배열로 열기"""
+    with open(path, 'rb') as f:
+        header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:8] != MAGIC:
+        raise ValueError(f"랜드마크 기록 파일이 아닙니다: {path}")
+    record_size = int(np.frombuffer(header[8:12], dtype='<u4')[0])
+    if record_size != RECORD_DTYPE.itemsize:
+        raise ValueError(f"지원하지 않는 레코드 크기입니다: {record_size}")
+    return np.memmap(path, dtype=RECORD_DTYPE, mode='r', offset=HEADER_SIZE)
+
+
+class LandmarkReplay:
+    """기록된 랜드마크를 MediaPipe/카메라 없이 process_hand_gestures와 apply_gesture_controls에 직접 공급"""
+
+    def __init__(self, path):
+        self.records = open_recording(path)
+
+    def __len__(self):
+        return len(self.records)
+
+    def run(self, controller, active=False):
+        """레코드마다 제스처를 처리하며 (레코드, 인식된 제스처 목록)을 반환하는 제너레이터"""
+        detector = controller.hand_detector
+        for record in self.records:
+            hand = int(record['hand'])
+            landmarks = record['landmarks'] if hand != HAND_NONE else None
+            frame_size = (int(record['frame_size'][0]), int(record['frame_size'][1]))
+            detector.set_landmarks(landmarks, frame_size, HANDEDNESS_NAMES.get(hand))
+            controller.frame_seq = int(record['seq'])
+            controller.frame_timestamp = float(record['timestamp'])
+            _, gestures = controller.process_landmarks(detector.landmarks if landmarks is not None else None, None, active)
+            yield record, gestures
+
+
+def main():
+    parser = argparse.ArgumentParser(description='랜드마크 기록 파일 생성/재생')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    record_parser = subparsers.add_parser('record', help='영상/이미지 디렉터리에서 랜드마크 기록')
+    record_parser.add_argument('source', help='영상 파일 또는 이미지 디렉터리')
+    record_parser.add_argument('-o', '--output', default='landmarks.lmk', help='기록 파일 경로')
+
+    replay_parser = subparsers.add_parser('replay', help='기록을 제스처 로직에 재생')
+    replay_parser.add_argument('path', help='기록 파일 경로')
+    replay_parser.add_argument('-v', '--verbose', action='store_true', help='제스처가 바뀌는 프레임 출력')
+    args = parser.parse_args()
+
+    from OfflineProcessor import create_offline_controller, process_stream
+    controller = create_offline_controller()
+
+    if args.command == 'record':
+        controller.start_recording(args.output)
+        count = sum(1 for _ in process_stream(args.source, controller))
+        controller.stop_recording()
+        print(f"{count} 프레임 기록 -> {args.output}")
+        return
+
+    replay = LandmarkReplay(args.path)
+    start = perf_counter()
+    previous = None
+    for record, gestures in replay.run(controller):
+        if args.verbose and gestures != previous:
+            print(f"{record['index']:>7} {record['timestamp']:.3f} {'|'.join(gestures) or '-'}")
+        previous = gestures
+    elapsed = perf_counter() - start
+    print(f"{len(replay)} 프레임 재생 ({elapsed:.2f}초, {len(replay) / max(elapsed, 1e-9):.0f} fps)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,26 @@
+import os
 import sys
+import threading
+from collections import namedtuple
+from datetime import datetime
+from time import time, perf_counter
+STARTUP_TIME = perf_counter()  # 시작 보고 기준 시각 (무거운 모듈을 불러오기 전)
 import cv2
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, 
                             QHBoxLayout, QLabel, QPushButton, QComboBox, 
                             QGroupBox, QFormLayout, QAction, QMenu, QDialog,
-                            QSizePolicy)
-from PyQt5.QtCore import QTimer, Qt, pyqtSlot, QSize
-from PyQt5.QtGui import QImage, QPixmap, QIcon
+                            QSizePolicy, QInputDialog, QActionGroup)
+from PyQt5.QtCore import QTimer, Qt, pyqtSlot, pyqtSignal, QSize, QThread
+from PyQt5.QtGui import QIcon, QPainter
 from VirtualGameController import VirtualGameController
+from Telemetry import CsvTelemetryExporter, StartupReport
+from GestureRules import describe_gesture, two_hand_summary
+from QtPreview import PreviewConverter
+from Profiles import (DEFAULT_PROFILE_NAME, ProfileWatcher, list_profiles, load_profile, profile_path,
+                      save_profile)
 from pynput.keyboard import Key
 import numpy as np
+IMPORTS_DONE = perf_counter()
 
 # 다크 모드 색상 테마 정의
 DARK_BG = "#1e1e1e"         # 배경색 (짙은 진한 회색)
@@ -22,6 +34,131 @@ DARK_SUCCESS = "#4ec9b0"    # 성공 색상 (청록색)
 DARK_WARNING = "#d7ba7d"    # 경고 색상 (황금색)
 DARK_DANGER = "#ce9178"     # 위험/중지 색상 (연한 주황색)
 
+class VideoLabel(QLabel):
+    """QPixmap을 거치지 않고 QImage를 직접 그리는 영상 표시 레이블"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.converter = PreviewConverter()
+        self.image = None
+
+    def set_frame(self, frame):
+        """프레임을 레이블 크기에 맞춰 변환하고 다시 그리기 요청"""
+        self.image = self.converter.convert(frame, self.width(), self.height())
+        self.update()
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.image is None:
+            return
+        painter = QPainter(self)
+        x = (self.width() - self.image.width()) // 2
+        y = (self.height() - self.image.height()) // 2
+        painter.drawImage(x, y, self.image)
+        painter.end()
+
+
+# 작업 스레드가 GUI로 전달하는 프레임 처리 결과
+FrameResult = namedtuple('FrameResult', ['frame', 'quit_flag', 'gestures', 'v_dir', 'h_dir', 'jump', 'timings'])
+
+
+class ControllerWorker(QThread):
+    """VirtualGameController를 소유하고 캡처/인식/키 입력을 GUI 스레드 밖에서 처리하는 작업 스레드"""
+    frame_ready = pyqtSignal(object)
+    warmed_up = pyqtSignal()
+    error = pyqtSignal(str)
+
+    def __init__(self, controller, parent=None):
+        super().__init__(parent)
+        self.controller = controller
+        self.active = False
+        self._running = False
+        # GUI가 이전 결과를 그리기 전에는 새 결과를 보내지 않음 (큐 적체 방지)
+        self._gui_ready = threading.Event()
+        self._gui_ready.set()
+
+    def set_active(self, active):
+        """컨트롤러 활성화 상태 변경 (키 해제는 작업 스레드에서 처리)"""
+        self.active = active
+
+    def result_consumed(self):
+        """GUI가 결과를 그린 뒤 호출"""
+        self._gui_ready.set()
+
+    def stop(self):
+        """작업 스레드 정지"""
+        self._running = False
+        self.wait(2000)
+
+    def run(self):
+        self._running = True
+        
+        # 카메라 열기/모델 로드는 창이 뜬 뒤 이 스레드에서 병렬로 수행
+        try:
+            self.controller.warm_up()
+        except Exception as e:
+            # 손 인식 모델 없이는 프레임을 처리할 수 없으므로 오류만 알리고 스레드 종료
+            self.error.emit(f"초기화 실패: {e}")
+            self._running = False
+            return
+        self.warmed_up.emit()
+        
+        was_active = False
+        while self._running:
+            try:
+                active = self.active
+                if was_active and not active:
+                    self.controller.release_all_keys()
+                was_active = active
+
+                # 새 프레임이 올 때까지 대기
+                wait_start = time()
+                cap = self.controller.cap
+                packet = None
+                if cap is not None and cap.isOpened():
+                    packet = cap.wait_for_frame(timeout=0.5)
+                    if packet is None and cap.isOpened():
+                        continue  # 대기 시간 초과: 이미 처리한 프레임을 다시 처리하지 않음
+                process_start = time()
+
+                frame, quit_flag = self.controller.process_frame(active, packet=packet)
+                process_end = time()
+
+                # 종료 제스처가 확인되면 GUI 반응을 기다리지 않고 즉시 입력 중단
+                if quit_flag and self.active:
+                    self.active = False
+
+                if frame is None:
+                    self.msleep(100)
+
+                # 컨트롤러가 이번 프레임에서 인식한 동작 목록 (두 손 모드 포함)
+                gestures = list(self.controller.detected_gestures)
+
+                # frame_age: 캡처부터 처리 완료까지 걸린 시간 (캡처 스레드의 프레임을 처리했을 때만)
+                timings = {
+                    'wait': process_start - wait_start,
+                    'process': process_end - process_start,
+                    'frame_age': process_end - packet.timestamp if packet is not None else None,
+                }
+
+                # GUI가 바쁘면 이번 결과는 건너뜀 (키 입력은 이미 처리됨)
+                if self._gui_ready.is_set():
+                    self._gui_ready.clear()
+                    self.frame_ready.emit(FrameResult(frame, quit_flag, gestures, self.controller.v_dir,
+                                                      self.controller.h_dir, self.controller.jump, timings))
+                
+                # 대기 모드(손 없음)에서는 처리 빈도를 낮춤 (손이 보이면 다음 프레임부터 원래 속도)
+                delay = self.controller.idle_delay(time() - process_start)
+                if delay > 0:
+                    self.msleep(int(delay * 1000))
+            except Exception as e:
+                self.error.emit(str(e))
+                self.active = False
+                self.msleep(100)
+
+        # 종료 시 눌린 키 해제
+        self.controller.release_all_keys()
+
 class SettingsDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -130,16 +267,17 @@ class SettingsDialog(QDialog):
         self.left_combo.currentTextChanged.connect(lambda: self.update_mapping('left'))
         self.right_combo.currentTextChanged.connect(lambda: self.update_mapping('right'))
         
-        # 제스처 설명 레이블 추가
-        jump_desc = QLabel("모든 손가락을 구부리면(주먹) 점프합니다.")
-        up_desc = QLabel("중지 손가락만 구부리면 위로 이동합니다.")
-        down_desc = QLabel("약지 손가락만 구부리면 아래로 이동합니다.")
-        left_desc = QLabel("소지(새끼) 손가락만 구부리면 왼쪽으로 이동합니다.")
-        right_desc = QLabel("엄지 손가락만 구부리면 오른쪽으로 이동합니다.")
+        # 제스처 설명 레이블 추가 (인식에 쓰는 규칙에서 생성)
+        jump_desc = QLabel(describe_gesture('jump'))
+        up_desc = QLabel(describe_gesture('up'))
+        down_desc = QLabel(describe_gesture('down'))
+        left_desc = QLabel(describe_gesture('left'))
+        right_desc = QLabel(describe_gesture('right'))
         
         # 설명 스타일 지정 (기존 코드 유지)
         for label in [jump_desc, up_desc, down_desc, left_desc, right_desc]:
             label.setStyleSheet(f"color: {DARK_TEXT_MUTED}; font-style: italic; font-size: 22px;")
+            label.setWordWrap(True)
         
         # 레이아웃 수정: 콤보박스 + 현재값 표시 (새로운 코드)
         for gesture, combo, current, desc in [
@@ -192,13 +330,20 @@ class SettingsDialog(QDialog):
         selected_key = combo_map[gesture].currentText()
         key_value = self.parent.key_options[selected_key]
         
-        # 컨트롤러에 매핑 설정
+        # 컨트롤러에 매핑 설정 (현재 프로필 파일에도 저장)
         self.parent.controller.set_gesture_mapping(gesture, key_value)
+        try:
+            self.parent.save_current_profile()
+        except OSError as e:
+            print(f"프로필 저장 오류: {e}")
         
         # 부모 창의 매핑 표시 업데이트
         self.parent.update_key_mapping_display()
 
 class GameControllerGUI(QMainWindow):
+    # 프로필 파일이 바뀌어 다시 읽었을 때 (감시 스레드 -> GUI 스레드)
+    profile_reloaded = pyqtSignal(str)
+    
     def __init__(self):
         super().__init__()
         
@@ -233,23 +378,46 @@ class GameControllerGUI(QMainWindow):
         # 창 속성 변경 - 항상 위에 표시
         self.setWindowFlags(Qt.WindowStaysOnTopHint)
         
-        # 가상 게임 컨트롤러 생성
-        self.controller = VirtualGameController()
+        # 시작 단계별 시간 기록
+        self.startup = StartupReport(STARTUP_TIME)
+        self.startup.record('imports', STARTUP_TIME, IMPORTS_DONE)
+        
+        # 가상 게임 컨트롤러 생성 (카메라/모델은 작업 스레드에서 초기화)
+        self.controller = VirtualGameController(lazy_init=True, startup=self.startup)
         
         # 컨트롤러 활성화 상태 설정 (기본값: 비활성화)
         self.controller_active = False
         self.compact_mode = False
         
         # UI 초기화
-        self.initUI()
+        with self.startup.phase('ui'):
+            self.initUI()
+        self.startup.mark('window_shown')
         
-        # 타이머 설정 (영상 프레임 처리)
-        self.timer = QTimer()
-        self.timer.timeout.connect(self.update_frame)
-        self.timer.start(30)  # 30ms 마다 프레임 업데이트
+        # 준비가 끝날 때까지 시작 버튼 비활성화
+        self.start_button.setEnabled(False)
+        self.video_label.setText("준비 중... (카메라 연결 및 손 인식 모델 로딩)")
+        
+        # 작업 스레드 설정 (영상 프레임 처리는 GUI 스레드 밖에서 수행)
+        self.worker = ControllerWorker(self.controller)
+        self.worker.frame_ready.connect(self.update_frame)
+        self.worker.warmed_up.connect(self.on_warmed_up)
+        self.worker.error.connect(self.on_worker_error)
+        self.worker.start()
+        
+        # 성능 지표 표시 (상태 표시줄, 1초마다 갱신)
+        self.telemetry_exporter = None
+        self.telemetry_timer = QTimer()
+        self.telemetry_timer.timeout.connect(self.update_telemetry_display)
         
         # 상태 메시지 초기화
-        self.status_msg.setText("상태: 준비됨")
+        self.status_msg.setText("상태: 준비 중")
+        
+        # 게임별 프로필 (저장된 기본 프로필이 있으면 불러오고 파일 변경을 감시)
+        self.profile_watcher = None
+        self.profile_reloaded.connect(self.on_profile_reloaded)
+        if DEFAULT_PROFILE_NAME in list_profiles():
+            self.switch_profile(DEFAULT_PROFILE_NAME)
         
         # 현재 키 매핑 설정
         self.update_key_mapping_display()
@@ -273,7 +441,7 @@ class GameControllerGUI(QMainWindow):
         
         # 카메라 화면 영역
         self.video_layout = QVBoxLayout()
-        self.video_label = QLabel()
+        self.video_label = VideoLabel()
         self.video_label.setAlignment(Qt.AlignCenter)
         self.video_label.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
         self.video_label.setMinimumSize(QSize(1280, 960))  # 카메라 화면 크기 2배 확대
@@ -380,6 +548,116 @@ class GameControllerGUI(QMainWindow):
         self.always_on_top_action.setChecked(True)
         self.always_on_top_action.triggered.connect(self.toggle_always_on_top)
         settings_menu.addAction(self.always_on_top_action)
+        
+        # 성능 정보 표시 토글 액션
+        self.telemetry_action = QAction('성능 정보 표시', self)
+        self.telemetry_action.setCheckable(True)
+        self.telemetry_action.triggered.connect(self.toggle_telemetry)
+        settings_menu.addAction(self.telemetry_action)
+        
+        # 성능 지표 CSV 기록 토글 액션
+        self.telemetry_csv_action = QAction('성능 지표 CSV 기록', self)
+        self.telemetry_csv_action.setCheckable(True)
+        self.telemetry_csv_action.triggered.connect(self.toggle_telemetry_csv)
+        settings_menu.addAction(self.telemetry_csv_action)
+        
+        # 랜드마크 기록 토글 액션 (버그 재현/회귀 테스트용)
+        self.recording_action = QAction('랜드마크 기록', self)
+        self.recording_action.setCheckable(True)
+        self.recording_action.triggered.connect(self.toggle_recording)
+        settings_menu.addAction(self.recording_action)
+        
+        # 제스처 이벤트 전송 토글 액션 (다른 프로세스/장비에서 구독)
+        self.event_stream_action = QAction('제스처 이벤트 전송 (UDP 9760)', self)
+        self.event_stream_action.setCheckable(True)
+        self.event_stream_action.triggered.connect(self.toggle_event_stream)
+        settings_menu.addAction(self.event_stream_action)
+        
+        # 두 손 모드 토글 액션 (손별 제스처는 GestureRules의 두 손 규칙에서 가져옴)
+        self.two_hand_action = QAction(f'두 손 모드 ({two_hand_summary()})', self)
+        self.two_hand_action.setCheckable(True)
+        self.two_hand_action.triggered.connect(self.toggle_two_hand_mode)
+        settings_menu.addAction(self.two_hand_action)
+    
+        # 프로필 메뉴 (열 때마다 profiles 디렉터리의 목록으로 갱신)
+        self.profile_menu = menubar.addMenu('프로필')
+        self.profile_menu.aboutToShow.connect(self.populate_profile_menu)
+    
+    def populate_profile_menu(self):
+        """저장된 프로필 목록으로 프로필 메뉴 구성"""
+        menu = self.profile_menu
+        menu.clear()
+        group = QActionGroup(menu)
+        names = list_profiles()
+        if self.controller.profile_name not in names:
+            names.append(self.controller.profile_name)
+        for name in names:
+            action = QAction(name, menu)
+            action.setCheckable(True)
+            action.setChecked(name == self.controller.profile_name)
+            action.triggered.connect(lambda checked, name=name: self.switch_profile(name))
+            group.addAction(action)
+            menu.addAction(action)
+        menu.addSeparator()
+        save_as_action = QAction('현재 설정을 새 프로필로 저장...', menu)
+        save_as_action.triggered.connect(self.save_profile_as)
+        menu.addAction(save_as_action)
+    
+    def switch_profile(self, name):
+        """
+        프로필 전환 (카메라와 손 인식 모델은 그대로 두고 다음 프레임부터 적용)
+        저장된 파일이 없으면 현재 설정을 그 이름으로 저장
+        """
+        path = profile_path(name)
+        try:
+            if os.path.exists(path):
+                self.controller.set_profile(load_profile(path), name)
+            else:
+                self.controller.set_profile_name(name)
+                self.save_current_profile()
+        except (OSError, ValueError, TypeError) as e:
+            self.status_msg.setText(f"프로필 오류 ({name}): {e}")
+            return
+        
+        # 선택한 프로필 파일만 감시
+        if self.profile_watcher is not None:
+            self.profile_watcher.stop()
+        self.profile_watcher = ProfileWatcher(path, self.reload_profile).start()
+        self.update_key_mapping_display()
+        self.status_msg.setText(f"상태: 프로필 '{name}' 적용")
+    
+    def reload_profile(self, profile, name):
+        """감시 스레드에서 호출: 바뀐 프로필을 예약하고 GUI 갱신 요청 (잘못된 프로필은 ValueError로 무시됨)"""
+        self.controller.set_profile(profile, name)
+        self.profile_reloaded.emit(name)
+    
+    @pyqtSlot(str)
+    def on_profile_reloaded(self, name):
+        self.update_key_mapping_display()
+        self.status_msg.setText(f"상태: 프로필 '{name}' 다시 읽음")
+    
+    def save_current_profile(self):
+        """현재 설정을 현재 프로필 파일에 저장 (저장한 내용은 다시 읽지 않음)"""
+        save_profile(profile_path(self.controller.profile_name), self.controller.get_profile())
+        if self.profile_watcher is not None:
+            self.profile_watcher.mark_current()
+    
+    def save_profile_as(self):
+        """현재 설정을 새 이름의 프로필로 저장하고 전환"""
+        name, ok = QInputDialog.getText(self, '새 프로필', '프로필 이름 (게임 이름 등):')
+        name = name.strip()
+        if not ok or not name:
+            return
+        if any(ch in name for ch in '\\/:*?"<>|'):
+            self.status_msg.setText("프로필 이름에 사용할 수 없는 문자가 있습니다")
+            return
+        self.controller.set_profile_name(name)
+        try:
+            self.save_current_profile()
+        except OSError as e:
+            self.status_msg.setText(f"프로필 저장 오류: {e}")
+            return
+        self.switch_profile(name)
     
     def show_key_mapping_dialog(self):
         """키 매핑 설정 다이얼로그 표시"""
@@ -394,6 +672,61 @@ class GameControllerGUI(QMainWindow):
             self.setWindowFlags(self.windowFlags() & ~Qt.WindowStaysOnTopHint)
         self.show()  # 플래그 변경 후 창을 다시 표시해야 함
     
+    def toggle_telemetry(self, checked):
+        """상태 표시줄 및 영상 오버레이의 성능 정보 표시 토글"""
+        self.controller.show_telemetry_overlay = checked
+        if checked:
+            self.statusBar().setStyleSheet(f"color: {DARK_TEXT_MUTED}; font-size: 18px;")
+            self.statusBar().show()
+            self.update_telemetry_display()
+            self.telemetry_timer.start(1000)
+        else:
+            self.telemetry_timer.stop()
+            self.statusBar().hide()
+    
+    def update_telemetry_display(self):
+        """상태 표시줄에 성능 지표 요약 표시"""
+        self.statusBar().showMessage(self.controller.telemetry.summary_text())
+    
+    def toggle_telemetry_csv(self, checked):
+        """성능 지표를 telemetry.csv에 1초 간격으로 기록"""
+        if checked:
+            self.telemetry_exporter = CsvTelemetryExporter(self.controller.telemetry, 'telemetry.csv').start()
+            self.status_msg.setText("상태: 성능 지표를 telemetry.csv에 기록 중")
+        elif self.telemetry_exporter is not None:
+            self.telemetry_exporter.stop()
+            self.telemetry_exporter = None
+    
+    def toggle_recording(self, checked):
+        """프레임별 랜드마크를 landmarks_날짜_시각.lmk 파일에 기록"""
+        if checked:
+            path = datetime.now().strftime('landmarks_%Y%m%d_%H%M%S.lmk')
+            self.controller.start_recording(path)
+            if self.controller.two_hand:
+                self.status_msg.setText(f"상태: 랜드마크 기록 대기 ({path}, 두 손 모드에서는 기록하지 않음)")
+            else:
+                self.status_msg.setText(f"상태: 랜드마크를 {path}에 기록 중")
+        else:
+            self.controller.stop_recording()
+            self.status_msg.setText("상태: 랜드마크 기록 종료")
+    
+    def toggle_event_stream(self, checked):
+        """제스처/랜드마크 이벤트를 127.0.0.1:9760으로 전송"""
+        if checked:
+            self.controller.start_event_stream()
+            self.status_msg.setText("상태: 제스처 이벤트를 127.0.0.1:9760으로 전송 중")
+        else:
+            self.controller.stop_event_stream()
+            self.status_msg.setText("상태: 제스처 이벤트 전송 종료")
+    
+    def toggle_two_hand_mode(self, checked):
+        """두 손 모드 전환 (손 인식 모델을 다시 만드는 동안 화면이 멈추지 않도록 별도 스레드에서 생성)"""
+        threading.Thread(target=self.controller.set_two_hand_mode, args=(checked,), daemon=True).start()
+        if checked:
+            self.status_msg.setText(f"상태: 두 손 모드 ({two_hand_summary()})")
+        else:
+            self.status_msg.setText("상태: 한 손 모드")
+    
     def toggle_compact_mode(self, enable_compact=True):
         """컴팩트 모드 전환"""
         self.compact_mode = enable_compact
@@ -499,57 +832,57 @@ class GameControllerGUI(QMainWindow):
         self.left_label.setText(f"왼쪽: {get_key_name(mapping['left'])}")
         self.right_label.setText(f"오른쪽: {get_key_name(mapping['right'])}")
     
-    @pyqtSlot()
-    def update_frame(self):
-        """카메라 프레임 업데이트 및 처리"""
+    @pyqtSlot(object)
+    def update_frame(self, result):
+        """작업 스레드가 처리한 프레임을 화면에 표시"""
         try:
-            # 프레임 처리 (컨트롤러 활성화 여부 전달)
-            frame, quit_flag = self.controller.process_frame(self.controller_active)
+            frame = result.frame
             
-            if frame is None or quit_flag:
-                self.stop_controller()
+            if frame is None or result.quit_flag:
+                if self.controller_active:
+                    self.stop_controller()
                 return
             
             # 디버그 정보 표시 - 숫자 대신 텍스트로 현재 인식된 제스처 표시
             if self.controller_active:
-                # 모드 표시 부분 삭제 (키보드만 사용하므로)
-                
                 # 제스처 상태 텍스트로 변환
-                gestures = []
-                if self.controller.jump == 1:
-                    gestures.append("점프")
-                if self.controller.v_dir == 1:
-                    gestures.append("위로")
-                elif self.controller.v_dir == -1:
-                    gestures.append("아래로")
-                if self.controller.h_dir == -1:
-                    gestures.append("왼쪽")
-                elif self.controller.h_dir == 1:
-                    gestures.append("오른쪽")
+                gesture_names = {'jump': "점프", 'up': "위로", 'down': "아래로", 'left': "왼쪽", 'right': "오른쪽"}
+                gestures = [gesture_names.get(g, g) for g in result.gestures]
                     
                 gesture_text = ", ".join(gestures) if gestures else "없음"
                 self.status_msg.setText(f"상태: 실행중 | 제스처: {gesture_text}")
             
-            # OpenCV 프레임을 QImage로 변환
-            h, w, ch = frame.shape
-            bytes_per_line = ch * w
-            convert_to_qt_format = QImage(frame.data, w, h, bytes_per_line, QImage.Format_RGB888).rgbSwapped()
-            pixmap = QPixmap.fromImage(convert_to_qt_format)
-            
-            # QLabel에 표시
-            self.video_label.setPixmap(pixmap.scaled(
-                self.video_label.width(), 
-                self.video_label.height(), 
-                Qt.KeepAspectRatio
-            ))
+            # 레이블에 표시 (한 번의 축소 후 QImage를 직접 그림)
+            preview_start = time()
+            self.video_label.set_frame(frame)
+            self.controller.telemetry.record_stage('preview', time() - preview_start)
             
         except Exception as e:
             self.status_msg.setText(f"오류: {str(e)}")
             self.stop_controller()
+        finally:
+            # 다음 결과를 받을 준비 완료
+            self.worker.result_consumed()
+    
+    @pyqtSlot()
+    def on_warmed_up(self):
+        """카메라/모델 준비 완료"""
+        self.video_label.setText("")
+        self.start_button.setEnabled(not self.controller_active)
+        self.status_msg.setText("상태: 준비됨")
+        print(self.startup.summary_text())
+    
+    @pyqtSlot(str)
+    def on_worker_error(self, message):
+        """작업 스레드 오류 표시"""
+        self.status_msg.setText(f"오류: {message}")
+        if self.controller_active:
+            self.stop_controller()
     
     def start_controller(self):
         """컨트롤러 시작"""
         self.controller_active = True
+        self.worker.set_active(True)
         self.start_button.setEnabled(False)
         self.stop_button.setEnabled(True)
         self.status_msg.setText("상태: 컨트롤러 실행 중")
@@ -565,6 +898,7 @@ class GameControllerGUI(QMainWindow):
     def stop_controller(self):
         """컨트롤러 정지"""
         self.controller_active = False
+        self.worker.set_active(False)
         self.start_button.setEnabled(True)
         self.stop_button.setEnabled(False)
         self.status_msg.setText("상태: 컨트롤러 정지됨")
@@ -572,10 +906,15 @@ class GameControllerGUI(QMainWindow):
         # 일반 모드로 복원
         self.toggle_compact_mode(False)
         
-        # 모든 키 해제
-        self.controller.release_all_keys()    
+        # 모든 키 해제는 작업 스레드가 비활성화를 감지하여 처리
+    
     def closeEvent(self, event):
         """앱 종료 시 처리"""
+        if self.telemetry_exporter is not None:
+            self.telemetry_exporter.stop()
+        if self.profile_watcher is not None:
+            self.profile_watcher.stop()
+        self.worker.stop()
         self.controller.close()
         event.accept()
 
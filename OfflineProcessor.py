@@ -0,0 +1,163 @@
+import argparse
+import csv
+import json
+import multiprocessing
+import os
+from time import time
+
+import cv2
+
+from VirtualGameController import VirtualGameController
+from FrameSource import create_frame_source, list_images
+
+# 타임라인 CSV 컬럼
+TIMELINE_FIELDS = ['frame', 'time', 'detected', 'mode', 'fingers', 'gestures', 'state']
+
+
+def iter_frames(source, fps=30.0, start=0, stop=None):
+    """
+    영상 파일, 이미지 디렉터리, 합성 소스('synthetic[:WxH@FPS]') 또는 FrameSource에서
+    (프레임 번호, 시각(초), 이미지)를 차례로 반환
+    fps: 이미지 디렉터리/영상 프레임률을 모를 때의 프레임 간격 계산용
+    start, stop: 처리할 프레임 범위 [start, stop)
+    """
+    frame_source = create_frame_source(source, fps)
+    if not frame_source.open():
+        raise IOError(f"영상을 열 수 없습니다: {source}")
+    with frame_source:
+        yield from frame_source.frames(start, stop)
+
+
+def count_frames(source):
+    """영상/이미지 디렉터리의 전체 프레임 수"""
+    if os.path.isdir(source):
+        return len(list_images(source))
+    cap = cv2.VideoCapture(source)
+    try:
+        return int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    finally:
+        cap.release()
+
+
+def create_offline_controller():
+    """카메라/입력 없이 인식만 수행하는 컨트롤러 생성 (대기 모드, 시작 보고, 음성 안내는 끔)"""
+    controller = VirtualGameController(open_camera=False, inject_input=False, speech_backend='none')
+    controller.idle_after_frames = 0
+    controller.startup_pending = False
+    return controller
+
+
+def process_stream(source, controller=None, flip=True, fps=30.0, start=0, stop=None):
+    """
+    영상/이미지를 Hand_Controller와 process_hand_gestures에 통과시키며 프레임별 결과를 반환하는 제너레이터
+    카메라 속도가 아닌 CPU가 허용하는 최대 속도로 처리
+    """
+    if controller is None:
+        controller = create_offline_controller()
+
+    for index, timestamp, frame in iter_frames(source, fps, start, stop):
+        controller.process_image(frame, active=False, render=False, flip=flip)
+        detected = controller.hand_detection
+        yield {
+            'frame': index,
+            'time': timestamp,
+            'detected': detected,
+            'mode': controller.controller_mode,
+            'fingers': controller.finger_up_state.tolist() if detected else [],
+            'gestures': list(controller.detected_gestures),
+            'state': controller.state_text.strip(),
+            'landmarks': controller.hand_detector.landmarks.copy() if detected else None,
+        }
+
+
+# 작업 프로세스마다 하나씩 생성되는 컨트롤러 (별도의 Hands 인스턴스)
+_worker_controller = None
+
+
+def _init_worker():
+    global _worker_controller
+    _worker_controller = create_offline_controller()
+
+
+def _process_chunk(chunk):
+    """작업 프로세스에서 구간 하나 처리 (워밍업 구간 결과는 버림)"""
+    source, start, stop, warmup, flip, fps = chunk
+    _worker_controller.reset_state()
+    records = process_stream(source, _worker_controller, flip, fps, max(0, start - warmup), stop)
+    return [record for record in records if record['frame'] >= start]
+
+
+def process_parallel(source, workers=None, chunk_size=900, warmup=30, flip=True, fps=30.0):
+    """
+    영상을 구간으로 나눠 여러 프로세스에서 병렬 처리하고 프레임 순서대로 결과를 반환하는 제너레이터
+    warmup: 각 구간 앞에 추가로 처리하여 추적 상태를 수렴시키는 프레임 수
+    전체 프레임 수를 알 수 없는 소스(합성 소스, 프레임 수가 없는 컨테이너 등)는 구간을 나눌 수 없으므로 순서대로 처리
+    """
+    total = count_frames(source)
+    if total <= 0:
+        print(f"전체 프레임 수를 알 수 없어 병렬 처리 대신 순서대로 처리합니다: {source}")
+        yield from process_stream(source, flip=flip, fps=fps)
+        return
+    chunks = [(source, start, min(start + chunk_size, total), warmup, flip, fps)
+              for start in range(0, total, chunk_size)]
+
+    with multiprocessing.Pool(workers, initializer=_init_worker) as pool:
+        # imap은 제출 순서대로 결과를 돌려주므로 프레임 순서가 유지됨
+        for records in pool.imap(_process_chunk, chunks):
+            yield from records
+
+
+def write_timeline(records, path, include_landmarks=False):
+    """프레임별 결과를 CSV 또는 JSONL(.jsonl) 제스처 타임라인으로 저장하고 기록한 프레임 수 반환"""
+    count = 0
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        if path.lower().endswith('.jsonl'):
+            for record in records:
+                row = {field: record[field] for field in TIMELINE_FIELDS}
+                if include_landmarks:
+                    landmarks = record['landmarks']
+                    row['landmarks'] = landmarks.round(2).tolist() if landmarks is not None else None
+                f.write(json.dumps(row, ensure_ascii=False) + '\n')
+                count += 1
+        else:
+            writer = csv.writer(f)
+            writer.writerow(TIMELINE_FIELDS)
+            for record in records:
+                writer.writerow([
+                    record['frame'],
+                    f"{record['time']:.3f}",
+                    int(record['detected']),
+                    record['mode'],
+                    ''.join(str(v) for v in record['fingers']),
+                    '|'.join(record['gestures']),
+                    record['state'],
+                ])
+                count += 1
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description='녹화 영상/이미지 디렉터리를 오프라인으로 처리하여 제스처 타임라인 생성')
+    parser.add_argument('source', help='영상 파일 또는 이미지 디렉터리')
+    parser.add_argument('-o', '--output', default='timeline.csv', help='출력 파일 (.csv 또는 .jsonl)')
+    parser.add_argument('--no-flip', action='store_true', help='좌우 반전하지 않음 (이미 거울 모드로 녹화된 경우)')
+    parser.add_argument('--fps', type=float, default=30.0, help='이미지 디렉터리의 프레임 속도')
+    parser.add_argument('--landmarks', action='store_true', help='JSONL 출력에 랜드마크 포함')
+    parser.add_argument('-j', '--workers', type=int, default=1, help='병렬 처리 프로세스 수 (0: CPU 코어 수)')
+    parser.add_argument('--chunk-size', type=int, default=900, help='병렬 처리 시 구간당 프레임 수')
+    parser.add_argument('--warmup', type=int, default=30, help='구간마다 추적 상태를 맞추기 위한 워밍업 프레임 수')
+    args = parser.parse_args()
+
+    start_time = time()
+    if args.workers == 1:
+        records = process_stream(args.source, flip=not args.no_flip, fps=args.fps)
+    else:
+        records = process_parallel(args.source, args.workers or None, args.chunk_size, args.warmup,
+                                   flip=not args.no_flip, fps=args.fps)
+    count = write_timeline(records, args.output, include_landmarks=args.landmarks)
+    elapsed = time() - start_time
+    print(f"{count} 프레임 처리 완료 ({elapsed:.1f}초, {count / max(elapsed, 1e-9):.1f} fps) -> {args.output}")
+
+
+if __name__ == "__main__":
+    main()
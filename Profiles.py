@@ -0,0 +1,222 @@
+import json
+import os
+import threading
+from collections import namedtuple
+
+from GestureRules import GESTURE_RULES
+from InputDispatcher import InputDispatcher
+from LandmarkFilter import DEFAULT_POINTER_FILTER
+
+# 디스플레이가 없는 환경에서는 pynput을 불러올 수 없음 (키 이름 상수로만 사용)
+try:
+    from pynput.keyboard import Key
+except ImportError:
+    Key = None
+
+# 게임별 프로필 저장 위치 (profiles/<이름>.json)
+PROFILE_DIR = 'profiles'
+DEFAULT_PROFILE_NAME = 'default'
+
+# 프로필 기본값 (프로필에 없는 항목은 이 값으로 채움)
+DEFAULT_MAPPINGS = {'up': 'up', 'down': 'down', 'left': 'left', 'right': 'right', 'jump': 'space'}
+DEFAULT_AREAS = {
+    'control': (225, 50, 575, 400),   # 전체 조작 영역 (위쪽 띠는 모드 전환 버튼)
+    'gesture': (225, 100, 575, 400),  # 제스처 영역
+}
+DEFAULT_PERFORMANCE = {
+    'keyframe_interval': 1,    # MediaPipe 인식 간격 (프레임)
+    'idle_after_frames': 30,   # 손이 이 프레임 수 동안 없으면 대기 모드 (0이면 사용 안 함)
+    'idle_fps': 10,            # 대기 모드 처리 빈도
+}
+SECTIONS = ('name', 'mappings', 'areas', 'pointer_filter', 'performance')
+
+# 미리 검증/변환한 프로필 (key_table은 제스처 -> 입력 백엔드용 키 이름)
+ProfileSettings = namedtuple('ProfileSettings', ['name', 'mappings', 'key_table', 'areas', 'pointer_filter', 'performance'])
+
+
+def resolve_key(name):
+    """키 이름을 pynput Key로 변환 (한 글자 키와 pynput이 없는 환경은 문자열 그대로)"""
+    if Key is not None and len(name) > 1:
+        return getattr(Key, name, name)
+    return name
+
+
+def key_name(key):
+    """pynput Key 또는 문자를 프로필에 저장할 키 이름으로 변환"""
+    return InputDispatcher.resolve_key(key)
+
+
+def profile_path(name, directory=PROFILE_DIR):
+    return os.path.join(directory, f"{name}.json")
+
+
+def list_profiles(directory=PROFILE_DIR):
+    """저장된 프로필 이름 목록"""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(os.path.splitext(name)[0] for name in os.listdir(directory) if name.endswith('.json'))
+
+
+def load_profile(profile_path=None):
+    """
+    프로필 JSON 읽기 (경로가 없으면 빈 프로필)
+    프로필 예: {"mappings": {"jump": "space", "up": "w"}, "areas": {"gesture": [225, 100, 575, 400]},
+               "pointer_filter": {"beta": 0.01}, "performance": {"keyframe_interval": 2}}
+    """
+    if not profile_path:
+        return {}
+    with open(profile_path, encoding='utf-8') as f:
+        profile = json.load(f)
+    if not isinstance(profile, dict):
+        raise ValueError(f"프로필은 JSON 객체({{...}})여야 합니다: {profile_path}")
+    return profile
+
+
+def save_profile(path, profile):
+    """프로필 JSON 저장 (임시 파일에 쓴 뒤 교체하므로 감시 중인 쪽이 반쯤 쓴 파일을 읽지 않음)"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    temp_path = path + '.tmp'
+    with open(temp_path, 'w', encoding='utf-8') as f:
+        json.dump(profile, f, ensure_ascii=False, indent=2)
+    os.replace(temp_path, path)
+
+
+def load_mappings(profile, overrides=()):
+    """프로필의 "mappings"와 --map 인자(gesture=key)를 합쳐 제스처-키 이름 사전 반환"""
+    mappings = dict(profile.get('mappings', {}))
+    for item in overrides:
+        gesture, sep, key = item.partition('=')
+        if not sep or not gesture or not key:
+            raise ValueError(f"매핑 형식이 잘못되었습니다 (gesture=key): {item}")
+        mappings[gesture.strip()] = key.strip()
+    return mappings
+
+
+def _check_keys(section, values, allowed):
+    if not isinstance(values, dict):
+        raise ValueError(f"프로필의 {section} 항목은 사전이어야 합니다")
+    unknown = set(values) - set(allowed)
+    if unknown:
+        raise ValueError(f"알 수 없는 {section} 설정: {', '.join(sorted(unknown))}")
+
+
+def _is_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def prepare_profile(profile, name=None):
+    """
+    프로필 사전을 검증하고 기본값을 채운 ProfileSettings로 변환 (잘못된 값은 ValueError)
+    키 변환까지 여기서 끝내므로 적용할 때는 참조만 바꾸면 됨
+    """
+    _check_keys('프로필', profile, SECTIONS)
+
+    mappings = dict(DEFAULT_MAPPINGS)
+    _check_keys('mappings', profile.get('mappings', {}), [rule.name for rule in GESTURE_RULES if rule.key])
+    for gesture, key in profile.get('mappings', {}).items():
+        if not isinstance(key, str) or not key:
+            raise ValueError(f"{gesture}의 키 이름이 잘못되었습니다: {key!r}")
+        mappings[gesture] = key
+
+    areas = dict(DEFAULT_AREAS)
+    _check_keys('areas', profile.get('areas', {}), DEFAULT_AREAS)
+    for area, box in profile.get('areas', {}).items():
+        if (not isinstance(box, (list, tuple)) or len(box) != 4 or not all(_is_number(v) for v in box)
+                or not box[0] < box[2] or not box[1] < box[3]):
+            raise ValueError(f"{area} 영역은 [x1, y1, x2, y2] (x1 < x2, y1 < y2) 형식이어야 합니다: {box}")
+        areas[area] = tuple(int(v) for v in box)
+
+    pointer_filter = dict(DEFAULT_POINTER_FILTER)
+    _check_keys('pointer_filter', profile.get('pointer_filter', {}), DEFAULT_POINTER_FILTER)
+    for setting, value in profile.get('pointer_filter', {}).items():
+        expected_bool = isinstance(DEFAULT_POINTER_FILTER[setting], bool)
+        if not (isinstance(value, bool) if expected_bool else _is_number(value)):
+            raise ValueError(f"pointer_filter의 {setting} 값이 잘못되었습니다: {value!r}")
+    pointer_filter.update(profile.get('pointer_filter', {}))
+
+    performance = dict(DEFAULT_PERFORMANCE)
+    _check_keys('performance', profile.get('performance', {}), DEFAULT_PERFORMANCE)
+    for setting, value in profile.get('performance', {}).items():
+        if not _is_number(value):
+            raise ValueError(f"performance의 {setting} 값은 숫자여야 합니다: {value!r}")
+    performance.update({key: int(value) for key, value in profile.get('performance', {}).items()})
+    if performance['keyframe_interval'] < 1 or performance['idle_fps'] < 1 or performance['idle_after_frames'] < 0:
+        raise ValueError(f"성능 설정 값이 범위를 벗어났습니다: {performance}")
+
+    resolved = {gesture: resolve_key(key) for gesture, key in mappings.items()}
+    return ProfileSettings(
+        name=name or profile.get('name') or DEFAULT_PROFILE_NAME,
+        mappings=resolved,
+        key_table={gesture: InputDispatcher.resolve_key(key) for gesture, key in resolved.items()},
+        areas=areas,
+        pointer_filter=pointer_filter,
+        performance=performance,
+    )
+
+
+def settings_to_profile(settings):
+    """ProfileSettings를 저장용 프로필 사전으로 변환"""
+    return {
+        'name': settings.name,
+        'mappings': {gesture: key_name(key) for gesture, key in settings.mappings.items()},
+        'areas': {area: list(box) for area, box in settings.areas.items()},
+        'pointer_filter': dict(settings.pointer_filter),
+        'performance': dict(settings.performance),
+    }
+
+
+class ProfileWatcher:
+    """
+    프로필 파일의 수정 시각을 주기적으로 확인하고 바뀌면 다시 읽어 callback(프로필 사전, 이름) 호출
+    읽기에 실패하거나 콜백이 ValueError를 내면 (잘못된 프로필) 이전 프로필을 유지
+    """
+
+    def __init__(self, path, callback, interval=0.5):
+        self.path = path
+        self.callback = callback
+        self.interval = interval
+        self._stamp = self._file_stamp()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _file_stamp(self):
+        try:
+            stat = os.stat(self.path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def mark_current(self):
+        """현재 파일 상태를 이미 읽은 것으로 표시 (직접 저장한 뒤 다시 읽지 않도록)"""
+        self._stamp = self._file_stamp()
+
+    def check(self):
+        """파일이 바뀌었으면 다시 읽어 콜백 호출 (바뀌어서 적용했으면 True)"""
+        stamp = self._file_stamp()
+        if stamp is None or stamp == self._stamp:
+            return False
+        self._stamp = stamp
+        name = os.path.splitext(os.path.basename(self.path))[0]
+        try:
+            self.callback(load_profile(self.path), name)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"프로필을 다시 읽지 못했습니다 ({self.path}): {e}")
+            return False
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='ProfileWatcher', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+            self._thread = None
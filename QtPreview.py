@@ -0,0 +1,37 @@
+import cv2
+import numpy as np
+from PyQt5.QtGui import QImage
+
+# Qt와 OpenCV만 사용 (pynput 등 입력 모듈을 불러오지 않으므로 디스플레이 없는 벤치마크에서도 사용 가능)
+
+
+class PreviewConverter:
+    """OpenCV(BGR) 프레임을 재사용 버퍼에 한 번만 축소하여 그대로 감싼 QImage로 변환 (중간 복사 없음)"""
+
+    # Qt 5.14 이상은 BGR 순서를 그대로 표시할 수 있음
+    BGR_FORMAT = getattr(QImage, 'Format_BGR888', None)
+
+    def __init__(self):
+        self.buffer = None
+        self.image = None
+
+    def convert(self, frame, width, height):
+        """비율을 유지하여 width x height 안에 맞춘 QImage 반환 (다음 호출 전까지 유효)"""
+        h, w = frame.shape[:2]
+        scale = min(width / w, height / h)
+        dw, dh = max(1, int(w * scale)), max(1, int(h * scale))
+        
+        if self.buffer is None or self.buffer.shape[:2] != (dh, dw):
+            self.buffer = np.empty((dh, dw, 3), dtype=np.uint8)
+        
+        # 미리보기용이므로 저렴한 선형 보간으로 한 번만 축소
+        cv2.resize(frame, (dw, dh), dst=self.buffer, interpolation=cv2.INTER_LINEAR)
+        if self.BGR_FORMAT is not None:
+            fmt = self.BGR_FORMAT
+        else:
+            # 구버전 Qt: 같은 버퍼 안에서 RGB로 변환
+            cv2.cvtColor(self.buffer, cv2.COLOR_BGR2RGB, dst=self.buffer)
+            fmt = QImage.Format_RGB888
+        
+        self.image = QImage(self.buffer.data, dw, dh, self.buffer.strides[0], fmt)
+        return self.image
@@ -0,0 +1,56 @@
+import numpy as np
+
+
+class RegionMap:
+    """
+    화면 영역을 작업 해상도의 정수 라벨 이미지로 한 번만 그려 두고 랜드마크 전체를 한 번에 조회
+    영역마다 비트 하나를 쓰므로 겹치는 영역(인식 띠 안의 MOUSE/ARROW 버튼 등)도 함께 표시됨
+    """
+
+    def __init__(self, regions, size):
+        """
+        regions: [(이름, (x1, y1, x2, y2))] 목록 (순서대로 비트 0, 1, ...)
+        size: 작업 해상도 (너비, 높이)
+        """
+        self.regions = [(name, tuple(int(v) for v in box)) for name, box in regions]
+        self.size = tuple(size)
+        self.names = tuple(name for name, _ in self.regions)
+        self.flags = {name: 1 << i for i, name in enumerate(self.names)}
+
+        # 화면 밖 좌표는 가장자리 1픽셀 테두리(라벨 0)로 잘라 조회하므로 따로 검사하지 않음
+        w, h = self.size
+        dtype = np.uint8 if len(self.regions) <= 8 else np.uint32
+        self.labels = np.zeros((h + 2, w + 2), dtype=dtype)
+        for name, (x1, y1, x2, y2) in self.regions:
+            x1, x2 = max(x1, 0), min(x2, w)
+            y1, y2 = max(y1, 0), min(y2, h)
+            if x1 < x2 and y1 < y2:
+                self.labels[y1 + 1:y2 + 1, x1 + 1:x2 + 1] |= self.flags[name]
+        self._limit = np.array([w + 1, h + 1], dtype=np.intp)
+        self._index = np.zeros((0, 2), dtype=np.intp)
+
+    def lookup(self, points):
+        """
+        점 (N, 2) 배열(픽셀 좌표)의 영역 라벨 (N,) 배열 반환 (비트 i가 켜져 있으면 i번째 영역 안)
+        경계는 x1 <= x < x2 (픽셀 단위)
+        """
+        if self._index.shape[0] != len(points):
+            self._index = np.zeros((len(points), 2), dtype=np.intp)
+        index = self._index
+        # 테두리만큼 1을 더해 정수로 변환 (화면 밖의 점은 테두리 위치로 잘림)
+        np.add(points[:, :2], 1, out=index, casting='unsafe')
+        # np.clip보다 작은 배열에서 빠름
+        np.minimum(np.maximum(index, 0, out=index), self._limit, out=index)
+        return self.labels[index[:, 1], index[:, 0]]
+
+    def lookup_point(self, point):
+        """점 하나 (x, y)의 영역 라벨"""
+        w, h = self.size
+        x, y = point[0], point[1]
+        if not (0 <= x < w and 0 <= y < h):
+            return 0
+        return int(self.labels[int(y) + 1, int(x) + 1])
+
+    def contains(self, label, name):
+        """라벨이 해당 영역을 포함하는지 확인"""
+        return bool(label & self.flags[name])
@@ -0,0 +1,172 @@
+import shutil
+import subprocess
+import threading
+from collections import deque
+from time import time
+
+# 리눅스 음성 합성 명령 (먼저 찾은 것을 사용)
+TTS_COMMANDS = [
+    ['spd-say', '--wait', '--language', 'ko'],
+    ['espeak-ng', '-v', 'ko'],
+    ['espeak', '-v', 'ko'],
+]
+
+
+class SapiBackend:
+    """윈도우 SAPI 음성 (COM 객체는 음성 작업 스레드에서 만들고 사용)"""
+    name = 'sapi'
+
+    def __init__(self):
+        import pythoncom
+        from win32com.client import Dispatch
+        pythoncom.CoInitialize()
+        self.engine = Dispatch('SAPI.Spvoice')
+
+    def speak(self, message):
+        self.engine.Speak(message)
+
+
+class CommandBackend:
+    """리눅스 음성 합성 명령(spd-say, espeak-ng 등)을 실행"""
+    name = 'command'
+
+    def __init__(self, command=None):
+        if command is None:
+            command = next((cmd for cmd in TTS_COMMANDS if shutil.which(cmd[0])), None)
+        if command is None:
+            raise OSError("음성 합성 명령을 찾을 수 없습니다")
+        self.command = list(command)
+
+    def speak(self, message):
+        subprocess.run(self.command + [message], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, timeout=15)
+
+
+class PrintBackend:
+    """콘솔 출력으로 대신함"""
+    name = 'print'
+
+    def speak(self, message):
+        print(f"Voice: {message}")
+
+
+class NullBackend:
+    """아무것도 하지 않음 (오프라인 처리용)"""
+    name = 'none'
+
+    def speak(self, message):
+        pass
+
+
+BACKENDS = {
+    'sapi': SapiBackend,
+    'command': CommandBackend,
+    'print': PrintBackend,
+    'none': NullBackend,
+}
+
+
+def create_backend(name='auto'):
+    """음성 백엔드 생성 ('auto'면 SAPI -> 음성 합성 명령 -> 콘솔 출력 순서로 시도)"""
+    if name != 'auto':
+        return BACKENDS[name]()
+    for backend in (SapiBackend, CommandBackend):
+        try:
+            return backend()
+        except Exception:
+            continue
+    print("음성 출력을 사용할 수 없습니다")
+    return PrintBackend()
+
+
+class SpeechQueue:
+    """
+    음성 안내를 작업 스레드에서 차례로 재생 (say는 바로 반환)
+    이미 대기 중인 같은 문장은 합치고, max_age초 넘게 기다린 문장과 max_pending을 넘는 오래된 문장은 버림
+    """
+
+    def __init__(self, backend='auto', max_age=3.0, max_pending=4):
+        self.backend_name = backend
+        self.backend = None
+        self.max_age = max_age
+        self.max_pending = max_pending
+        self._pending = deque()          # (문장, 요청 시각)
+        self._cond = threading.Condition()
+        self._speaking = False
+        self._closed = False
+        self.spoken_count = 0
+        self.coalesced_count = 0
+        self.dropped_count = 0
+        self._thread = threading.Thread(target=self._run, name='SpeechQueue', daemon=True)
+        self._thread.start()
+
+    def say(self, message):
+        """문장을 대기열에 넣고 바로 반환"""
+        with self._cond:
+            if self._closed:
+                return
+            if any(pending == message for pending, _ in self._pending):
+                self.coalesced_count += 1
+                return
+            self._pending.append((message, time()))
+            while len(self._pending) > self.max_pending:
+                self._pending.popleft()
+                self.dropped_count += 1
+            self._cond.notify()
+
+    def _run(self):
+        # 백엔드는 이 스레드에서 생성 (SAPI COM 객체가 같은 스레드에서만 쓰이도록)
+        try:
+            self.backend = create_backend(self.backend_name)
+        except Exception as e:
+            print(f"음성 백엔드 초기화 오류: {e}")
+            self.backend = PrintBackend()
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._closed:
+                    self._cond.wait()
+                if not self._pending:
+                    return
+                message, queued = self._pending.popleft()
+                if time() - queued > self.max_age:
+                    self.dropped_count += 1
+                    self._cond.notify_all()
+                    continue
+                self._speaking = True
+            try:
+                self.backend.speak(message)
+                self.spoken_count += 1
+            except Exception as e:
+                print(f"음성 출력 오류: {e}")
+            finally:
+                with self._cond:
+                    self._speaking = False
+                    self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """대기 중인 문장을 모두 재생할 때까지 기다림 (timeout초가 지나면 포기하고 False)"""
+        deadline = None if timeout is None else time() + timeout
+        with self._cond:
+            while self._pending or self._speaking:
+                remaining = None if deadline is None else deadline - time()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self, timeout=2.0):
+        """남은 문장을 timeout초까지 재생한 뒤 작업 스레드 종료"""
+        self.flush(timeout)
+        with self._cond:
+            self._closed = True
+            self._pending.clear()
+            self._cond.notify_all()
+
+    def get_stats(self):
+        """재생/합침/버린 문장 수 반환"""
+        return {
+            'backend': self.backend.name if self.backend is not None else None,
+            'spoken': self.spoken_count,
+            'coalesced': self.coalesced_count,
+            'dropped': self.dropped_count,
+        }
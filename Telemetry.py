@@ -0,0 +1,290 @@
+import csv
+import json
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import time, perf_counter
+
+import numpy as np
+
+# 컨트롤러/GUI가 기록하는 단계 이름 (CSV 컬럼 순서)
+STAGES = ['frame', 'inference', 'gestures', 'input', 'overlay', 'preview', 'latency']
+
+
+class PipelineTelemetry:
+    """프레임 파이프라인의 단계별 시간, 버린 프레임, 손 미검출 시간, 입력 이벤트 수를 이동 구간으로 집계"""
+
+    def __init__(self, window=120):
+        self.window = window
+        self._lock = threading.Lock()
+        self.stage_times = {}                      # 단계 이름 -> 최근 소요 시간(초)
+        self.frame_times = deque(maxlen=window)    # 최근 프레임 처리 완료 시각
+        self.hand_flags = deque(maxlen=window)     # 최근 프레임의 손 검출 여부
+        self.input_events = deque(maxlen=window)   # 최근 프레임별 (시각, 입력 이벤트 수)
+        self.frame_by_hands = {}                   # 인식된 손 수 -> 최근 프레임 처리 시간(초)
+        self.frame_count = 0
+        self.dropped_frames = 0
+        self.last_hand_time = time()
+        self._stage_start = {}
+
+    def start_stage(self, stage):
+        """단계 시작 시각 기록"""
+        self._stage_start[stage] = perf_counter()
+
+    def end_stage(self, stage):
+        """단계 종료 및 소요 시간 기록 (소요 시간(초) 반환, 시작하지 않은 단계면 None)"""
+        start = self._stage_start.pop(stage, None)
+        if start is None:
+            return None
+        seconds = perf_counter() - start
+        self.record_stage(stage, seconds)
+        return seconds
+
+    def record_stage(self, stage, seconds):
+        """단계 소요 시간(초) 기록"""
+        with self._lock:
+            times = self.stage_times.get(stage)
+            if times is None:
+                times = self.stage_times[stage] = deque(maxlen=self.window)
+            times.append(seconds)
+
+    def frame_done(self, hand_detected, input_events=0, dropped_frames=None, hand_count=None, frame_seconds=None):
+        """
+        프레임 한 장 처리 완료 기록 (dropped_frames: 캡처에서 버린 누적 프레임 수)
+        hand_count, frame_seconds: 인식된 손 수와 프레임 처리 시간 (손 수별 처리 시간 집계용)
+        """
+        now = time()
+        with self._lock:
+            if hand_count is not None and frame_seconds is not None:
+                times = self.frame_by_hands.get(hand_count)
+                if times is None:
+                    times = self.frame_by_hands[hand_count] = deque(maxlen=self.window)
+                times.append(frame_seconds)
+            self.frame_times.append(now)
+            self.hand_flags.append(hand_detected)
+            self.input_events.append((now, input_events))
+            self.frame_count += 1
+            if dropped_frames is not None:
+                self.dropped_frames = dropped_frames
+            if hand_detected:
+                self.last_hand_time = now
+
+    def fps(self):
+        """최근 구간의 평균 FPS (프레임이 부족하면 0)"""
+        with self._lock:
+            return self._fps()
+
+    def _fps(self):
+        if len(self.frame_times) < 2:
+            return 0.0
+        elapsed = self.frame_times[-1] - self.frame_times[0]
+        if elapsed <= 0:
+            return 0.0
+        return (len(self.frame_times) - 1) / elapsed
+
+    def snapshot(self):
+        """현재 지표를 딕셔너리로 반환"""
+        now = time()
+        with self._lock:
+            stages = {}
+            for stage, times in self.stage_times.items():
+                if not times:
+                    continue
+                values = np.fromiter(times, dtype=np.float64, count=len(times)) * 1000
+                stages[stage] = {
+                    'mean_ms': round(float(values.mean()), 3),
+                    'p95_ms': round(float(np.percentile(values, 95)), 3),
+                    'max_ms': round(float(values.max()), 3),
+                }
+
+            events_per_sec = 0.0
+            if len(self.input_events) >= 2:
+                elapsed = self.input_events[-1][0] - self.input_events[0][0]
+                if elapsed > 0:
+                    events_per_sec = sum(count for _, count in list(self.input_events)[1:]) / elapsed
+
+            frame_by_hands = {}
+            for hand_count, times in sorted(self.frame_by_hands.items()):
+                if not times:
+                    continue
+                values = np.fromiter(times, dtype=np.float64, count=len(times)) * 1000
+                frame_by_hands[str(hand_count)] = {
+                    'frames': len(values),
+                    'mean_ms': round(float(values.mean()), 3),
+                    'p95_ms': round(float(np.percentile(values, 95)), 3),
+                }
+
+            hand_ratio = sum(self.hand_flags) / len(self.hand_flags) if self.hand_flags else 0.0
+            return {
+                'time': now,
+                'frames': self.frame_count,
+                'fps': round(self._fps(), 2),
+                'dropped_frames': self.dropped_frames,
+                'no_hand_seconds': round(0.0 if self.hand_flags and self.hand_flags[-1] else now - self.last_hand_time, 2),
+                'hand_ratio': round(hand_ratio, 3),
+                'input_events_per_sec': round(events_per_sec, 2),
+                'stages': stages,
+                'frame_by_hands': frame_by_hands,
+            }
+
+    def summary_text(self):
+        """상태 표시줄/오버레이용 한 줄 요약"""
+        snap = self.snapshot()
+        stages = ' '.join(f"{name}:{stats['mean_ms']:.1f}" for name, stats in snap['stages'].items())
+        text = (f"FPS {snap['fps']:.1f} | drop {snap['dropped_frames']} | "
+                f"no hand {snap['no_hand_seconds']:.1f}s | input {snap['input_events_per_sec']:.1f}/s | {stages} ms")
+        if snap['frame_by_hands']:
+            text += " | frame by hands " + ' '.join(f"{count}:{stats['mean_ms']:.1f}" for count, stats in snap['frame_by_hands'].items()) + " ms"
+        return text
+
+
+class StartupReport:
+    """프로그램 시작 단계별 소요 시간 기록 (단계는 여러 스레드에서 동시에 진행될 수 있음)"""
+
+    def __init__(self, origin=None):
+        self.origin = perf_counter() if origin is None else origin  # 기준 시각 (perf_counter)
+        self.phases = []   # (단계 이름, 시작, 끝) 기준 시각으로부터의 초
+        self.marks = {}    # 이정표 이름 -> 기준 시각으로부터의 초
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name):
+        """with 블록의 소요 시간을 한 단계로 기록"""
+        start = perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, start, perf_counter())
+
+    def record(self, name, start, end):
+        """perf_counter 기준 시작/끝 시각으로 단계 기록"""
+        with self._lock:
+            self.phases.append((name, start - self.origin, end - self.origin))
+
+    def mark(self, name):
+        """이정표 시각 기록 (이미 기록된 이정표는 무시하고 False 반환)"""
+        with self._lock:
+            if name in self.marks:
+                return False
+            self.marks[name] = perf_counter() - self.origin
+            return True
+
+    def snapshot(self):
+        """단계별 (시작, 소요 시간)과 이정표를 밀리초 단위 딕셔너리로 반환"""
+        with self._lock:
+            return {
+                'phases': {name: {'start_ms': round(start * 1000, 1), 'duration_ms': round((end - start) * 1000, 1)}
+                           for name, start, end in self.phases},
+                'marks': {name: round(at * 1000, 1) for name, at in self.marks.items()},
+            }
+
+    def summary_text(self):
+        """콘솔/상태 표시줄용 한 줄 요약"""
+        snap = self.snapshot()
+        phases = ' '.join(f"{name} {stats['duration_ms']:.0f}" for name, stats in snap['phases'].items())
+        marks = ' '.join(f"{name} {at:.0f}" for name, at in sorted(snap['marks'].items(), key=lambda item: item[1]))
+        return f"시작 단계(ms): {phases} | 경과(ms): {marks}"
+
+
+class CsvTelemetryExporter:
+    """일정 간격으로 지표 스냅샷을 CSV 파일에 추가 기록"""
+
+    def __init__(self, telemetry, path, interval=1.0):
+        self.telemetry = telemetry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name='CsvTelemetryExporter', daemon=True)
+        self._thread.start()
+        return self
+
+    def _run(self):
+        header = ['time', 'frames', 'fps', 'dropped_frames', 'no_hand_seconds', 'hand_ratio', 'input_events_per_sec']
+        for stage in STAGES:
+            header += [f'{stage}_mean_ms', f'{stage}_p95_ms']
+        header += [f'frame_{count}hand_mean_ms' for count in range(3)]
+
+        write_header = not os.path.exists(self.path) or os.path.getsize(self.path) == 0
+        with open(self.path, 'a', newline='', encoding='utf-8') as f:
+            writer = csv.writer(f)
+            if write_header:
+                writer.writerow(header)
+            while not self._stop.wait(self.interval):
+                snap = self.telemetry.snapshot()
+                row = dict(snap)
+                for stage, stats in snap['stages'].items():
+                    row[f'{stage}_mean_ms'] = stats['mean_ms']
+                    row[f'{stage}_p95_ms'] = stats['p95_ms']
+                for count, stats in snap['frame_by_hands'].items():
+                    row[f'frame_{count}hand_mean_ms'] = stats['mean_ms']
+                writer.writerow([row.get(key, '') for key in header])
+                f.flush()
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+
+class TelemetryHttpServer:
+    """로컬 HTTP 지표 엔드포인트 (/metrics: Prometheus 텍스트, /metrics.json: JSON)"""
+
+    def __init__(self, telemetry, port=9750, host='127.0.0.1'):
+        self.telemetry = telemetry
+        telemetry_ref = telemetry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics.json':
+                    body = json.dumps(telemetry_ref.snapshot()).encode('utf-8')
+                    content_type = 'application/json'
+                elif self.path == '/metrics':
+                    body = prometheus_text(telemetry_ref.snapshot()).encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4'
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 요청 로그 출력 생략
+
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.server.serve_forever, name='TelemetryHttpServer', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def prometheus_text(snap):
+    """스냅샷을 Prometheus 텍스트 형식으로 변환"""
+    lines = [
+        f"vgc_fps {snap['fps']}",
+        f"vgc_frames_total {snap['frames']}",
+        f"vgc_dropped_frames_total {snap['dropped_frames']}",
+        f"vgc_no_hand_seconds {snap['no_hand_seconds']}",
+        f"vgc_hand_ratio {snap['hand_ratio']}",
+        f"vgc_input_events_per_second {snap['input_events_per_sec']}",
+    ]
+    for stage, stats in snap['stages'].items():
+        lines.append(f'vgc_stage_mean_ms{{stage="{stage}"}} {stats["mean_ms"]}')
+        lines.append(f'vgc_stage_p95_ms{{stage="{stage}"}} {stats["p95_ms"]}')
+    for count, stats in snap.get('frame_by_hands', {}).items():
+        lines.append(f'vgc_frame_mean_ms{{hands="{count}"}} {stats["mean_ms"]}')
+        lines.append(f'vgc_frame_p95_ms{{hands="{count}"}} {stats["p95_ms"]}')
+    return '\n'.join(lines) + '\n'
@@ -1,65 +1,181 @@
+import threading
 import cv2
-from win32com.client import Dispatch
-from win32api import GetSystemMetrics
 from numpy import interp
 from time import time
-from pynput.keyboard import Controller as KeyboardController
-from pynput.keyboard import Key
-from pynput.mouse import Controller as MouseController
-from pynput.mouse import Button
-import pydirectinput  # 추가
 
+# 무거운 모듈(mediapipe, win32com)은 처음 필요할 때 불러옴
 from Handcontroller import Hand_Controller
+from FrameCapture import ThreadedCapture
+from FrameSource import CameraSource, create_frame_source
+from InputDispatcher import InputDispatcher
+from InputBackend import create_input_backend, NullBackend, mouse_move, mouse_click
+from Telemetry import PipelineTelemetry, StartupReport
+from LandmarkRecorder import LandmarkRecorder
+from HudRenderer import HudRenderer
+from GestureStream import GestureStreamPublisher
+from LandmarkFilter import PointerFilter
+from GestureRules import GestureTable, MODES, TWO_HAND_RULES
+from RegionMap import RegionMap
+from Profiles import (ProfileSettings, DEFAULT_PROFILE_NAME, DEFAULT_AREAS, DEFAULT_PERFORMANCE, prepare_profile,
+                      settings_to_profile)
+from Speech import SpeechQueue
 
 class VirtualGameController:
-    def __init__(self):
-        # 컨트롤러 초기화
-        self.keyboard = KeyboardController()
-        self.mouse = MouseController()
+    def __init__(self, open_camera=True, inject_input=True, lazy_init=False, camera_source=0, startup=None,
+                 speech_backend='auto', input_backend='auto', two_hand=False):
+        """
+        open_camera: False면 카메라를 열지 않음 (process_image로 직접 프레임 전달)
+        inject_input: False면 키보드/마우스 입력을 보내지 않음 (오프라인 분석용)
+        lazy_init: True면 카메라/MediaPipe 초기화를 warm_up() 호출 시로 미룸 (GUI는 작업 스레드에서 호출)
+        camera_source: 카메라 번호, 스트림 주소 또는 FrameSource (캡처 백엔드/FOURCC/버퍼 크기를 정한 CameraSource, 실시간 재생 영상/합성 소스 등)
+        startup: 시작 단계 시간을 기록할 StartupReport (없으면 새로 생성)
+        speech_backend: 음성 안내 백엔드 ('auto', 'sapi', 'command', 'print', 'none')
+        input_backend: 입력 백엔드 ('auto', 'sendinput', 'xtest', 'uinput', 'recording', 'none')
+        two_hand: True면 두 손 모드로 시작 (왼손 방향, 오른손 동작)
+        """
+        self.startup = startup if startup is not None else StartupReport()
+        self.ready = threading.Event()
+        self.open_camera = open_camera
+        self.camera_source = camera_source
         
-        # 음성 엔진 초기화
-        try:
-            self.voice_engine = Dispatch('SAPI.Spvoice')
+        self.inject_input = inject_input
+        
+        # 음성 안내 (작업 스레드에서 재생하므로 호출한 쪽을 막지 않음)
+        with self.startup.phase('speech'):
+            self.speech = SpeechQueue(speech_backend)
             self.say('가상 게임 컨트롤러가 시작되었습니다')
-        except:
-            self.voice_engine = None
-            print("음성 출력을 사용할 수 없습니다")
             
-        # 손 인식 초기화
-        self.hand_detector = Hand_Controller()
+        # 파이프라인 지표 (단계별 시간, 버린 프레임, 입력 이벤트 등)
+        self.telemetry = PipelineTelemetry()
+        self.show_telemetry_overlay = False
         
-        # 카메라 설정
+        # 랜드마크 기록기 (start_recording으로 시작)
+        self.landmark_recorder = None
+        
+        # 제스처 이벤트 스트림 (start_event_stream으로 시작)
+        self.event_stream = None
+        
+        # 손 인식/카메라 (warm_up에서 병렬로 초기화)
+        self.hand_detector = None
         self.cap = None
-        self.init_camera()
+        self.frame_source = None
+        
+        # 대기 모드: 이 프레임 수 동안 손이 없으면 축소 해상도/낮은 빈도로 인식 (0이면 사용 안 함)
+        self.idle_after_frames = DEFAULT_PERFORMANCE['idle_after_frames']
+        self.idle_fps = DEFAULT_PERFORMANCE['idle_fps']
+        self.keyframe_interval = DEFAULT_PERFORMANCE['keyframe_interval']
         
         # 화면 설정
         self.setup_display_settings()
         
+        # 제스처 규칙 조회 표 (규칙은 GestureRules.GESTURE_RULES)
+        self.gesture_table = GestureTable()
+        
+        # 두 손 모드: 손잡이별 제스처 표 (GestureRules.TWO_HAND_RULES)
+        self.two_hand = two_hand
+        self.hand_tables = {label: GestureTable(rules) for label, rules in TWO_HAND_RULES.items()}
+        self.pending_hand_mode = None
+        
+        # 마우스 포인터 떨림 제거/지연 보상 필터
+        self.pointer_filter = PointerFilter()
+        
         # 컨트롤러 변수
         self.controller_mode = 1  # 기본값을 키보드 모드(1)로 설정
         self.setup_control_variables()
         
-        # 제스처-키 매핑
-        self.gesture_mappings = {
-            'up': Key.up,
-            'down': Key.down,
-            'left': Key.left,
-            'right': Key.right,
-            'jump': Key.space
-        }
+        # 제스처-키 매핑 (pynput이 없으면 키 이름 문자열 사용)
+        default_profile = prepare_profile({})
+        self.gesture_mappings = dict(default_profile.mappings)
+        
+        # 현재 프로필 이름과 다음 프레임 전에 적용할 프로필
+        self.profile_name = DEFAULT_PROFILE_NAME
+        self.pending_profile = None
+        self._profile_lock = threading.Lock()
         
         # 종료 플래그
         self.quit_confirmed = False
+        
+        # 첫 제스처까지의 시작 이정표를 기록 중인지 여부
+        self.startup_pending = True
 
-        # pydirectinput 초기화
-        pydirectinput.PAUSE = 0.0  # 딜레이 제거
+        # 눌림/뗌 변화만 전송하는 입력 디스패처 (키 이름은 매핑 시 미리 변환)
+        with self.startup.phase('input'):
+            self.input_dispatcher = InputDispatcher(create_input_backend(input_backend) if inject_input else NullBackend())
+        self.input_batch = []  # 이번 프레임에 보낼 입력 이벤트 (프레임 끝에 한 번에 전송)
+        self.input_dispatcher.set_key_table(default_profile.key_table)
+        
+        if not lazy_init:
+            self.warm_up()
+    
+    def warm_up(self):
+        """
+        카메라 열기와 MediaPipe 모델 로드를 동시에 수행 (이미 끝났으면 바로 반환)
+        카메라는 별도 스레드에서 열고, 모델은 호출한 스레드에서 로드
+        """
+        if self.ready.is_set():
+            return
+        camera_thread = None
+        if self.open_camera:
+            camera_thread = threading.Thread(target=self._open_camera_phase, name='CameraInit', daemon=True)
+            camera_thread.start()
+        
+        # 손 인식 초기화 (손을 추적 중일 때는 주변 영역만 인식)
+        with self.startup.phase('model'):
+            # 모델 로드 전에 요청된 두 손 모드가 있으면 그 손 수로 생성 (적용은 첫 프레임 전에)
+            with self._profile_lock:
+                pending = self.pending_hand_mode
+            self.hand_detector = self.create_hand_detector(pending[0] if pending is not None else self.two_hand)
+        
+        if camera_thread is not None:
+            camera_thread.join()
+            # 파일/합성 소스는 모델 로드 중에 앞부분 프레임을 버리지 않도록 여기서 재생 시작
+            if self.cap is not None and self.frame_source.isOpened():
+                self.cap.start()
+        self.ready.set()
+        self.startup.mark('ready')
+    
+    def create_hand_detector(self, two_hand):
+        """손 인식기 생성 (손을 추적 중일 때는 주변 영역만 인식, 두 손 모드는 최대 2개)"""
+        return Hand_Controller(roi_mode=True, keyframe_interval=self.keyframe_interval, max_hands=2 if two_hand else 1)
+    
+    def set_two_hand_mode(self, enabled):
+        """
+        두 손 모드 전환 (왼손은 방향, 오른손은 동작을 손잡이별 제스처 표로 인식, 키보드 모드로만 동작)
+        최대 손 수가 바뀌면 손 인식 모델을 새로 만들어야 하므로 호출한 스레드에서 만든 뒤 다음 프레임 전에 교체
+        모델 로드 전(warm_up 중)이면 전환만 기록해 두고 warm_up이 만든 모델과 함께 첫 프레임 전에 반영
+        """
+        detector = self.create_hand_detector(enabled) if self.ready.is_set() else None
+        with self._profile_lock:
+            self.pending_hand_mode = (enabled, detector)
+    
+    def apply_pending_hand_mode(self):
+        """적용 대기 중인 두 손 모드 전환 반영 (프레임 처리 스레드에서 프레임 사이에 호출)"""
+        with self._profile_lock:
+            pending, self.pending_hand_mode = self.pending_hand_mode, None
+        if pending is None:
+            return
+        enabled, detector = pending
+        # warm_up 중에 요청되어 모델의 최대 손 수가 맞지 않으면 여기서 다시 생성
+        if detector is None and self.hand_detector is not None and self.hand_detector.max_hands != (2 if enabled else 1):
+            detector = self.create_hand_detector(enabled)
+        self.two_hand = enabled
+        if detector is not None:
+            previous, self.hand_detector = self.hand_detector, detector
+            if previous is not None:
+                previous.hands.close()
+        if enabled:
+            self.controller_mode = 1
+    
+    def _open_camera_phase(self):
+        with self.startup.phase('camera'):
+            try:
+                self.init_camera(self.camera_source)
+            except Exception as e:
+                print(f"카메라 초기화 오류: {e}")
         
     def say(self, message):
-        """음성 출력 기능"""
-        if self.voice_engine:
-            self.voice_engine.Speak(message)
-        else:
-            print(f"Voice: {message}")
+        """음성 출력 기능 (대기열에 넣고 바로 반환)"""
+        self.speech.say(message)
             
     def setup_display_settings(self):
         """화면 표시 설정"""
@@ -68,86 +184,134 @@ class VirtualGameController:
         self.font_size = 1
         self.font_color = (215, 255, 214)
         self.font_thickness = 2
+        self.hud = HudRenderer()
         
         # 화면 영역 설정
-        self.start_x, self.start_y = 225, 50
-        self.end_x, self.end_y = 575, 400
-        self.hand_start_x, self.hand_start_y = 225, 100
-        self.hand_end_x, self.hand_end_y = 575, 400
+        self.set_areas(DEFAULT_AREAS['control'], DEFAULT_AREAS['gesture'])
+        try:
+            from win32api import GetSystemMetrics
+            self.screen_width, self.screen_height = GetSystemMetrics(0), GetSystemMetrics(1)
+        except ImportError:
+            self.screen_width, self.screen_height = 1920, 1080
+    
+    def set_areas(self, control, gesture):
+        """조작 영역과 제스처 영역 설정 ((x1, y1, x2, y2), 모드 전환 버튼은 조작 영역 위쪽 띠를 반으로 나눔)"""
+        self.start_x, self.start_y, self.end_x, self.end_y = control
+        self.hand_start_x, self.hand_start_y, self.hand_end_x, self.hand_end_y = gesture
         self.mid_x = (self.start_x + self.end_x) // 2
-        self.screen_width, self.screen_height = GetSystemMetrics(0), GetSystemMetrics(1)
+        # 영역 라벨 지도는 다음 조회 때 새 레이아웃으로 다시 그림
+        self.region_map = None
     
     def setup_control_variables(self):
         """컨트롤 변수 설정"""
         # 방향 및 점프 상태
         self.v_dir, self.h_dir, self.jump = 0, 0, 0
         
-        # 손가락 상태 변수
-        self.thumb = self.index_finger = self.middle_finger = self.ring_finger = self.pinky_finger = 1
+        # 손가락 상태 (엄지~소지)
         self.finger_up_state = []
         
         # FPS 계산 변수
         self.prev_time, self.cur_time = 0, 0
         
-        # 마우스 포인터 변수
+        # 현재 처리 중인 프레임 정보 (순번, 캡처 시각)
+        self.frame_seq = -1
+        self.frame_timestamp = 0
+        
+        # 대기 모드 상태 (손이 연속으로 보이지 않은 프레임 수)
+        self.no_hand_frames = 0
+        self.idle = False
+        
+        # 마지막 프레임 처리 결과
+        self.hand_detection = False
+        self.state_text = ""
+        self.detected_gestures = []
+        
+        # 마우스 포인터 변수 (필터 설정은 유지하고 상태만 초기화)
+        self.pointer_filter.reset()
         self.pointer_x, self.pointer_y = 0, 0
         self.clicked = 0
         self.clk = 0
         
-    def init_camera(self):
-        """카메라 초기화"""
+    def init_camera(self, source=0):
+        """카메라 초기화 (source: 카메라 번호, 스트림 주소 또는 FrameSource)"""
         self.say('카메라 연결 중')
-        self.cap = cv2.VideoCapture(0)
         self.cam_width, self.cam_height = 960, 720
-        self.cap.set(3, self.cam_width)
-        self.cap.set(4, self.cam_height)
-        if self.cap.isOpened():
+        self.frame_source = create_frame_source(source, realtime=True, width=self.cam_width, height=self.cam_height)
+        opened = self.frame_source.open()
+        # 백그라운드 스레드에서 최신 프레임만 유지
+        self.cap = ThreadedCapture(self.frame_source)
+        if opened:
+            # 요청한 값이 아니라 실제로 협상된 캡처 모드
+            print(f"캡처 모드: {self.frame_source.mode_text()}")
+            # 파일/합성 소스는 모델이 준비된 뒤 재생 시작 (warm_up에서 시작)
+            if isinstance(self.frame_source, CameraSource):
+                self.cap.start()
+                self.cap.wait_ready(timeout=2.0)
             self.say('카메라 연결됨')
         else:
             self.say('카메라 연결 실패')
     
+    def reset_state(self):
+        """제스처/추적 상태 초기화 (새 영상 구간 처리 전 사용)"""
+        self.controller_mode = 1
+        self.quit_confirmed = False
+        self.setup_control_variables()
+        if self.hand_detector is not None:
+            self.hand_detector.reset_tracking()
+    
+    def gesture_regions(self):
+        """제스처 규칙에서 사용하는 영역 사각형 (x1, y1, x2, y2)"""
+        return {
+            'gesture': (self.hand_start_x, self.hand_start_y, self.hand_end_x, self.hand_end_y),
+            'quit': (self.start_x - 100, self.start_y, self.start_x, self.hand_start_y),
+        }
+    
+    def hud_regions(self):
+        """
+        화면 영역 목록 [(이름, (x1, y1, x2, y2))] (영역 라벨 지도의 비트 순서)
+        detection: 모드 전환 띠, mouse/arrow: 띠의 왼쪽/오른쪽 버튼, gesture: 제스처 영역, quit: 종료 버튼
+        """
+        strip = (self.start_x, self.start_y, self.end_x, self.hand_start_y)
+        return [
+            ('detection', strip),
+            ('mouse', (self.start_x, self.start_y, self.mid_x, self.hand_start_y)),
+            ('arrow', (self.mid_x, self.start_y, self.end_x, self.hand_start_y)),
+        ] + list(self.gesture_regions().items())
+    
+    def get_region_map(self):
+        """현재 레이아웃/작업 해상도의 영역 라벨 지도 (레이아웃이나 해상도가 바뀔 때만 다시 그림)"""
+        size = self.hand_detector.frame_size if self.hand_detector is not None else (960, 720)
+        if self.region_map is None or self.region_map.size != tuple(size):
+            self.region_map = RegionMap(self.hud_regions(), size)
+        return self.region_map
+    
     def check_in_area(self, point_list, area_type=0):
         """
-        손가락 위치가 특정 영역 안에 있는지 확인
+        손가락 위치가 특정 영역 안에 있는지 확인 (영역 라벨 지도 조회)
         area_type: 
         0 - 인식 영역 내 손가락 확인
         1 - 제스처 영역 내 손가락 확인
         2 - 어떤 상태 박스에 손가락이 있는지 확인
         3 - 종료 버튼 영역 내 손가락 확인
         """
-        if area_type == 0:
-            if self.start_x < point_list[0] < self.end_x and self.start_y < point_list[1] < self.hand_start_y:
-                return True
-            return False
-
-        if area_type == 1:
-            if self.hand_start_x < point_list[0] < self.hand_end_x and self.hand_start_y < point_list[1] < self.hand_end_y:
-                return True
-            return False
-
-        elif area_type == 2:
-            if self.start_x < point_list[0] < self.mid_x and self.start_y < point_list[1] < self.hand_start_y:
-                return 1
-            elif self.mid_x < point_list[0] < self.end_x and self.start_y < point_list[1] < self.hand_start_y:
-                return 2
-            return 0
-
-        elif area_type == 3:
-            if (self.start_x-100) < point_list[0] < self.start_x and self.start_y < point_list[1] < self.hand_start_y:
-                return True
-            return False
-        
-        return 0
+        region_map = self.get_region_map()
+        label = region_map.lookup_point(point_list)
+        if area_type == 2:
+            return 1 if region_map.contains(label, 'mouse') else 2 if region_map.contains(label, 'arrow') else 0
+        name = {0: 'detection', 1: 'gesture', 3: 'quit'}.get(area_type)
+        return region_map.contains(label, name) if name is not None else 0
         
     def mouse_pointer_click(self, centre, dis, clicked, image):
-        """마우스 포인터 클릭 처리"""
+        """마우스 포인터 클릭 처리 (image가 None이면 그리지 않음)"""
         cx, cy = centre
-        cv2.circle(image, (cx, cy), 15, (181, 181, 181), cv2.FILLED)   
+        if image is not None:
+            cv2.circle(image, (cx, cy), 15, (181, 181, 181), cv2.FILLED)   
         if clicked >= 1:
             clicked = 0
 
         if dis < 30:
-            cv2.circle(image, (cx, cy), 15, (0, 252, 51), cv2.FILLED)
+            if image is not None:
+                cv2.circle(image, (cx, cy), 15, (0, 252, 51), cv2.FILLED)
             if clicked == 0:
                 clicked = 1
 
@@ -156,79 +320,291 @@ class VirtualGameController:
         return clicked
     
     def set_gesture_mapping(self, gesture, key):
-        """제스처와 키 매핑 설정"""
+        """제스처와 키 매핑 설정 (적용 대기 중인 프로필이 있으면 그 프로필에도 반영)"""
         self.gesture_mappings[gesture] = key
+        self.input_dispatcher.set_mapping(gesture, key)
+        with self._profile_lock:
+            pending = self.pending_profile
+            if pending is not None:
+                self.pending_profile = pending._replace(
+                    mappings=dict(pending.mappings, **{gesture: key}),
+                    key_table=dict(pending.key_table, **{gesture: InputDispatcher.resolve_key(key)}))
         
     def get_gesture_mapping(self, gesture):
-        """제스처에 매핑된 키 반환"""
-        return self.gesture_mappings.get(gesture, None)
+        """제스처에 매핑된 키 반환 (적용 대기 중인 프로필이 있으면 그 매핑)"""
+        pending = self.pending_profile
+        mappings = pending.mappings if pending is not None else self.gesture_mappings
+        return mappings.get(gesture, None)
     
-    def process_frame(self, active=False):
-        """카메라 프레임 처리"""
-        if not self.cap.isOpened():
-            return None, False
-            
-        ret, cap_img = self.cap.read()
-        if not ret:
+    def set_profile(self, profile, name=None):
+        """
+        프로필 적용 예약 (profile: 프로필 사전 또는 ProfileSettings, 잘못된 프로필은 ValueError)
+        검증과 키 변환은 호출한 스레드에서 끝내고, 다음 프레임 처리 전에 한 번에 교체
+        카메라와 손 인식 모델은 그대로 유지
+        """
+        settings = profile if isinstance(profile, ProfileSettings) else prepare_profile(profile, name)
+        with self._profile_lock:
+            self.pending_profile = settings
+        return settings
+    
+    def set_profile_name(self, name):
+        """현재 설정의 프로필 이름 변경 (다른 이름으로 저장할 때 사용)"""
+        with self._profile_lock:
+            self.profile_name = name
+            if self.pending_profile is not None:
+                self.pending_profile = self.pending_profile._replace(name=name)
+    
+    def apply_pending_profile(self):
+        """적용 대기 중인 프로필을 반영 (프레임 처리 스레드에서 프레임 사이에 호출)"""
+        with self._profile_lock:
+            settings, self.pending_profile = self.pending_profile, None
+        if settings is None:
+            return False
+        self.input_dispatcher.set_key_table(settings.key_table)
+        self.gesture_mappings = dict(settings.mappings)
+        self.set_areas(settings.areas['control'], settings.areas['gesture'])
+        self.pointer_filter.configure(**settings.pointer_filter)
+        performance = settings.performance
+        self.idle_after_frames = performance['idle_after_frames']
+        self.idle_fps = performance['idle_fps']
+        self.keyframe_interval = performance['keyframe_interval']
+        if self.hand_detector is not None:
+            self.hand_detector.keyframe_interval = self.keyframe_interval
+        self.profile_name = settings.name
+        return True
+    
+    def get_profile(self):
+        """현재 설정을 프로필 사전으로 반환 (저장용, 적용 대기 중인 프로필이 있으면 그 설정)"""
+        pending = self.pending_profile
+        if pending is None:
+            pending = ProfileSettings(
+                name=self.profile_name,
+                mappings=self.gesture_mappings,
+                key_table=self.input_dispatcher.key_table,
+                areas={
+                    'control': (self.start_x, self.start_y, self.end_x, self.end_y),
+                    'gesture': (self.hand_start_x, self.hand_start_y, self.hand_end_x, self.hand_end_y),
+                },
+                pointer_filter=self.pointer_filter.settings,
+                performance={
+                    'keyframe_interval': self.keyframe_interval,
+                    'idle_after_frames': self.idle_after_frames,
+                    'idle_fps': self.idle_fps,
+                },
+            )
+        return settings_to_profile(pending)
+    
+    def process_frame(self, active=False, render=True, packet=None):
+        """
+        카메라 프레임 처리 (render: False면 랜드마크/오버레이를 그리지 않음)
+        packet: wait_for_frame으로 이미 받은 프레임 (없으면 아직 처리하지 않은 최신 프레임을 읽음)
+        """
+        if packet is None:
+            if self.cap is None or not self.cap.isOpened():
+                return None, False
+            # 대기 없이 가장 최신 프레임 사용 (새 프레임이 없으면 처리하지 않음)
+            packet = self.cap.read()
+        if packet is None:
             return None, False
-            
+        self.frame_seq = packet.seq
+        self.frame_timestamp = packet.timestamp
+        
+        result = self.process_image(packet.frame, active, render)
+        # 캡처부터 처리 완료까지의 지연
+        self.telemetry.record_stage('latency', time() - packet.timestamp)
+        return result
+    
+    def process_image(self, cap_img, active=False, render=True, flip=True):
+        """
+        프레임 한 장 처리 (카메라 외 영상/이미지에도 사용)
+        render: False면 랜드마크/오버레이를 그리지 않음
+        flip: 좌우 반전 여부 (카메라 영상은 거울 모드로 처리)
+        """
+        telemetry = self.telemetry
+        input_backend = self.input_dispatcher.backend
+        events_before = input_backend.event_count
         self.cur_time = time()
-        main_img = cv2.flip(cap_img, 1)
+        if self.pending_hand_mode is not None:
+            self.apply_pending_hand_mode()
+        telemetry.start_stage('frame')
+        main_img = cv2.flip(cap_img, 1) if flip else cap_img
         
         # 손 인식 처리
-        main_img = self.hand_detector.findhand(main_img, True)
-        lm_list = self.hand_detector.findPosition()
+        telemetry.start_stage('inference')
+        main_img = self.hand_detector.findhand(main_img, render, self.idle)
+        landmarks = self.hand_detector.findLandmarks()
+        telemetry.end_stage('inference')
+        self.update_idle(landmarks is not None)
+        
+        # 랜드마크 기록 (재생/재현용, 기록 형식이 한 손만 담으므로 두 손 모드에서는 기록하지 않음)
+        if self.landmark_recorder is not None and not self.two_hand:
+            self.landmark_recorder.write(self.frame_seq, self.frame_timestamp or self.cur_time, self.hand_detector)
+        
+        # 제스처 인식 및 키 입력 (render가 아니면 제스처 표시도 그리지 않음)
+        hand_detection = landmarks is not None
+        hands = self.hand_detector.hand_landmarks if self.two_hand else None
+        state_text, detected_gestures = self.process_landmarks(landmarks, main_img if render else None, active, hands)
+        
+        if render:
+            # 화면 표시 업데이트
+            telemetry.start_stage('overlay')
+            self.update_display(main_img, hand_detection, state_text or ('Idle' if self.idle else ''))
+            
+            # FPS (최근 구간 평균)
+            self.draw_text(main_img, f'FPS: {int(telemetry.fps())}', (40, 40), (90, 140, 185))
+            if self.show_telemetry_overlay:
+                self.draw_telemetry_overlay(main_img)
+            telemetry.end_stage('overlay')
+        self.prev_time = self.cur_time
+        
+        frame_seconds = telemetry.end_stage('frame')
+        dropped = self.cap.dropped_count if self.cap is not None else None
+        hand_count = len(hands) if hands is not None else int(hand_detection)
+        telemetry.frame_done(hand_detection, input_backend.event_count - events_before, dropped, hand_count, frame_seconds)
+        if self.startup_pending:
+            self.mark_startup(hand_detection, detected_gestures)
+        
+        return main_img, self.quit_confirmed
+    
+    def mark_startup(self, hand_detection, detected_gestures):
+        """첫 프레임/첫 손 인식/첫 제스처 시각을 기록하고 시작 보고 출력"""
+        startup = self.startup
+        if startup.mark('first_frame'):
+            print(startup.summary_text())
+        if hand_detection:
+            startup.mark('first_hand')
+        if detected_gestures and startup.mark('first_gesture'):
+            print(startup.summary_text())
+            self.startup_pending = False
+    
+    def update_idle(self, hand_detection):
+        """손이 idle_after_frames 프레임 연속으로 없으면 대기 모드, 손이 보이면 즉시 해제"""
+        if hand_detection:
+            self.no_hand_frames = 0
+            self.idle = False
+        else:
+            self.no_hand_frames += 1
+            self.idle = 0 < self.idle_after_frames <= self.no_hand_frames
+    
+    def idle_delay(self, elapsed):
+        """대기 모드에서 idle_fps를 맞추기 위해 다음 프레임 전까지 쉴 시간(초)"""
+        if not self.idle or self.idle_fps <= 0:
+            return 0.0
+        return max(0.0, 1.0 / self.idle_fps - elapsed)
+    
+    def process_landmarks(self, landmarks, main_img=None, active=False, hands=None):
+        """
+        랜드마크 배열로 제스처 인식 및 키 입력 처리 (카메라/MediaPipe 없이 재생할 때도 사용)
+        landmarks: (21, 3) 픽셀 좌표 배열 또는 None (손 없음)
+        main_img: 제스처 표시를 그릴 이미지 (None이면 그리지 않음)
+        hands: 두 손 모드의 손잡이별 랜드마크 사전 (주어지면 손마다 자기 제스처 표로 인식)
+        """
+        telemetry = self.telemetry
         
-        # 방향 상태 초기화
+        # 프로필 전환은 프레임 사이에서 한 번에 반영
+        if self.pending_profile is not None:
+            self.apply_pending_profile()
+        
+        # 방향 상태 및 입력 이벤트 목록 초기화
         self.v_dir, self.h_dir, self.jump = 0, 0, 0
+        batch = self.input_batch = []
         state_text = ""
         hand_detection = False
         detected_gestures = []
         
         # 손이 인식된 경우 처리
-        if lm_list:
+        if landmarks is not None:
             hand_detection = True
-            state_text, detected_gestures = self.process_hand_gestures(lm_list, main_img)
+            telemetry.start_stage('gestures')
+            if hands is not None:
+                state_text, detected_gestures = self.process_two_hands(hands)
+            else:
+                state_text, detected_gestures = self.process_hand_gestures(landmarks, main_img)
+            telemetry.end_stage('gestures')
             
-            # 인식된 제스처에 따라 키 입력 처리 (활성화 상태인 경우에만)
+            # 인식된 제스처에 따라 키/마우스 입력을 한 번에 전송 (활성화 상태인 경우에만)
             if active:
-                self.apply_gesture_controls(detected_gestures)
+                telemetry.start_stage('input')
+                self.apply_gesture_controls(detected_gestures, batch)
+                self.input_dispatcher.backend.submit(batch)
+                telemetry.end_stage('input')
         
-        # 화면 표시 업데이트
-        self.update_display(main_img, hand_detection, state_text)
-        
-        # FPS 계산
-        fps = 1 / (self.cur_time - self.prev_time)
-        self.prev_time = self.cur_time
-        cv2.putText(main_img, f'FPS: {int(fps)}', (40, 40), self.font_type, self.font_size, (90, 140, 185), self.font_thickness)
+        self.hand_detection = hand_detection
+        self.state_text = state_text
+        self.detected_gestures = detected_gestures
         
-        return main_img, self.quit_confirmed
-    def process_hand_gestures(self, lm_list, main_img):
-        """손 제스처 처리"""
+        # 다른 프로세스로 제스처/랜드마크 이벤트 전송 (패킷에 손 하나만 담기므로 두 손 모드에서는 제스처만 전송)
+        if self.event_stream is not None:
+            self.event_stream.publish(self.frame_seq, self.frame_timestamp or self.cur_time, detected_gestures,
+                                      self.controller_mode,
+                                      self.hand_detector if hand_detection and hands is None else None)
+        return state_text, detected_gestures
+    
+    def start_recording(self, path):
+        """프레임별 랜드마크 기록 시작 (한 손 기록 형식이므로 두 손 모드인 동안의 프레임은 건너뜀)"""
+        self.stop_recording()
+        if self.two_hand:
+            print("두 손 모드에서는 랜드마크를 기록하지 않습니다 (한 손 모드로 바꾸면 기록됨)")
+        self.landmark_recorder = LandmarkRecorder(path)
+    
+    def stop_recording(self):
+        """랜드마크 기록 종료"""
+        recorder, self.landmark_recorder = self.landmark_recorder, None
+        if recorder is not None:
+            recorder.close()
+    
+    def start_event_stream(self, targets=None, include_landmarks=True):
+        """프레임별 제스처/랜드마크 이벤트를 UDP로 전송 시작 (targets: (주소, 포트) 목록, 기본 127.0.0.1:9760)"""
+        self.stop_event_stream()
+        self.event_stream = GestureStreamPublisher(targets, include_landmarks)
+    
+    def stop_event_stream(self):
+        """제스처 이벤트 전송 종료"""
+        stream, self.event_stream = self.event_stream, None
+        if stream is not None:
+            stream.close()
+    
+    def draw_telemetry_overlay(self, main_img):
+        """단계별 처리 시간 오버레이 표시"""
+        snap = self.telemetry.snapshot()
+        y = main_img.shape[0] - 20
+        lines = [f"{name}: {stats['mean_ms']:.1f} / {stats['p95_ms']:.1f} ms" for name, stats in snap['stages'].items()]
+        lines.append(f"drop: {snap['dropped_frames']}  no hand: {snap['no_hand_seconds']:.1f}s  input: {snap['input_events_per_sec']:.1f}/s")
+        for line in reversed(lines):
+            cv2.putText(main_img, line, (40, y), self.font_type, self.font_size, (90, 140, 185), 1)
+            y -= 18
+    
+    def get_telemetry(self):
+        """파이프라인 지표 스냅샷 반환"""
+        return self.telemetry.snapshot()
+    
+    def process_hand_gestures(self, landmarks, main_img):
+        """손 제스처 처리 (landmarks: (21, 3) 픽셀 좌표 배열, main_img가 None이면 그리지 않음)"""
+        draw = main_img is not None
         # 손가락 상태 인식
         self.finger_up_state = self.hand_detector.fingersUp()
         detected_gestures = []
         state = ""
         
-        # 각 손가락 위치 추출
-        index_pos = lm_list[8][1:]
-        middle_pos = lm_list[12][1:]
-        pinky_pos = lm_list[20][1:]
-        thumb_pos = lm_list[4][1:]
+        # 검지 끝 위치 추출
+        index_pos = landmarks[8, :2]
         
         # 손가락이 인식된 경우
         if self.finger_up_state.size != 0:
-            index_finger_in_detection = self.check_in_area(index_pos)
-            middle_finger_in_detection = self.check_in_area(middle_pos)
+            # 21개 랜드마크의 영역 라벨을 한 번에 조회
+            region_map = self.get_region_map()
+            labels = region_map.lookup(landmarks)
+            index_label, middle_label = int(labels[8]), int(labels[12])
+            flags = region_map.flags
             
             # 컨트롤러 모드 전환 확인
-            if index_finger_in_detection or middle_finger_in_detection:
-                index_button_area = self.check_in_area(index_pos, 2)
-                middle_button_area = self.check_in_area(middle_pos, 2)
+            if (index_label | middle_label) & flags['detection']:
+                buttons = flags['mouse'] | flags['arrow']
                 
-                if index_button_area == middle_button_area:
+                if index_label & buttons == middle_label & buttons:
+                    index_button_area = 1 if index_label & flags['mouse'] else 2 if index_label & flags['arrow'] else 0
                     z = 0
-                    [dis, centre] = self.hand_detector.findDistance(main_img, 1, 2)
+                    [dis, centre] = self.hand_detector.findDistance(main_img, 1, 2, draw)
                     if centre and dis:
                         self.clicked = self.mouse_pointer_click(centre, dis, self.clicked, main_img)
                         if self.clicked == 2:
@@ -241,172 +617,162 @@ class VirtualGameController:
                         state += " 키보드 모드"
                         self.controller_mode = 1
             else:
-                # 손가락 상태 분석
-                [self.thumb, self.index_finger, self.middle_finger, self.ring_finger, self.pinky_finger] = self.finger_up_state
-                sum_fingers = sum(self.finger_up_state[1:])
-                
-                # 손가락별 영역 확인
-                thumb_in_gesture_area = self.check_in_area(thumb_pos, 1)
-                index_in_gesture_area = self.check_in_area(index_pos, 1)
-                middle_in_gesture_area = self.check_in_area(middle_pos, 1)
-                pinky_in_gesture_area = self.check_in_area(pinky_pos, 1)
-                
-                # 종료 버튼 확인
-                index_in_quit = self.check_in_area(index_pos, 3)
-                middle_in_quit = self.check_in_area(middle_pos, 3)
-                
-                # 점프 제스처 확인
-                if sum_fingers == 0 and thumb_in_gesture_area and not self.thumb:
-                    state += "Jump "
-                    self.jump = 1
-                    detected_gestures.append('jump')
-                else:
-                    # 방향 제어 제스처 확인
-                    if self.index_finger and index_in_gesture_area:
-                        if not self.middle_finger:
-                            state += "Up "
-                            self.v_dir = 1
-                            detected_gestures.append('up')
-                        elif middle_in_gesture_area and self.middle_finger and not self.ring_finger:
-                            state += "Down "
-                            self.v_dir = -1
-                            detected_gestures.append('down')
-                    
-                    if self.thumb and thumb_in_gesture_area and not self.pinky_finger:
-                        state += "Left "
-                        self.h_dir = -1
-                        detected_gestures.append('left')
-                    elif self.pinky_finger and pinky_in_gesture_area and not self.thumb:
-                        state += "Right "
-                        self.h_dir = 1
-                        detected_gestures.append('right')
+                # 손가락 상태 비트 + 영역 판정 비트로 제스처 표를 한 번 조회
+                match = self.gesture_table.lookup_labels(self.controller_mode, self.finger_up_state, labels, region_map)
+                state += match.state
+                detected_gestures.extend(match.gestures)
+                for name, value in match.effects:
+                    setattr(self, name, value)
                 
                 # 컨트롤러 모드별 처리
                 if self.controller_mode == 0:  # 마우스 모드
-                    if self.v_dir == 1:
+                    if 'pointer' in match.actions:
                         # 마우스 이동
-                        px, py = lm_list[8][1:]
-                        self.pointer_x = int(interp(px, (self.hand_start_x, self.end_x), (0, self.screen_width)))
-                        self.pointer_y = int(interp(py, (self.hand_start_y, self.end_y), (0, self.screen_height)))
+                        px, py = int(index_pos[0]), int(index_pos[1])
+                        self.move_pointer(index_pos)
                         state = "Mouse Pointer"
-                        cv2.circle(main_img, (px, py), 5, (200, 200, 200), cv2.FILLED)
-                        cv2.circle(main_img, (px, py), 10, (200, 200, 200), 3)
-                        self.mouse.position = (int(self.pointer_x), int(self.pointer_y))
+                        if draw:
+                            cv2.circle(main_img, (px, py), 5, (200, 200, 200), cv2.FILLED)
+                            cv2.circle(main_img, (px, py), 10, (200, 200, 200), 3)
+                        self.input_batch.append(mouse_move(self.pointer_x, self.pointer_y))
                     else:
                         # 클릭 처리
-                        [dis, centre] = self.hand_detector.findDistance(main_img, 1, 2)
+                        [dis, centre] = self.hand_detector.findDistance(main_img, 1, 2, draw)
                         
-                        if index_in_quit and middle_in_quit and sum_fingers <= 3:
+                        if 'quit' in match.actions:
                             state = "Quit Check"
                             if centre and dis:
                                 self.clicked = self.mouse_pointer_click(centre, dis, self.clicked, main_img)
                                 if self.clicked == 2:
                                     self.quit_confirmed = True
                         
-                        if self.v_dir == -1 and (centre and dis):
+                        if 'click' in match.actions and (centre and dis):
                             state = "Click mouse"
                             self.clicked = self.mouse_pointer_click(centre, dis, self.clicked, main_img)
                             if self.clicked == 2:
                                 if self.clk == 0:
-                                    self.mouse.position = (int(self.pointer_x), int(self.pointer_y))
-                                    self.mouse.click(Button.left)   
+                                    self.input_batch.append(mouse_click(self.pointer_x, self.pointer_y))
                                     self.clk += 1
                                 else:
                                     self.clk -= 1
         
         return state, detected_gestures
     
-    def apply_gesture_controls(self, detected_gestures):
-        """인식된 제스처에 대한 컨트롤 적용"""
-        if self.controller_mode == 1:  # 키보드 모드
-            # 가로 방향키 처리
-            key_map = {
-                Key.up: 'up',
-                Key.down: 'down',
-                Key.left: 'left',
-                Key.right: 'right',
-                Key.space: 'space',
-            }
-            
-            # DirectInput 방식으로 키 처리
-            if self.h_dir == 1:  # 오른쪽
-                key = self.get_gesture_mapping('right')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyDown(key_str)
-            elif self.h_dir == -1:  # 왼쪽
-                key = self.get_gesture_mapping('left')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyDown(key_str)
-            else:
-                key = self.get_gesture_mapping('right')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyUp(key_str)
-                key = self.get_gesture_mapping('left')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyUp(key_str)
-            
-            # 세로 방향키 처리
-            if self.v_dir == 1:  # 위
-                key = self.get_gesture_mapping('up')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyDown(key_str)
-            elif self.v_dir == -1:  # 아래
-                key = self.get_gesture_mapping('down')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyDown(key_str)
-            else:
-                key = self.get_gesture_mapping('up')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyUp(key_str)
-                key = self.get_gesture_mapping('down')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyUp(key_str)
-                
-            # 점프 처리
-            if self.jump == 1:
-                key = self.get_gesture_mapping('jump')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyDown(key_str)
-            else:
-                key = self.get_gesture_mapping('jump')
-                key_str = key_map.get(key, str(key))
-                pydirectinput.keyUp(key_str)
+    def process_two_hands(self, hands):
+        """두 손 모드 제스처 처리 (hands: {'Left'/'Right': (21, 3) 배열}, 손마다 자기 제스처 표를 한 번 조회)"""
+        width, height = self.hand_detector.frame_size
+        mid = width // 2
+        state = ""
+        detected_gestures = []
+        for label, landmarks in hands.items():
+            table = self.hand_tables.get(label)
+            if table is None:
+                continue
+            regions = {'side': (0, 0, mid, height) if label == 'Left' else (mid, 0, width, height)}
+            fingers = self.hand_detector.fingers_up(landmarks, label)
+            match = table.lookup(MODES['keyboard'], fingers, landmarks, regions)
+            if match.state:
+                state += f"{label[0]}:{match.state}"
+            detected_gestures.extend(name for name in match.gestures if name not in detected_gestures)
+            for name, value in match.effects:
+                setattr(self, name, value)
+        return state, detected_gestures
+    
+    def move_pointer(self, index_pos):
+        """검지 끝 좌표를 화면 좌표로 변환하고 떨림 제거/지연 보상 후 포인터 위치 갱신"""
+        raw = (interp(index_pos[0], (self.hand_start_x, self.end_x), (0, self.screen_width)),
+               interp(index_pos[1], (self.hand_start_y, self.end_y), (0, self.screen_height)))
+        timestamp = self.frame_timestamp or self.cur_time
+        # 카메라 입력이면 캡처부터 지금까지의 지연만큼 예측 (영상/재생은 시각 기준이 달라 예측하지 않음)
+        latency = time() - self.frame_timestamp if self.cap is not None and self.frame_timestamp else 0.0
+        x, y = self.pointer_filter.update(raw, timestamp, latency)
+        self.pointer_x = int(min(max(x, 0), self.screen_width - 1))
+        self.pointer_y = int(min(max(y, 0), self.screen_height - 1))
+    
+    def configure_pointer_filter(self, **settings):
+        """마우스 포인터 필터 설정 (enabled, min_cutoff, beta, d_cutoff, predict, max_prediction)"""
+        self.pointer_filter.configure(**settings)
+    
+    def apply_gesture_controls(self, detected_gestures, batch=None):
+        """
+        인식된 제스처에 대한 컨트롤 적용 (키 상태가 바뀐 경우에만 입력 전송)
+        batch: 이벤트를 모을 목록 (주어지면 호출한 쪽이 프레임 끝에 한 번에 전송)
+        """
+        # 키보드 모드에서만 인식된 제스처의 키를 누름
+        gestures = detected_gestures if self.controller_mode == 1 else ()
+        
+        # 마우스 모드에서는 눌린 키를 모두 해제
+        self.input_dispatcher.update(gestures, batch)
+    
+    def get_input_stats(self):
+        """전송/생략된 입력 이벤트 수 반환"""
+        return self.input_dispatcher.get_stats()
     
     def update_display(self, main_img, hand_detection, state):
-        """화면 표시 업데이트"""
+        """화면 표시 업데이트 (고정 HUD는 캐시된 레이어로 합성)"""
+        layout = (self.start_x, self.start_y, self.end_x, self.end_y,
+                  self.hand_start_x, self.hand_start_y, self.hand_end_x, self.hand_end_y, self.mid_x,
+                  self.font_type, self.font_size, self.font_color, self.two_hand)
+        self.hud.draw_static(main_img, layout, self.draw_static_hud)
+        
+        # 상태 정보
+        self.draw_text(main_img, f'DETECTION: {hand_detection}', (40, 20))
+        self.draw_text(main_img, f'STATE: {state}', (250, 20))
+        
+        # 컨트롤러 타입
+        controller_type = "Two hands" if self.two_hand else "Mouse" if self.controller_mode == 0 else 'Arrow'
+        self.draw_text(main_img, f"CONTROL TYPE: {controller_type}", (250, 40))
+    
+    def draw_static_hud(self, overlay):
+        """고정 HUD 요소 그리기 (레이아웃/해상도가 바뀔 때만 호출)"""
+        if self.two_hand:
+            # 두 손 모드: 화면 가운데를 기준으로 왼손(방향)/오른손(동작) 영역
+            height, width = overlay.shape[:2]
+            cv2.line(overlay, (width // 2, 60), (width // 2, height), (10, 10, 250), 2)
+            cv2.putText(overlay, 'LEFT: MOVE', (40, 80), self.font_type, self.font_size, self.font_color, 2)
+            cv2.putText(overlay, 'RIGHT: ACTION', (width // 2 + 40, 80), self.font_type, self.font_size, self.font_color, 2)
+            return
+        
         # 모드 버튼 텍스트
-        cv2.putText(main_img, 'MOUSE', (self.start_x + 60, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
-        cv2.putText(main_img, 'ARROW', (self.mid_x + 60, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
+        cv2.putText(overlay, 'MOUSE', (self.start_x + 60, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
+        cv2.putText(overlay, 'ARROW', (self.mid_x + 60, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
         
         # 영역 그리기
-        cv2.line(main_img, (self.mid_x, self.start_y), (self.mid_x, self.hand_start_y), (10, 10, 250), 2)            
-        cv2.rectangle(main_img, (self.start_x, self.start_y), (self.end_x, self.end_y), (10, 10, 250), 2)
-        cv2.rectangle(main_img, (self.hand_start_x, self.hand_start_y), (self.hand_end_x, self.hand_end_y), (10, 10, 250), 2)
-        
-        # 상태 정보
-        cv2.putText(main_img, f'DETECTION: {hand_detection}', (40, 20), self.font_type, self.font_size, self.font_color, self.font_thickness)
-        cv2.putText(main_img, f'STATE: {state}', (250, 20), self.font_type, self.font_size, self.font_color, self.font_thickness)
+        cv2.line(overlay, (self.mid_x, self.start_y), (self.mid_x, self.hand_start_y), (10, 10, 250), 2)            
+        cv2.rectangle(overlay, (self.start_x, self.start_y), (self.end_x, self.end_y), (10, 10, 250), 2)
+        cv2.rectangle(overlay, (self.hand_start_x, self.hand_start_y), (self.hand_end_x, self.hand_end_y), (10, 10, 250), 2)
         
         # 종료 버튼
-        cv2.putText(main_img, 'QUIT', (self.start_x-65, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
-        cv2.rectangle(main_img, (self.start_x-100, self.start_y), (self.start_x, self.hand_start_y), (10, 10, 250), 2)
-        
-        # 컨트롤러 타입
-        controller_type = "Mouse" if self.controller_mode == 0 else 'Arrow'
-        cv2.putText(main_img, f"CONTROL TYPE: {controller_type}", (250, 40), self.font_type, self.font_size, self.font_color, self.font_thickness)
+        cv2.putText(overlay, 'QUIT', (self.start_x-65, self.start_y + 30), self.font_type, self.font_size, self.font_color, 2)
+        cv2.rectangle(overlay, (self.start_x-100, self.start_y), (self.start_x, self.hand_start_y), (10, 10, 250), 2)
+    
+    def draw_text(self, main_img, text, org, color=None, thickness=None):
+        """문자열별로 캐시된 렌더링으로 텍스트 표시"""
+        self.hud.draw_text(main_img, text, org, self.font_type, self.font_size,
+                           self.font_color if color is None else color,
+                           self.font_thickness if thickness is None else thickness)
     
     def release_all_keys(self):
-        """모든 키 해제"""
-        for key in self.gesture_mappings.values():
-            try:
-                self.keyboard.release(key)
-            except:
-                pass
+        """모든 키 해제 (누를 때와 같은 입력 백엔드로 해제)"""
+        self.input_dispatcher.release_all()
+    
+    def get_capture_stats(self):
+        """캡처 통계 (캡처/버린 프레임 수, 협상된 캡처 모드, 획득/디코딩 시간) 반환"""
+        if self.cap is None:
+            return {}
+        return self.cap.get_stats()
     
     def close(self):
         """프로그램 종료 작업"""
         self.release_all_keys()
+        self.input_dispatcher.backend.close()
+        self.stop_recording()
+        self.stop_event_stream()
         if self.cap and self.cap.isOpened():
             self.cap.release()
-        cv2.destroyAllWindows()
+        try:
+            cv2.destroyAllWindows()
+        except cv2.error:
+            pass  # GUI 기능 없이 빌드된 OpenCV (headless)
         self.say("프로그램 종료")
+        self.speech.close()